@@ -23,6 +23,17 @@ function! coq#complete_snips(arg_lead, cmd_line, cursor_pos) abort
   return s:filter_completions(a:arg_lead, l:args)
 endfunction
 
+function! coq#complete_trace(arg_lead, cmd_line, cursor_pos) abort
+  let l:args = [
+        \ 'start',
+        \ 'stop',
+        \ 'dump',
+        \ '--jsonl',
+        \ ]
+
+  return s:filter_completions(a:arg_lead, l:args)
+endfunction
+
 function! coq#complete_help(arg_lead, cmd_line, cursor_pos) abort
   let l:topics = [
         \ 'index',
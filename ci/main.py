@@ -2,7 +2,7 @@ from datetime import datetime, timezone
 from os import environ, sep
 from pathlib import Path
 from shutil import rmtree
-from subprocess import check_call, check_output, run
+from subprocess import check_call, check_output
 from sys import executable
 from typing import Iterator
 
@@ -46,8 +46,9 @@ def _git_alert(cwd: Path) -> None:
     if refs:
         check_call(("git", "push", "--delete", "origin", *refs), cwd=cwd)
 
-    proc = run(("git", "diff", "--exit-code"), cwd=cwd)
-    if proc.returncode:
+    # unlike `git diff`, also sees new & untracked artifacts
+    status = check_output(("git", "status", "--porcelain"), text=True, cwd=cwd)
+    if status.strip():
         time = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d_%H-%M-%S")
         brname = f"{prefix}--{time}"
         check_call(("git", "checkout", "-b", brname), cwd=cwd)
@@ -1,7 +1,7 @@
 from .lsp.requests import completion, request, resolve
 from .server.registrants import attachment, autocmds, help, marks, noop, omnifunc
 from .server.registrants import preview as rp
-from .server.registrants import repeat, snippets, stats, user_snippets
+from .server.registrants import repeat, snippets, stats, trace, user_snippets
 
 assert attachment
 assert autocmds
@@ -16,6 +16,7 @@ assert resolve
 assert rp
 assert snippets
 assert stats
+assert trace
 assert user_snippets
 
 ____ = None
@@ -0,0 +1,3 @@
+"""
+This file define bench as as submodule of coq.
+"""
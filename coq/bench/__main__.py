@@ -0,0 +1,6 @@
+from asyncio import run
+from sys import exit
+
+from .main import main
+
+exit(run(main()))
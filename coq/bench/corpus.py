@@ -0,0 +1,77 @@
+from itertools import accumulate
+from random import Random
+from typing import Iterator, MutableMapping, Sequence
+
+_SYLLABLES = (
+    "ab",
+    "ac",
+    "al",
+    "an",
+    "ar",
+    "be",
+    "ca",
+    "co",
+    "de",
+    "di",
+    "el",
+    "en",
+    "er",
+    "fo",
+    "ge",
+    "in",
+    "is",
+    "la",
+    "le",
+    "lo",
+    "ma",
+    "me",
+    "ne",
+    "no",
+    "on",
+    "or",
+    "pa",
+    "pe",
+    "ra",
+    "re",
+    "ri",
+    "ro",
+    "se",
+    "so",
+    "ta",
+    "te",
+    "ti",
+    "to",
+    "un",
+    "ve",
+)
+_SEPS = ("", "", "_", "_")
+_PUNCT = (" ", " ", " ", ", ", "(", ")", ".", " = ", ": ")
+
+
+def words(seed: int, vocab: int) -> Sequence[str]:
+    """
+    `vocab` distinct identifier like words, deterministic on `seed`
+    """
+
+    rand = Random(seed)
+    acc: MutableMapping[str, None] = {}
+    while len(acc) < vocab:
+        n = rand.randint(1, 4)
+        sep = rand.choice(_SEPS)
+        acc[sep.join(rand.choice(_SYLLABLES) for _ in range(n))] = None
+    return tuple(acc)
+
+
+def lines(seed: int, tokens: int, vocab: Sequence[str]) -> Iterator[str]:
+    """
+    ~`tokens` words, zipf-ish distributed over `vocab`
+    """
+
+    rand = Random(seed)
+    cum_weights = tuple(accumulate(1 / rank for rank in range(1, len(vocab) + 1)))
+    emitted = 0
+    while emitted < tokens:
+        n = rand.randint(1, 12)
+        chosen = rand.choices(vocab, cum_weights=cum_weights, k=n)
+        yield "".join(word + rand.choice(_PUNCT) for word in chosen).rstrip()
+        emitted += n
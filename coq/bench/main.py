@@ -0,0 +1,468 @@
+from argparse import ArgumentParser, Namespace
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from itertools import cycle
+from json import dumps
+from pathlib import Path
+from statistics import quantiles
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    Optional,
+    Sequence,
+    cast,
+)
+from uuid import uuid4
+
+from pynvim_pp.lib import decode
+from std2.pickle.decoder import new_decoder
+from yaml import safe_load
+
+from ..clients.buffers.db.database import BDB
+from ..clients.cache.db.database import Database as CDB
+from ..clients.cache.worker import CacheWorker
+from ..clients.snippet.db.database import SDB
+from ..clients.tags.db.database import CTDB
+from ..consts import CONFIG_YML
+from ..databases.insertions.database import IDB
+from ..lsp.parse import parse
+from ..lsp.protocol import LSProtocol
+from ..lsp.types import CompletionColumns, CompletionResponse
+from ..server.reviewer import Reviewer
+from ..server.rt_types import Stack
+from ..server.state import state
+from ..server.trans import trans
+from ..shared.context import EMPTY_CONTEXT
+from ..shared.lru import LRU
+from ..shared.runtime import Metric, Supervisor
+from ..shared.settings import Settings
+from ..shared.types import (
+    UTF16,
+    Completion,
+    Context,
+    Edit,
+    ExternLSP,
+    SnippetGrammar,
+)
+from ..snippets.types import LoadedSnips, ParsedSnippet
+from ..tags.types import Tag
+from .corpus import lines, words
+
+_TOKENS = (10_000, 100_000, 1_000_000)
+_QUERIES = 9
+
+
+@dataclass(frozen=True)
+class _Result:
+    bench: str
+    tokens: int
+    runs: int
+    p50_ms: float
+    p99_ms: float
+    peak_kib: float
+
+
+@dataclass(frozen=True)
+class _Corpus:
+    tokens: int
+    vocab: Sequence[str]
+    lines: Sequence[str]
+    contexts: Sequence[Context]
+
+
+def _parse_args() -> Namespace:
+    parser = ArgumentParser()
+    parser.add_argument("-t", "--tokens", type=int, nargs="*", default=_TOKENS)
+    parser.add_argument("-r", "--runs", type=int, default=99)
+    parser.add_argument("-b", "--budget", type=float, default=6.0)
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument("-o", "--only", nargs="*", default=())
+    parser.add_argument("-j", "--json", action="store_true", default=False)
+    return parser.parse_args()
+
+
+def _settings() -> Settings:
+    yml = safe_load(decode(CONFIG_YML.read_bytes()))
+    settings = new_decoder[Settings](Settings)(yml)
+    return settings
+
+
+def _context(cword: str) -> Context:
+    col = len(cword.encode())
+    return replace(
+        EMPTY_CONTEXT,
+        manual=False,
+        change_id=uuid4(),
+        position=(0, col),
+        cursor=(0, col, col, col),
+        line=cword,
+        line_before=cword,
+        words=cword,
+        words_before=cword,
+        syms=cword,
+        syms_before=cword,
+        l_words_before=cword.lower(),
+        l_syms_before=cword.lower(),
+    )
+
+
+def _corpus(seed: int, tokens: int) -> _Corpus:
+    vocab = words(seed, vocab=max(999, tokens // 20))
+    contexts = tuple(_context(word[:3]) for word in vocab[:: len(vocab) // _QUERIES])
+    return _Corpus(
+        tokens=tokens,
+        vocab=vocab,
+        lines=tuple(lines(seed, tokens=tokens, vocab=vocab)),
+        contexts=contexts,
+    )
+
+
+def _completion(word: str) -> Completion:
+    return Completion(
+        source="bench",
+        always_on_top=False,
+        weight_adjust=0,
+        label=word,
+        sort_by=word,
+        primary_edit=Edit(new_text=word),
+        adjust_indent=False,
+        icon_match=None,
+    )
+
+
+def _lsp_item(word: str) -> Mapping[str, Any]:
+    position = {"line": 0, "character": 0}
+    return {
+        "label": word,
+        "kind": 3,
+        "detail": f"fn {word}()",
+        "insertTextFormat": 2,
+        "textEdit": {
+            "newText": f"{word}($1)",
+            "range": {"start": position, "end": position},
+        },
+        "data": {"id": word},
+    }
+
+
+def _lsp_columns(items: Sequence[Mapping[str, Any]]) -> CompletionColumns:
+    """
+    Same as `lsp_pull` in `lsp-request.lua`
+    """
+
+    keys = CompletionColumns.__annotations__.keys() - {"n", "rest"}
+    cols: MutableMapping[str, Any] = {key: [] for key in keys}
+    cols["rest"] = []
+    for item in items:
+        for key in keys:
+            cols[key].append(item.get(key))
+        cols["rest"].append({k: v for k, v in item.items() if k not in keys} or None)
+    cols["n"] = len(items)
+    return cast(CompletionColumns, cols)
+
+
+def _measure(
+    args: Namespace, bench: str, tokens: int, fn: Callable[[], None]
+) -> Optional[_Result]:
+    """
+    At least 3 runs, at most `args.runs`, or until `args.budget` seconds is spent
+
+    Allocations are measured on a separate run, `tracemalloc` skews timing
+    """
+
+    if args.only and not any(bench.startswith(only) for only in args.only):
+        return None
+
+    samples: MutableSequence[float] = []
+    spent = 0.0
+    while len(samples) < 3 or (len(samples) < args.runs and spent < args.budget):
+        t0 = perf_counter()
+        fn()
+        samples.append(perf_counter() - t0)
+        spent += samples[-1]
+
+    start()
+    try:
+        fn()
+        _, peak = get_traced_memory()
+    finally:
+        stop()
+
+    qs = quantiles(samples, n=100, method="inclusive")
+    return _Result(
+        bench=bench,
+        tokens=tokens,
+        runs=len(samples),
+        p50_ms=qs[49] * 1000,
+        p99_ms=qs[98] * 1000,
+        peak_kib=peak / 1024,
+    )
+
+
+def _benches(
+    args: Namespace, settings: Settings, vars_dir: Path, corpus: _Corpus
+) -> Iterator[Optional[_Result]]:
+    tokens = corpus.tokens
+    contexts = cycle(corpus.contexts)
+    comps = tuple(map(_completion, corpus.vocab))
+
+    idb = IDB()
+    reviewer = Reviewer(
+        options=settings.match,
+        limits=settings.limits,
+        icons=settings.display.icons,
+        db=idb,
+    )
+    th = ThreadPoolExecutor()
+    supervisor = Supervisor(
+        th=th,
+        procpool=None,
+        vars_dir=vars_dir,
+        display=settings.display,
+        match=settings.match,
+        comp=settings.completion,
+        limits=settings.limits,
+        reviewer=reviewer,
+    )
+    stack = Stack(
+        settings=settings,
+        lru=LRU(size=settings.match.max_results),
+        metrics={},
+        idb=idb,
+        supervisor=supervisor,
+        workers=set(),
+    )
+    state(screen=(120, 40))
+
+    def review() -> Sequence[Metric]:
+        token = reviewer.begin(next(contexts))
+        instance = uuid4()
+        return [reviewer.trans(token, instance=instance, completion=c) for c in comps]
+
+    def reviews() -> None:
+        review()
+
+    yield _measure(args, bench="reviewer.trans", tokens=tokens, fn=reviews)
+
+    metrics = review()
+    for manual in (False, True):
+
+        def rank() -> None:
+            ctx = replace(next(contexts), manual=manual)
+            tuple(trans(stack, pum_width=0, context=ctx, metrics=metrics))
+
+        bench = "trans.manual" if manual else "trans"
+        yield _measure(args, bench=bench, tokens=tokens, fn=rank)
+
+    for memory_index in (False, True):
+        name = "buffers.index" if memory_index else "buffers"
+
+        def bdb() -> BDB:
+            return BDB(
+                tokens,
+                unifying_chars=settings.match.unifying_chars,
+                include_syms=True,
+                memory_index=memory_index,
+            )
+
+        def load() -> None:
+            bdb().set_lines(0, filetype="", filename="", lo=0, hi=0, lines=corpus.lines)
+
+        yield _measure(args, bench=f"{name}.set_lines", tokens=tokens, fn=load)
+
+        db = bdb()
+        db.set_lines(0, filetype="", filename="", lo=0, hi=0, lines=corpus.lines)
+        edits = cycle(enumerate(corpus.lines))
+
+        def edit() -> None:
+            row, line = next(edits)
+            db.set_lines(
+                0, filetype="", filename="", lo=row, hi=row + 1, lines=(line[::-1],)
+            )
+
+        yield _measure(args, bench=f"{name}.edit", tokens=tokens, fn=edit)
+
+        def select() -> None:
+            ctx = next(contexts)
+            for _ in db.words(
+                settings.match,
+                filetype=None,
+                word=ctx.words,
+                sym=ctx.syms,
+                limitless=False,
+                update=None,
+            ):
+                pass
+
+        yield _measure(args, bench=f"{name}.words", tokens=tokens, fn=select)
+
+    cache = CacheWorker(supervisor)
+
+    def set_cache() -> None:
+        cache.set_cache({None: comps}, skip_db=False)
+
+    yield _measure(args, bench="cache.set_cache", tokens=tokens, fn=set_cache)
+
+    ctx = next(contexts)
+    commit_id = uuid4()
+
+    def apply_cache() -> None:
+        # same commit, row & prefix: the cache is re-used, not dropped
+        new_ctx = replace(ctx, change_id=uuid4(), commit_id=commit_id)
+        _, _, cached = cache.apply_cache(new_ctx, always=False)
+        for _ in cached:
+            pass
+
+    set_cache()
+    apply_cache()
+    yield _measure(args, bench="cache.apply_cache", tokens=tokens, fn=apply_cache)
+
+    cdb = CDB()
+    cdb.insert((comp.uid.bytes, comp.sort_by) for comp in comps)
+    typing = cycle(corpus.vocab)
+
+    def narrow() -> None:
+        # type out a word, then backspace half of it
+        word = next(typing)
+        typed = range(1, len(word) + 1)
+        erased = range(len(word) - 1, len(word) // 2, -1)
+        for end in (*typed, *erased):
+            for _ in cdb.select(
+                False,
+                opts=settings.match,
+                word=word[:end],
+                sym=word[:end],
+                limitless=False,
+            ):
+                pass
+
+    yield _measure(args, bench="cache.narrow", tokens=tokens, fn=narrow)
+
+    sdb = SDB(vars_dir / str(tokens))
+    loaded = LoadedSnips(
+        exts={},
+        snippets={
+            uuid4(): ParsedSnippet(
+                grammar=SnippetGrammar.lsp,
+                filetype="",
+                content=f"{word}($1)$0",
+                label=word,
+                doc="",
+                matches={word},
+            )
+            for word in corpus.vocab
+        },
+    )
+
+    def populate() -> None:
+        sdb.populate(Path(str(tokens)), mtime=0, loaded=loaded)
+
+    yield _measure(args, bench="snippets.populate", tokens=tokens, fn=populate)
+
+    def snippets() -> None:
+        ctx = next(contexts)
+        for _ in sdb.select(
+            settings.match,
+            filetype="",
+            word=ctx.words,
+            sym=ctx.syms,
+            limitless=False,
+        ):
+            pass
+
+    yield _measure(args, bench="snippets.select", tokens=tokens, fn=snippets)
+
+    ctdb = CTDB(vars_dir / str(tokens), cwd=vars_dir)
+    tags = tuple(
+        Tag(
+            language="",
+            path=str(tokens),
+            line=line,
+            kind="function",
+            name=word,
+            pattern=None,
+            typeref=None,
+            scope=None,
+            scopeKind=None,
+            access=None,
+        )
+        for line, word in enumerate(corpus.vocab)
+    )
+    ctdb.insert({str(tokens): ("", tags)}, seen=set())
+
+    def select_tags() -> None:
+        ctx = next(contexts)
+        for _ in ctdb.select(
+            settings.match,
+            filename=str(tokens),
+            line_num=0,
+            word=ctx.words,
+            sym=ctx.syms,
+            limitless=False,
+        ):
+            pass
+
+    yield _measure(args, bench="tags.select", tokens=tokens, fn=select_tags)
+
+    protocol = LSProtocol(
+        CompletionItemKind={3: "Function", 6: "Variable"},
+        InsertTextFormat={1: "PlainText", 2: "Snippet"},
+    )
+    items = tuple(_lsp_item(word) for word in corpus.vocab)
+    columns = _lsp_columns(items)
+
+    for columnar in (False, True):
+
+        def lsp() -> None:
+            # the items are mutated in place by the row parser
+            resp = {"items": columns if columnar else [{**i} for i in items]}
+            parsed = parse(
+                protocol,
+                extern_type=ExternLSP,
+                always_on_top=None,
+                client=None,
+                encoding=UTF16,
+                short_name="LSP",
+                cursors=(0, 0, 0, 0),
+                weight_adjust=0,
+                resp=cast(CompletionResponse, resp),
+            )
+            for _ in parsed.items:
+                pass
+
+        bench = "lsp.parse.columns" if columnar else "lsp.parse"
+        yield _measure(args, bench=bench, tokens=tokens, fn=lsp)
+
+    th.shutdown()
+
+
+async def main() -> int:
+    args = _parse_args()
+    settings = _settings()
+
+    with TemporaryDirectory() as tmp:
+        for tokens in args.tokens:
+            corpus = _corpus(args.seed, tokens=tokens)
+            for result in _benches(
+                args, settings=settings, vars_dir=Path(tmp), corpus=corpus
+            ):
+                if not result:
+                    continue
+                elif args.json:
+                    print(dumps(asdict(result)), flush=True)
+                else:
+                    print(
+                        f"{result.bench:<24} {result.tokens:>9} "
+                        f"p50={result.p50_ms:>10.3f}ms p99={result.p99_ms:>10.3f}ms "
+                        f"peak={result.peak_kib:>10.1f}KiB runs={result.runs}",
+                        flush=True,
+                    )
+
+    return 0
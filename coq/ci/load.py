@@ -2,14 +2,12 @@ from asyncio import Semaphore, gather
 from contextlib import suppress
 from multiprocessing import cpu_count
 from pathlib import Path
-from typing import Any, Iterator, MutableMapping, MutableSet, Tuple
+from typing import Iterator, MutableMapping, MutableSet, Tuple
 from urllib.parse import urlparse
 from uuid import UUID
 
 from std2.asyncio.subprocess import call
-from std2.graphlib import recur_sort
 from std2.pickle.decoder import new_decoder
-from std2.pickle.encoder import new_encoder
 from yaml import safe_load
 
 from ..consts import COMPILATION_YML, TMP_DIR
@@ -84,7 +82,7 @@ async def load() -> LoadedSnips:
     return merged
 
 
-async def load_parsable() -> Any:
+async def load_parsable() -> LoadedSnips:
     loaded = await load()
 
     def cont() -> Iterator[Tuple[UUID, ParsedSnippet]]:
@@ -106,6 +104,4 @@ async def load_parsable() -> Any:
 
     snippets = {hashed: snip for hashed, snip in cont()}
     safe = LoadedSnips(exts=loaded.exts, snippets=snippets)
-
-    coder = new_encoder[LoadedSnips](LoadedSnips)
-    return recur_sort(coder(safe))
+    return safe
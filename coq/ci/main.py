@@ -1,17 +1,27 @@
 from difflib import unified_diff
+from pathlib import PurePath
 
 from pynvim_pp.logging import log
+from std2.pickle.encoder import new_encoder
 
+from ..clients.snippet.db.database import SCHEMA as DB_SCHEMA
+from ..clients.snippet.db.database import build
 from ..consts import DEBUG, VARS
-from ..server.registrants.snippets import BUNDLED_PATH_TPL, jsonify
+from ..server.registrants.snippets import (
+    BUNDLED_BIN_TPL,
+    BUNDLED_DB_TPL,
+    BUNDLED_PATH_TPL,
+    jsonify,
+)
 from ..shared.types import UTF8
-from ..snippets.types import SCHEMA
+from ..snippets.artifact import dumps
+from ..snippets.types import SCHEMA, LoadedSnips
 from .load import load_parsable
 
 
 async def main() -> None:
     snippets = await load_parsable()
-    j_snippets = jsonify(snippets)
+    j_snippets = jsonify(new_encoder[LoadedSnips](LoadedSnips)(snippets))
 
     snip_art = VARS / "snippets" / BUNDLED_PATH_TPL.substitute(schema=SCHEMA)
     snip_art.parent.mkdir(parents=True, exist_ok=True)
@@ -23,3 +33,9 @@ async def main() -> None:
             log.debug("%s", line)
 
     snip_art.write_text(j_snippets, encoding=UTF8)
+
+    bin_art = snip_art.with_name(BUNDLED_BIN_TPL.substitute(schema=SCHEMA))
+    bin_art.write_bytes(dumps(snippets))
+
+    db_art = snip_art.with_name(BUNDLED_DB_TPL.substitute(schema=SCHEMA, db=DB_SCHEMA))
+    build(db_art, path=PurePath(db_art.name), loaded=snippets)
@@ -1,10 +1,21 @@
 from contextlib import closing, suppress
 from dataclasses import dataclass
 from itertools import islice
+from operator import itemgetter
 from random import shuffle
 from sqlite3 import Connection, OperationalError
 from sqlite3.dbapi2 import Cursor
-from typing import AbstractSet, Iterator, Mapping, Optional, Sequence, Tuple
+from typing import (
+    AbstractSet,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    MutableSet,
+    Optional,
+    Sequence,
+    Tuple,
+)
 from uuid import uuid4
 
 from pynvim_pp.lib import recode
@@ -13,7 +24,9 @@ from ....consts import BUFFER_DB, DEBUG
 from ....databases.types import DB
 from ....shared.parse import coalesce
 from ....shared.settings import MatchOptions
-from ....shared.sql import BIGGEST_INT, init_db, like_esc
+from ....shared.sql import fuzzy_filter, fuzzy_limit, init_db, like_esc
+from .diff import line_hash, trim
+from .index import Index
 from .sql import sql
 
 
@@ -60,59 +73,101 @@ def _setlines(
     hi: int,
     lines: Sequence[str],
 ) -> None:
-    def m0() -> Iterator[Tuple[int, str, bytes]]:
-        for line_num, line in enumerate(lines, start=lo):
+    _ensure_buffer(
+        cursor,
+        buf_id=buf_id,
+        filetype=filetype,
+        filename=filename,
+    )
+
+    hashes = [*map(line_hash, lines)]
+    cursor.execute(
+        sql("select", "line_hashes"),
+        {"buffer_id": buf_id, "lo": lo, "hi": hi},
+    )
+    existing: MutableSequence[Optional[bytes]] = [None] * max(0, hi - lo)
+    for row in cursor.fetchall():
+        existing[row["line_num"] - lo] = row["hash"]
+
+    prefix, suffix = trim(existing, hashes)
+    lo, hi = lo + prefix, hi - suffix
+    changed = [*zip(lines, hashes)][prefix : len(lines) - suffix]
+
+    def m0() -> Iterator[Tuple[int, str, bytes, bytes]]:
+        for line_num, (line, digest) in enumerate(changed, start=lo):
             line_id = uuid4().bytes
-            yield line_num, recode(line), line_id
+            yield line_num, recode(line), line_id, digest
 
     line_info = [*m0()]
     shuffle(line_info)
 
+    budget = tokenization_limit
+    tokenized: MutableMapping[bytes, Sequence[str]] = {}
+    # partially tokenized lines are never considered unchanged
+    complete: MutableSet[bytes] = set()
+    for _, line, line_id, _ in line_info:
+        words = [
+            *islice(
+                coalesce(
+                    unifying_chars,
+                    include_syms=include_syms,
+                    backwards=None,
+                    chars=line,
+                ),
+                budget + 1,
+            )
+        ]
+        tokenized[line_id] = words[:budget]
+        if len(words) > budget:
+            break
+        else:
+            budget -= len(words)
+            complete.add(line_id)
+
     def m1() -> Iterator[Mapping]:
-        for line_num, line, line_id in line_info:
+        for line_num, line, line_id, digest in line_info:
             yield {
                 "rowid": line_id,
                 "buffer_id": buf_id,
                 "line_num": line_num,
                 "line": line if DEBUG else "",
+                "hash": digest if line_id in complete else b"",
             }
 
     def m2() -> Iterator[Mapping]:
-        for line_num, line, line_id in line_info:
-            for word in coalesce(
-                unifying_chars,
-                include_syms=include_syms,
-                backwards=None,
-                chars=line,
-            ):
-                yield {"line_id": line_id, "word": word, "line_num": line_num}
+        for line_id, words in tokenized.items():
+            for word in words:
+                yield {"line_id": line_id, "word": word}
+
+    if hi > lo or changed:
+        cursor.execute(
+            sql("delete", "lines"),
+            {"buffer_id": buf_id, "lo": lo, "hi": hi},
+        )
+        shift = len(changed) - (hi - lo)
+        if shift:
+            cursor.execute(
+                sql("update", "lines_shift_1"),
+                {"buffer_id": buf_id, "lo": lo, "shift": shift},
+            )
+            cursor.execute(sql("update", "lines_shift_2"), {"buffer_id": buf_id})
+        with suppress(UnicodeEncodeError):
+            cursor.executemany(sql("insert", "line"), m1())
+        with suppress(UnicodeEncodeError):
+            cursor.executemany(sql("insert", "word"), m2())
 
-    _ensure_buffer(
-        cursor,
-        buf_id=buf_id,
-        filetype=filetype,
-        filename=filename,
-    )
-    cursor.execute(
-        sql("delete", "lines"),
-        {"buffer_id": buf_id, "lo": lo, "hi": hi},
-    )
-    shift = len(lines) - (hi - lo)
-    cursor.execute(
-        sql("update", "lines_shift_1"),
-        {"buffer_id": buf_id, "lo": lo, "shift": shift},
-    )
-    cursor.execute(sql("update", "lines_shift_2"), {"buffer_id": buf_id})
-    with suppress(UnicodeEncodeError):
-        cursor.executemany(sql("insert", "line"), m1())
-    with suppress(UnicodeEncodeError):
-        cursor.executemany(sql("insert", "word"), islice(m2(), tokenization_limit))
     cursor.execute(sql("select", "line_count"), {"buffer_id": buf_id})
     count = cursor.fetchone()["line_count"]
     if not count:
         cursor.execute(
             sql("insert", "line"),
-            {"rowid": uuid4().bytes, "line": "", "buffer_id": buf_id, "line_num": 0},
+            {
+                "rowid": uuid4().bytes,
+                "line": "",
+                "buffer_id": buf_id,
+                "line_num": 0,
+                "hash": line_hash(""),
+            },
         )
 
 
@@ -130,13 +185,27 @@ class BDB(DB):
         tokenization_limit: int,
         unifying_chars: AbstractSet[str],
         include_syms: bool,
+        memory_index: bool,
     ) -> None:
         self._tokenization_limit = tokenization_limit
         self._unifying_chars = unifying_chars
         self._include_syms = include_syms
         self._conn = _init()
+        self._index = (
+            Index(
+                tokenization_limit,
+                unifying_chars=unifying_chars,
+                include_syms=include_syms,
+            )
+            if memory_index
+            else None
+        )
 
     def vacuum(self, live_bufs: Mapping[int, int]) -> None:
+        if self._index:
+            self._index.vacuum(live_bufs)
+            return
+
         with suppress(OperationalError):
             with self._conn, closing(self._conn.cursor()) as cursor:
                 cursor.execute(sql("select", "buffers"), ())
@@ -156,6 +225,10 @@ class BDB(DB):
                 cursor.execute("PRAGMA optimize", ())
 
     def buf_update(self, buf_id: int, filetype: str, filename: str) -> None:
+        if self._index:
+            self._index.buf_update(buf_id, filetype=filetype, filename=filename)
+            return
+
         with self._conn, closing(self._conn.cursor()) as cursor:
             _ensure_buffer(
                 cursor,
@@ -173,6 +246,17 @@ class BDB(DB):
         hi: int,
         lines: Sequence[str],
     ) -> None:
+        if self._index:
+            self._index.set_lines(
+                buf_id,
+                filetype=filetype,
+                filename=filename,
+                lo=lo,
+                hi=hi,
+                lines=lines,
+            )
+            return
+
         with suppress(OperationalError):
             with self._conn, closing(self._conn.cursor()) as cursor:
                 _setlines(
@@ -188,6 +272,20 @@ class BDB(DB):
                     lines=lines,
                 )
 
+    def buffer_words(self, buf_id: int) -> Sequence[Tuple[str, int]]:
+        """
+        -> (word, line_num)
+        """
+
+        if self._index:
+            return self._index.buffer_words(buf_id)
+
+        with suppress(OperationalError):
+            with self._conn, closing(self._conn.cursor()) as cursor:
+                cursor.execute(sql("select", "buffer_words"), {"buffer_id": buf_id})
+                return [(row["word"], row["line_num"]) for row in cursor.fetchall()]
+        return ()
+
     def words(
         self,
         opts: MatchOptions,
@@ -197,6 +295,25 @@ class BDB(DB):
         limitless: int,
         update: Optional[Update],
     ) -> Iterator[BufferWord]:
+        if self._index:
+            if update:
+                self._index.set_lines(
+                    update.buf_id,
+                    filetype=update.filetype,
+                    filename=update.filename,
+                    lo=update.lo,
+                    hi=update.hi,
+                    lines=update.lines,
+                )
+            words = self._index.select(
+                opts, filetype=filetype, word=word, sym=sym, limitless=limitless
+            )
+            for text, ft, filename, line_num in words:
+                yield BufferWord(
+                    text=text, filetype=ft, filename=filename, line_num=line_num + 1
+                )
+            return
+
         with suppress(OperationalError):
             with self._conn, closing(self._conn.cursor()) as cursor:
                 if update:
@@ -218,7 +335,8 @@ class BDB(DB):
                     {
                         "cut_off": opts.fuzzy_cutoff,
                         "look_ahead": opts.look_ahead,
-                        "limit": BIGGEST_INT if limitless else opts.max_results,
+                        "batched": opts.batch_scoring,
+                        "limit": fuzzy_limit(opts, limitless=limitless),
                         "filetype": filetype,
                         "word": word,
                         "sym": sym,
@@ -226,7 +344,15 @@ class BDB(DB):
                         "like_sym": like_esc(sym[: opts.exact_matches]),
                     },
                 )
-                for row in cursor:
+                rows = fuzzy_filter(
+                    opts,
+                    word=word,
+                    sym=sym,
+                    limitless=limitless,
+                    rows=cursor,
+                    text=itemgetter("word"),
+                )
+                for row in rows:
                     yield BufferWord(
                         text=row["word"],
                         filetype=row["filetype"],
@@ -0,0 +1,28 @@
+from hashlib import md5
+from typing import Optional, Sequence, Tuple
+
+from pynvim_pp.lib import encode
+
+
+def line_hash(line: str) -> bytes:
+    return md5(encode(line)).digest()
+
+
+def trim(old: Sequence[Optional[bytes]], new: Sequence[bytes]) -> Tuple[int, int]:
+    """
+    Count of unchanged lines at the start & end of `[lo, hi)`
+
+    -> (prefix, suffix)
+    """
+
+    shorter = min(len(old), len(new))
+
+    prefix = 0
+    while prefix < shorter and old[prefix] == new[prefix]:
+        prefix += 1
+
+    suffix = 0
+    while suffix < shorter - prefix and old[-suffix - 1] == new[-suffix - 1]:
+        suffix += 1
+
+    return prefix, suffix
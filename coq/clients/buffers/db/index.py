@@ -0,0 +1,251 @@
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from itertools import islice
+from random import shuffle
+from typing import (
+    AbstractSet,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from ....shared.fuzzy import quick_ratio
+from ....shared.parse import coalesce
+from ....shared.settings import MatchOptions
+from ....shared.sql import BIGGEST_INT, sql_lower
+from .diff import line_hash, trim
+
+
+@dataclass(eq=False)
+class _Buf:
+    filetype: str
+    filename: str
+    lines: MutableSequence[Optional["_Line"]] = field(default_factory=list)
+    # line numbers at & after `stale` need to be recomputed
+    stale: int = 0
+
+
+@dataclass(eq=False)
+class _Line:
+    buf: _Buf
+    num: int
+    hash: bytes
+    words: Sequence[str]
+
+
+class Index:
+    """
+    In memory alternative to the `words_view`
+
+    word -> buffer -> lines, with a sorted array of lowered words for prefix search
+    """
+
+    def __init__(
+        self,
+        tokenization_limit: int,
+        unifying_chars: AbstractSet[str],
+        include_syms: bool,
+    ) -> None:
+        self._tokenization_limit = tokenization_limit
+        self._unifying_chars = unifying_chars
+        self._include_syms = include_syms
+
+        self._bufs: MutableMapping[int, _Buf] = {}
+        self._words: MutableMapping[
+            str, MutableMapping[int, MutableMapping[_Line, None]]
+        ] = {}
+        self._lwords: MutableMapping[str, MutableMapping[str, None]] = {}
+        self._sorted: MutableSequence[str] = []
+
+    def _ref(self, buf_id: int, line: _Line) -> None:
+        for word in line.words:
+            if (bufs := self._words.get(word)) is None:
+                bufs = self._words[word] = {}
+                lword = sql_lower(word)
+                if (words := self._lwords.get(lword)) is None:
+                    words = self._lwords[lword] = {}
+                    insort(self._sorted, lword)
+                words[word] = None
+
+            bufs.setdefault(buf_id, {})[line] = None
+
+    def _unref(self, buf_id: int, line: _Line) -> None:
+        for word in line.words:
+            bufs = self._words[word]
+            lines = bufs[buf_id]
+            lines.pop(line)
+
+            if not lines:
+                bufs.pop(buf_id)
+                if not bufs:
+                    self._words.pop(word)
+                    lword = sql_lower(word)
+                    words = self._lwords[lword]
+                    words.pop(word)
+                    if not words:
+                        self._lwords.pop(lword)
+                        self._sorted.pop(bisect_left(self._sorted, lword))
+
+    def _drop(self, buf_id: int, lines: Sequence[Optional[_Line]]) -> None:
+        for line in lines:
+            if line:
+                self._unref(buf_id, line=line)
+
+    def _line_num(self, line: _Line) -> int:
+        buf = line.buf
+        if buf.stale < len(buf.lines):
+            for num, ln in enumerate(islice(buf.lines, buf.stale, None), buf.stale):
+                if ln:
+                    ln.num = num
+            buf.stale = len(buf.lines)
+        return line.num
+
+    def buf_update(self, buf_id: int, filetype: str, filename: str) -> None:
+        if buf := self._bufs.get(buf_id):
+            buf.filetype, buf.filename = filetype, filename
+        else:
+            self._bufs[buf_id] = _Buf(filetype=filetype, filename=filename)
+
+    def vacuum(self, live_bufs: Mapping[int, int]) -> None:
+        for buf_id in self._bufs.keys() - live_bufs.keys():
+            buf = self._bufs.pop(buf_id)
+            self._drop(buf_id, lines=buf.lines)
+
+        for buf_id, line_count in live_bufs.items():
+            if live := self._bufs.get(buf_id):
+                self._drop(buf_id, lines=live.lines[line_count:])
+                del live.lines[line_count:]
+                live.stale = min(live.stale, len(live.lines))
+
+    def set_lines(
+        self,
+        buf_id: int,
+        filetype: str,
+        filename: str,
+        lo: int,
+        hi: int,
+        lines: Sequence[str],
+    ) -> None:
+        self.buf_update(buf_id, filetype=filetype, filename=filename)
+        buf = self._bufs[buf_id]
+
+        if len(buf.lines) < lo:
+            buf.lines.extend(None for _ in range(lo - len(buf.lines)))
+
+        hashes = [*map(line_hash, lines)]
+        existing = [ln.hash if ln else None for ln in buf.lines[lo:hi]]
+        existing.extend(None for _ in range(hi - lo - len(existing)))
+        prefix, suffix = trim(existing, hashes)
+        lo, hi = lo + prefix, hi - suffix
+        changed = [*zip(lines, hashes)][prefix : len(lines) - suffix]
+
+        new_lines = [
+            _Line(buf=buf, num=line_num, hash=digest, words=())
+            for line_num, (_, digest) in enumerate(changed, start=lo)
+        ]
+        line_info = [*zip(new_lines, (line for line, _ in changed))]
+        shuffle(line_info)
+
+        budget, exhausted = self._tokenization_limit, False
+        for ln, line in line_info:
+            if exhausted:
+                ln.hash = b""
+            else:
+                words = [
+                    *islice(
+                        coalesce(
+                            self._unifying_chars,
+                            include_syms=self._include_syms,
+                            backwards=None,
+                            chars=line,
+                        ),
+                        budget + 1,
+                    )
+                ]
+                ln.words = tuple(dict.fromkeys(words[:budget]))
+                if len(words) > budget:
+                    # partially tokenized lines are never considered unchanged
+                    ln.hash, exhausted = b"", True
+                else:
+                    budget -= len(words)
+
+        dropped = buf.lines[lo:hi]
+        self._drop(buf_id, lines=dropped)
+        buf.lines[lo:hi] = new_lines
+        for ln in new_lines:
+            self._ref(buf_id, line=ln)
+
+        if len(new_lines) != len(dropped):
+            buf.stale = min(buf.stale, lo + len(new_lines))
+
+    def buffer_words(self, buf_id: int) -> Sequence[Tuple[str, int]]:
+        """
+        -> (word, line_num)
+        """
+
+        acc: MutableMapping[str, int] = {}
+        if buf := self._bufs.get(buf_id):
+            for line in buf.lines:
+                if line:
+                    for word in line.words:
+                        if word not in acc:
+                            acc[word] = self._line_num(line)
+        return tuple(acc.items())
+
+    def _candidates(
+        self,
+        opts: MatchOptions,
+        filetype: Optional[str],
+        word: str,
+        sym: str,
+    ) -> Iterator[Tuple[str, _Line]]:
+        for w in (word, sym):
+            if w:
+                lw, prefix = sql_lower(w), sql_lower(w[: opts.exact_matches])
+                for idx in range(bisect_left(self._sorted, prefix), len(self._sorted)):
+                    lword = self._sorted[idx]
+                    if not lword.startswith(prefix):
+                        break
+                    elif len(lword) + opts.look_ahead < len(w):
+                        continue
+                    elif (
+                        quick_ratio(lw, lword, look_ahead=opts.look_ahead)
+                        <= opts.fuzzy_cutoff
+                    ):
+                        continue
+                    else:
+                        for text in self._lwords[lword]:
+                            if text == w[: len(text)]:
+                                continue
+                            for buf_id, lines in self._words[text].items():
+                                buf = self._bufs[buf_id]
+                                if filetype is None or buf.filetype == filetype:
+                                    yield text, next(iter(lines))
+                                    break
+
+    def select(
+        self,
+        opts: MatchOptions,
+        filetype: Optional[str],
+        word: str,
+        sym: str,
+        limitless: int,
+    ) -> Sequence[Tuple[str, str, str, int]]:
+        """
+        -> (word, filetype, filename, line_num)
+        """
+
+        limit = BIGGEST_INT if limitless else opts.max_results
+        seen: MutableMapping[str, Tuple[str, str, str, int]] = {}
+        candidates = self._candidates(opts, filetype=filetype, word=word, sym=sym)
+        for text, line in candidates:
+            if len(seen) >= limit:
+                break
+            elif text not in seen:
+                buf = line.buf
+                seen[text] = (text, buf.filetype, buf.filename, self._line_num(line))
+        return tuple(seen.values())
@@ -14,6 +14,7 @@ CREATE TABLE IF NOT EXISTS lines (
   buffer_id INTEGER NOT NULL REFERENCES buffers (rowid) ON UPDATE CASCADE ON DELETE CASCADE,
   line_num  INTEGER NOT NULL,
   line      TEXT    NOT NULL,
+  hash      BLOB    NOT NULL,
   UNIQUE(buffer_id, line_num)
 ) WITHOUT ROWID;
 CREATE INDEX IF NOT EXISTS lines_buffer_id ON lines (buffer_id);
@@ -1,3 +1,3 @@
-INSERT INTO lines ( rowid,  buffer_id,  line_num,  line)
-VALUES            (:rowid, :buffer_id, :line_num, :line)
+INSERT INTO lines ( rowid,  buffer_id,  line_num,  line,  hash)
+VALUES            (:rowid, :buffer_id, :line_num, :line, :hash)
 
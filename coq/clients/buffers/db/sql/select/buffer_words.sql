@@ -0,0 +1,11 @@
+SELECT
+  words.word,
+  MIN(lines.line_num) AS line_num
+FROM lines
+JOIN words
+ON
+  words.line_id = lines.rowid
+WHERE
+  lines.buffer_id = :buffer_id
+GROUP BY
+  words.word
@@ -0,0 +1,10 @@
+SELECT
+  line_num,
+  hash
+FROM lines
+WHERE
+  buffer_id = :buffer_id
+  AND
+  line_num >= :lo
+  AND
+  line_num < :hi
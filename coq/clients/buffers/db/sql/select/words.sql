@@ -20,7 +20,7 @@ WHERE
       AND
       word <> SUBSTR(:word, 1, LENGTH(word))
       AND
-      X_SIMILARITY(LOWER(:word), lword, :look_ahead) > :cut_off
+      (:batched OR X_SIMILARITY(LOWER(:word), lword, :look_ahead) > :cut_off)
     )
     OR
     (
@@ -32,7 +32,7 @@ WHERE
       AND
       word <> SUBSTR(:sym, 1, LENGTH(word))
       AND
-      X_SIMILARITY(LOWER(:sym), lword, :look_ahead) > :cut_off
+      (:batched OR X_SIMILARITY(LOWER(:sym), lword, :look_ahead) > :cut_off)
     )
   )
 LIMIT :limit
@@ -0,0 +1,3 @@
+"""
+This file defines files as a submodule of clients/buffers.
+"""
@@ -0,0 +1,130 @@
+from contextlib import closing, suppress
+from operator import itemgetter
+from pathlib import Path
+from sqlite3 import Connection, OperationalError
+from time import time
+from typing import AbstractSet, Iterable, Iterator, Mapping, Optional, Tuple
+
+from ....databases.types import DB
+from ....shared.settings import MatchOptions
+from ....shared.sql import fuzzy_filter, fuzzy_limit, init_db, like_esc
+from ..db.database import BufferWord
+from .sql import sql
+
+_SCHEMA = "v1"
+
+
+def _init(db_dir: Path) -> Connection:
+    db = (db_dir / _SCHEMA).with_suffix(".sqlite3")
+    db.parent.mkdir(parents=True, exist_ok=True)
+    conn = Connection(str(db), isolation_level=None)
+    init_db(conn)
+    conn.executescript(sql("create", "pragma"))
+    conn.executescript(sql("create", "tables"))
+    return conn
+
+
+class FDB(DB):
+    """
+    Words of recently used files, shared across sessions
+    """
+
+    def __init__(self, vars_dir: Path, max_files: int) -> None:
+        self._max_files = max_files
+        self._conn = _init(vars_dir / "clients" / "buffers")
+
+    def mtimes(self) -> Mapping[str, float]:
+        with suppress(OperationalError):
+            with self._conn, closing(self._conn.cursor()) as cursor:
+                cursor.execute(sql("select", "files"), ())
+                return {row["filename"]: row["mtime"] for row in cursor.fetchall()}
+        return {}
+
+    def vacuum(self, opened: AbstractSet[str], stale: AbstractSet[str]) -> None:
+        with suppress(OperationalError):
+            with self._conn, closing(self._conn.cursor()) as cursor:
+                cursor.execute(sql("delete", "opened"), ())
+                cursor.executemany(
+                    sql("insert", "opened"),
+                    ({"filename": filename} for filename in opened),
+                )
+                cursor.executemany(
+                    sql("delete", "file"),
+                    ({"filename": filename} for filename in stale),
+                )
+                cursor.execute(sql("delete", "evict"), {"limit": self._max_files})
+
+    def snapshot(
+        self,
+        filename: str,
+        filetype: str,
+        mtime: float,
+        words: Iterable[Tuple[str, int]],
+    ) -> None:
+        def m1() -> Iterator[Mapping]:
+            for word, line_num in words:
+                yield {"filename": filename, "word": word, "line_num": line_num}
+
+        with suppress(OperationalError):
+            with self._conn, closing(self._conn.cursor()) as cursor:
+                cursor.execute(sql("delete", "file"), {"filename": filename})
+                cursor.execute(
+                    sql("insert", "file"),
+                    {
+                        "filename": filename,
+                        "filetype": filetype,
+                        "mtime": mtime,
+                        "accessed": time(),
+                    },
+                )
+                with suppress(UnicodeEncodeError):
+                    cursor.executemany(sql("insert", "word"), m1())
+                cursor.execute(sql("delete", "evict"), {"limit": self._max_files})
+
+    def touch(self, filename: str) -> None:
+        with suppress(OperationalError):
+            with self._conn, closing(self._conn.cursor()) as cursor:
+                cursor.execute(
+                    sql("update", "accessed"),
+                    {"filename": filename, "accessed": time()},
+                )
+
+    def words(
+        self,
+        opts: MatchOptions,
+        filetype: Optional[str],
+        word: str,
+        sym: str,
+        limitless: int,
+    ) -> Iterator[BufferWord]:
+        with suppress(OperationalError):
+            with self._conn, closing(self._conn.cursor()) as cursor:
+                cursor.execute(
+                    sql("select", "words"),
+                    {
+                        "cut_off": opts.fuzzy_cutoff,
+                        "look_ahead": opts.look_ahead,
+                        "batched": opts.batch_scoring,
+                        "limit": fuzzy_limit(opts, limitless=limitless),
+                        "filetype": filetype,
+                        "word": word,
+                        "sym": sym,
+                        "like_word": like_esc(word[: opts.exact_matches]),
+                        "like_sym": like_esc(sym[: opts.exact_matches]),
+                    },
+                )
+                rows = fuzzy_filter(
+                    opts,
+                    word=word,
+                    sym=sym,
+                    limitless=limitless,
+                    rows=cursor,
+                    text=itemgetter("word"),
+                )
+                for row in rows:
+                    yield BufferWord(
+                        text=row["word"],
+                        filetype=row["filetype"],
+                        filename=row["filename"],
+                        line_num=row["line_num"] + 1,
+                    )
@@ -0,0 +1,2 @@
+PRAGMA foreign_keys = ON;
+PRAGMA journal_mode = WAL;
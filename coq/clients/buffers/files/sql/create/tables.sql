@@ -0,0 +1,31 @@
+BEGIN;
+
+
+CREATE TABLE IF NOT EXISTS files (
+  filename TEXT NOT NULL PRIMARY KEY,
+  filetype TEXT NOT NULL,
+  mtime    REAL NOT NULL,
+  accessed REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS files_accessed ON files (accessed);
+
+
+-- !! files 1:N words
+CREATE TABLE IF NOT EXISTS words (
+  filename TEXT    NOT NULL REFERENCES files (filename) ON UPDATE CASCADE ON DELETE CASCADE,
+  word     TEXT    NOT NULL,
+  lword    TEXT    NOT NULL,
+  line_num INTEGER NOT NULL,
+  UNIQUE   (filename, word)
+);
+CREATE INDEX IF NOT EXISTS words_filename ON words (filename);
+CREATE INDEX IF NOT EXISTS words_word     ON words (word);
+CREATE INDEX IF NOT EXISTS words_lword    ON words (lword);
+
+
+CREATE TEMP TABLE IF NOT EXISTS opened (
+  filename TEXT NOT NULL PRIMARY KEY
+) WITHOUT ROWID;
+
+
+END;
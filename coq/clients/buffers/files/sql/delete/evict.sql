@@ -0,0 +1,10 @@
+DELETE FROM files
+WHERE
+  filename NOT IN (
+    SELECT
+      filename
+    FROM files
+    ORDER BY
+      accessed DESC
+    LIMIT :limit
+  )
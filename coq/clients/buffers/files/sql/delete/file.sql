@@ -0,0 +1,3 @@
+DELETE FROM files
+WHERE
+  filename = X_NORM_CASE(:filename)
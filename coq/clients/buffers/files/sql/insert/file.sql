@@ -0,0 +1,2 @@
+INSERT INTO files (filename,                filetype,  mtime,  accessed)
+VALUES            (X_NORM_CASE(:filename), :filetype, :mtime, :accessed)
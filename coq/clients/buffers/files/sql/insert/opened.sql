@@ -0,0 +1,2 @@
+INSERT OR IGNORE INTO opened ( filename)
+VALUES                       (X_NORM_CASE(:filename))
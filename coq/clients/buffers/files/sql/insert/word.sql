@@ -0,0 +1,2 @@
+INSERT OR IGNORE INTO words ( filename,               word,  lword,         line_num)
+VALUES                      (X_NORM_CASE(:filename), :word, LOWER(:word), :line_num)
@@ -0,0 +1,4 @@
+SELECT
+  filename,
+  mtime
+FROM files
@@ -0,0 +1,45 @@
+SELECT
+  words.word,
+  words.line_num,
+  files.filename,
+  files.filetype
+FROM words
+JOIN files
+ON
+  files.filename = words.filename
+WHERE
+  words.filename NOT IN (SELECT filename FROM opened)
+  AND
+  CASE
+    WHEN :filetype IS NOT NULL THEN files.filetype = :filetype
+    ELSE 1
+  END
+  AND
+  (
+    (
+      :word <> ''
+      AND
+      words.lword LIKE :like_word ESCAPE '!'
+      AND
+      LENGTH(words.word) + :look_ahead >= LENGTH(:word)
+      AND
+      words.word <> SUBSTR(:word, 1, LENGTH(words.word))
+      AND
+      (:batched OR X_SIMILARITY(LOWER(:word), words.lword, :look_ahead) > :cut_off)
+    )
+    OR
+    (
+      :sym <> ''
+      AND
+      words.lword LIKE :like_sym ESCAPE '!'
+      AND
+      LENGTH(words.word) + :look_ahead >= LENGTH(:sym)
+      AND
+      words.word <> SUBSTR(:sym, 1, LENGTH(words.word))
+      AND
+      (:batched OR X_SIMILARITY(LOWER(:sym), words.lword, :look_ahead) > :cut_off)
+    )
+  )
+GROUP BY
+  words.word
+LIMIT :limit
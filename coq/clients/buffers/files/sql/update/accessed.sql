@@ -0,0 +1,5 @@
+UPDATE files
+SET
+  accessed = :accessed
+WHERE
+  filename = X_NORM_CASE(:filename)
@@ -1,12 +1,27 @@
+from contextlib import suppress
 from dataclasses import dataclass
 from os import linesep
-from pathlib import PurePath
-from typing import AsyncIterator, Iterator, Mapping, Optional, Sequence, Tuple
+from os.path import normcase
+from pathlib import Path, PurePath
+from typing import (
+    AbstractSet,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    MutableSet,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
+from pynvim_pp.atomic import Atomic
 from pynvim_pp.buffer import Buffer
 from pynvim_pp.logging import suppress_and_log
 from pynvim_pp.rpc_types import NvimError
 from pynvim_pp.window import Window
+from std2.asyncio import to_thread
 
 from ...paths.show import fmt_path
 from ...shared.executor import AsyncExecutor
@@ -15,6 +30,7 @@ from ...shared.runtime import Worker as BaseWorker
 from ...shared.settings import BuffersClient
 from ...shared.types import Completion, Context, Doc, Edit
 from .db.database import BDB, BufferWord, Update
+from .files.database import FDB
 
 
 @dataclass(frozen=True)
@@ -22,9 +38,11 @@ class _Info:
     buf_id: int
     filetype: str
     filename: str
+    modified: bool
     range: Tuple[int, int]
     lines: Sequence[str]
     buffers: Mapping[Buffer, int]
+    filenames: AbstractSet[str]
 
 
 async def _info() -> Optional[_Info]:
@@ -43,19 +61,39 @@ async def _info() -> Optional[_Info]:
             lines = await buf.get_lines(lo=lo, hi=hi)
             filetype = await buf.filetype()
             filename = (await buf.get_name()) or ""
+            modified = await buf.opts.get(bool, "modified")
+
+            atomic = Atomic()
+            for b in bufs:
+                atomic.buf_get_name(b)
+            filenames = await atomic.commit(str)
+
             info = _Info(
                 buf_id=buf.number,
                 filetype=filetype,
                 filename=filename,
+                modified=modified,
                 range=(lo, hi),
                 lines=lines,
                 buffers=buffers,
+                filenames={*filenames},
             )
             return info
     except NvimError:
         return None
 
 
+async def _mtimes(paths: Iterable[str]) -> Mapping[str, float]:
+    def cont() -> Mapping[str, float]:
+        acc: MutableMapping[str, float] = {}
+        for path in paths:
+            with suppress(OSError):
+                acc[normcase(path)] = Path(path).stat().st_mtime
+        return acc
+
+    return await to_thread(cont)
+
+
 def _doc(client: BuffersClient, context: Context, word: BufferWord) -> Doc:
     def cont() -> Iterator[str]:
         if not client.same_filetype and word.filetype:
@@ -70,25 +108,52 @@ def _doc(client: BuffersClient, context: Context, word: BufferWord) -> Doc:
     return Doc(text=linesep.join(cont()), syntax="")
 
 
-class Worker(BaseWorker[BuffersClient, None]):
+class Worker(BaseWorker[BuffersClient, Path]):
     def __init__(
         self,
         ex: AsyncExecutor,
         supervisor: Supervisor,
         options: BuffersClient,
-        misc: None,
+        misc: Path,
     ) -> None:
         self._db = BDB(
             supervisor.limits.tokenization_limit,
             unifying_chars=supervisor.match.unifying_chars,
             include_syms=options.match_syms,
+            memory_index=options.memory_index,
+        )
+        self._fdb = (
+            FDB(misc, max_files=options.persistent_files)
+            if options.persistent_files
+            else None
         )
+        self._snapshots: MutableMapping[int, Tuple[float, int]] = {}
         super().__init__(ex, supervisor=supervisor, options=options, misc=misc)
         self._ex.run(self._poll())
 
     def interrupt(self) -> None:
         with self._interrupt():
             self._db.interrupt()
+            if self._fdb:
+                self._fdb.interrupt()
+
+    async def _persist(self, fdb: FDB, info: _Info) -> None:
+        filename = normcase(info.filename)
+        stored = fdb.mtimes()
+        mtimes = await _mtimes({*stored, info.filename} if info.filename else stored)
+        stale = {name for name, mtime in stored.items() if mtimes.get(name) != mtime}
+        fdb.vacuum({*map(normcase, info.filenames)}, stale=stale)
+
+        if not info.modified and (mtime := mtimes.get(filename)) is not None:
+            words = self._db.buffer_words(info.buf_id)
+            key = (mtime, len(words))
+            if filename in stale or self._snapshots.get(info.buf_id) != key:
+                fdb.snapshot(
+                    info.filename, filetype=info.filetype, mtime=mtime, words=words
+                )
+                self._snapshots[info.buf_id] = key
+            else:
+                fdb.touch(info.filename)
 
     async def _poll(self) -> None:
         while True:
@@ -110,6 +175,8 @@ class Worker(BaseWorker[BuffersClient, None]):
                             hi=hi,
                             lines=info.lines,
                         )
+                        if self._fdb:
+                            await self._persist(self._fdb, info=info)
 
             await self._with_interrupt(cont())
             async with self._idle:
@@ -166,7 +233,8 @@ class Worker(BaseWorker[BuffersClient, None]):
                 limitless=context.manual,
                 update=update,
             )
-            for word in words:
+
+            def cont(word: BufferWord) -> Completion:
                 edit = Edit(new_text=word.text)
                 cmp = Completion(
                     source=self._options.short_name,
@@ -179,4 +247,21 @@ class Worker(BaseWorker[BuffersClient, None]):
                     doc=_doc(self._options, context=context, word=word),
                     icon_match="Text",
                 )
-                yield cmp
+                return cmp
+
+            seen: MutableSet[str] = set()
+            for word in words:
+                seen.add(word.text)
+                yield cont(word)
+
+            if self._fdb:
+                persisted = self._fdb.words(
+                    self._supervisor.match,
+                    filetype=filetype,
+                    word=context.words,
+                    sym=context.syms if self._options.match_syms else "",
+                    limitless=context.manual,
+                )
+                for word in persisted:
+                    if word.text not in seen:
+                        yield cont(word)
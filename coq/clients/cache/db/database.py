@@ -1,12 +1,40 @@
+from collections import deque
 from contextlib import closing, suppress
+from dataclasses import dataclass
+from operator import itemgetter
 from sqlite3 import Connection, OperationalError
-from typing import Iterable, Iterator, Mapping, Tuple
+from typing import (
+    Deque,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from ....databases.types import DB
 from ....shared.settings import MatchOptions
-from ....shared.sql import BIGGEST_INT, init_db, like_esc
+from ....shared.sql import fuzzy_narrow, init_db, like_esc, sql_lower
 from .sql import sql
 
+_STACK = 9
+
+
+@dataclass(frozen=True)
+class _Frame:
+    """
+    Rows passing the prefix & length predicates of `select/words`
+
+    Both predicates only get stricter as `word` & `sym` are typed out
+    """
+
+    opts: MatchOptions
+    word: str
+    sym: str
+    rows: MutableMapping[Tuple[bytes, str], None]
+
 
 def _init() -> Connection:
     conn = Connection(":memory:", isolation_level=None)
@@ -16,13 +44,33 @@ def _init() -> Connection:
     return conn
 
 
+def _narrow(
+    opts: MatchOptions, word: str, sym: str, rows: Iterable[Tuple[bytes, str]]
+) -> Iterator[Tuple[bytes, str]]:
+    branches = tuple(
+        (sql_lower(w[: opts.exact_matches]), len(w) - opts.look_ahead)
+        for w in (word, sym)
+    )
+    for row in rows:
+        _, text = row
+        if text:
+            ltext = sql_lower(text)
+            for prefix, min_len in branches:
+                if len(text) >= min_len and ltext.startswith(prefix):
+                    yield row
+                    break
+
+
 class Database(DB):
     def __init__(self) -> None:
         self._conn = _init()
+        self._stack: Deque[_Frame] = deque(maxlen=_STACK)
 
     def insert(self, keys: Iterable[Tuple[bytes, str]]) -> None:
+        rows = tuple(keys)
+
         def m1() -> Iterator[Mapping]:
-            for key, word in keys:
+            for key, word in rows:
                 yield {"key": key, "word": word}
 
         with suppress(OperationalError):
@@ -30,28 +78,63 @@ class Database(DB):
                 with suppress(UnicodeEncodeError):
                     cursor.executemany(sql("insert", "word"), m1())
 
+        for frame in self._stack:
+            narrowed = _narrow(frame.opts, word=frame.word, sym=frame.sym, rows=rows)
+            frame.rows.update((row, None) for row in narrowed)
+
+    def _frame(self, opts: MatchOptions, word: str, sym: str) -> Optional[_Frame]:
+        for frame in reversed(self._stack):
+            if word == frame.word and sym == frame.sym:
+                return frame
+
+        for frame in reversed(self._stack):
+            if word.startswith(frame.word) and sym.startswith(frame.sym):
+                rows = _narrow(opts, word=word, sym=sym, rows=frame.rows)
+                new_frame = _Frame(
+                    opts=opts, word=word, sym=sym, rows=dict.fromkeys(rows)
+                )
+                self._stack.append(new_frame)
+                return new_frame
+
+        with suppress(OperationalError):
+            with self._conn, closing(self._conn.cursor()) as cursor:
+                cursor.execute(
+                    sql("select", "words"),
+                    {
+                        "look_ahead": opts.look_ahead,
+                        "word": word,
+                        "sym": sym,
+                        "like_word": like_esc(word[: opts.exact_matches]),
+                        "like_sym": like_esc(sym[: opts.exact_matches]),
+                    },
+                )
+                rows = ((row["key"], row["word"]) for row in cursor)
+                new_frame = _Frame(
+                    opts=opts, word=word, sym=sym, rows=dict.fromkeys(rows)
+                )
+                self._stack.append(new_frame)
+                return new_frame
+
+        return None
+
     def select(
         self, clear: bool, opts: MatchOptions, word: str, sym: str, limitless: int
     ) -> Iterator[Tuple[bytes, str]]:
-        with suppress(OperationalError):
-            if clear:
+        if clear:
+            self._stack.clear()
+            with suppress(OperationalError):
                 with self._conn, closing(self._conn.cursor()) as cursor:
                     cursor.execute(sql("delete", "words"))
-            else:
-                with self._conn, closing(self._conn.cursor()) as cursor:
-                    limit = BIGGEST_INT if limitless else opts.max_results
-                    cursor.execute(
-                        sql("select", "words"),
-                        {
-                            "exact": opts.exact_matches,
-                            "cut_off": opts.fuzzy_cutoff,
-                            "look_ahead": opts.look_ahead,
-                            "limit": limit,
-                            "word": word,
-                            "sym": sym,
-                            "like_word": like_esc(word[: opts.exact_matches]),
-                            "like_sym": like_esc(sym[: opts.exact_matches]),
-                        },
-                    )
-                    for row in cursor:
-                        yield row["key"], row["word"]
+        elif frame := self._frame(opts, word=word, sym=sym):
+            rows: Sequence[Tuple[bytes, str]] = tuple(frame.rows)
+            yield from fuzzy_narrow(
+                opts,
+                word=word,
+                sym=sym,
+                limitless=limitless,
+                rows=rows,
+                text=itemgetter(1),
+                uniq=itemgetter(0),
+                match_empty=True,
+                match_prefix=True,
+            )
@@ -23,6 +23,7 @@ from ...shared.types import (
     Completion,
     Context,
     Cursors,
+    ExternTS,
     Interruptible,
     SnippetEdit,
 )
@@ -161,7 +162,7 @@ class CacheWorker(Interruptible):
         )
 
         def get() -> Iterator[Completion]:
-            with timeit("CACHE -- GET"):
+            with timeit("CACHE -- GET", nest=False):
                 for key, sort_by in selected:
                     if (comp := self._cached.get(key)) and (
                         cached := sanitize_cached(
@@ -174,7 +175,10 @@ class CacheWorker(Interruptible):
                         ) and not (
                             isinstance(cached.primary_edit, SnippetEdit)
                             or cached.secondary_edits
-                            or cached.extern
+                            or (
+                                cached.extern
+                                and not isinstance(cached.extern, ExternTS)
+                            )
                             or cached.always_on_top
                         ):
                             continue
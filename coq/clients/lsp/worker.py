@@ -103,6 +103,7 @@ class Worker(BaseWorker[LSPClient, None]):
             context=context,
             chunk=self._max_results * 2,
             clients=set() if context.manual else cached_clients,
+            pre_filter=self._supervisor.match if self._options.pre_filter else None,
         )
 
     async def _poll(self) -> None:
@@ -1,5 +1,6 @@
 from contextlib import closing, suppress
 from dataclasses import dataclass
+from operator import itemgetter
 from sqlite3 import Connection, Cursor, OperationalError
 from typing import AbstractSet, Any, Iterator, Mapping
 
@@ -7,7 +8,7 @@ from ....consts import REGISTER_DB
 from ....databases.types import DB
 from ....shared.parse import coalesce, tokenize
 from ....shared.settings import MatchOptions
-from ....shared.sql import BIGGEST_INT, init_db, like_esc
+from ....shared.sql import fuzzy_filter, fuzzy_limit, init_db, like_esc
 from .sql import sql
 
 
@@ -96,14 +97,24 @@ class RDB(DB):
                 {
                     "cut_off": opts.fuzzy_cutoff,
                     "look_ahead": opts.look_ahead,
-                    "limit": BIGGEST_INT if limitless else opts.max_results,
+                    "batched": opts.batch_scoring,
+                    "limit": fuzzy_limit(opts, limitless=limitless),
                     "word": word,
                     "sym": (sym if match_syms else ""),
                     "like_word": like_esc(word[: opts.exact_matches]),
                     "like_sym": like_esc(sym[: opts.exact_matches]),
                 },
             )
-            for row in cursor:
+            rows = fuzzy_filter(
+                opts,
+                word=word,
+                sym=(sym if match_syms else ""),
+                limitless=limitless,
+                rows=cursor,
+                text=itemgetter("word"),
+                match_prefix=linewise,
+            )
+            for row in rows:
                 yield RegWord(
                     linewise=linewise,
                     match=row["word"],
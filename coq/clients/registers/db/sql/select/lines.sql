@@ -11,7 +11,7 @@ WHERE
     AND
     LENGTH(word) + :look_ahead >= LENGTH(:word)
     AND
-    X_SIMILARITY(LOWER(:word), lword, :look_ahead) > :cut_off
+    (:batched OR X_SIMILARITY(LOWER(:word), lword, :look_ahead) > :cut_off)
   )
   OR
   (
@@ -21,6 +21,6 @@ WHERE
     AND
     LENGTH(word) + :look_ahead >= LENGTH(:sym)
     AND
-    X_SIMILARITY(LOWER(:sym), lword, :look_ahead) > :cut_off
+    (:batched OR X_SIMILARITY(LOWER(:sym), lword, :look_ahead) > :cut_off)
   )
 LIMIT :limit
@@ -1,17 +1,30 @@
 from contextlib import closing, suppress
+from hashlib import sha256
+from itertools import chain, islice
+from operator import itemgetter
 from os.path import normcase
 from pathlib import Path, PurePath
 from sqlite3 import Connection, OperationalError
-from typing import AbstractSet, Iterator, Mapping, TypedDict, cast
-from uuid import uuid4
+from typing import (
+    AbstractSet,
+    Hashable,
+    Iterator,
+    Mapping,
+    MutableSet,
+    Optional,
+    TypedDict,
+    cast,
+)
+from uuid import NAMESPACE_URL, UUID, uuid4, uuid5
 
 from ....databases.types import DB
 from ....shared.settings import MatchOptions
-from ....shared.sql import BIGGEST_INT, init_db, like_esc
+from ....shared.sql import fuzzy_filter, fuzzy_limit, init_db, like_esc
+from ....snippets.artifact import dumps
 from ....snippets.types import LoadedSnips
 from .sql import sql
 
-_SCHEMA = "v4"
+SCHEMA = "v4"
 
 
 class _Snip(TypedDict):
@@ -22,20 +35,105 @@ class _Snip(TypedDict):
     doc: str
 
 
-def _init(db_dir: Path) -> Connection:
-    db = (db_dir / _SCHEMA).with_suffix(".sqlite3")
+def _connect(db: Path) -> Connection:
     db.parent.mkdir(parents=True, exist_ok=True)
-    conn = Connection(db, isolation_level=None)
+    conn = Connection(db.as_uri(), isolation_level=None, uri=True)
     init_db(conn)
     conn.executescript(sql("create", "pragma"))
     conn.executescript(sql("create", "tables"))
     return conn
 
 
+def _init(db_dir: Path) -> Connection:
+    db = (db_dir / SCHEMA).with_suffix(".sqlite3")
+    return _connect(db)
+
+
+def _populate(
+    conn: Connection,
+    path: PurePath,
+    mtime: float,
+    loaded: LoadedSnips,
+    source_id: UUID,
+) -> None:
+    """
+    One `executemany` per table, in one transaction instead of one per row
+
+    Rows go in sorted, for the same rowids across runs
+    """
+
+    filename = normcase(path)
+    snippets = sorted((uid.bytes, snippet) for uid, snippet in loaded.snippets.items())
+
+    def m1() -> Iterator[Mapping]:
+        filetypes = {
+            *loaded.exts.keys(),
+            *chain.from_iterable(loaded.exts.values()),
+            *(snippet.filetype for snippet in loaded.snippets.values()),
+        }
+        for filetype in sorted(filetypes):
+            yield {"filetype": filetype}
+
+    def m2() -> Iterator[Mapping]:
+        for src, dests in sorted(loaded.exts.items()):
+            for dest in sorted(dests):
+                yield {"source_id": source_id.bytes, "src": src, "dest": dest}
+
+    def m3() -> Iterator[Mapping]:
+        for snippet_id, snippet in snippets:
+            yield {
+                "rowid": snippet_id,
+                "source_id": source_id.bytes,
+                "filetype": snippet.filetype,
+                "grammar": snippet.grammar.name,
+                "content": snippet.content,
+                "label": snippet.label,
+                "doc": snippet.doc,
+            }
+
+    def m4() -> Iterator[Mapping]:
+        for snippet_id, snippet in snippets:
+            for match in sorted(snippet.matches):
+                yield {"snippet_id": snippet_id, "word": match}
+
+    with conn, closing(conn.cursor()) as cursor:
+        cursor.execute("BEGIN", ())
+        cursor.execute(sql("delete", "source"), {"filename": filename})
+        cursor.execute(
+            sql("insert", "source"),
+            {"rowid": source_id.bytes, "filename": filename, "mtime": mtime},
+        )
+        cursor.executemany(sql("insert", "filetype"), m1())
+        cursor.executemany(sql("insert", "extension"), m2())
+        cursor.executemany(sql("insert", "snippet"), m3())
+        cursor.executemany(sql("insert", "match"), m4())
+        cursor.execute("PRAGMA optimize", ())
+
+
+def build(db: Path, path: PurePath, loaded: LoadedSnips) -> None:
+    """
+    Prebuilt, indexed & read only, to be `attach`ed
+
+    Byte for byte reproducible, `path` should be relative
+    """
+
+    digest = sha256(dumps(loaded)).hexdigest()
+    source_id = uuid5(NAMESPACE_URL, name=f"{normcase(path)}#{digest}")
+
+    db.unlink(missing_ok=True)
+    conn = _connect(db)
+    try:
+        _populate(conn, path=path, mtime=0, loaded=loaded, source_id=source_id)
+        conn.executescript("PRAGMA journal_mode = DELETE; VACUUM;")
+    finally:
+        conn.close()
+
+
 class SDB(DB):
     def __init__(self, vars_dir: Path) -> None:
         db_dir = vars_dir / "clients" / "snippets"
         self._conn = _init(db_dir)
+        self._bundled = False
 
     def clean(self, paths: AbstractSet[PurePath]) -> None:
         with self._conn, closing(self._conn.cursor()) as cursor:
@@ -52,66 +150,71 @@ class SDB(DB):
             }
 
     def populate(self, path: PurePath, mtime: float, loaded: LoadedSnips) -> None:
+        _populate(self._conn, path=path, mtime=mtime, loaded=loaded, source_id=uuid4())
+
+    def attach(self, bundled: Optional[Path]) -> None:
+        """
+        The prebuilt `bundled` db is only ever read, user snippets are populated into `main`
+        """
+
         with self._conn, closing(self._conn.cursor()) as cursor:
-            filename, source_id = normcase(path), uuid4().bytes
-            cursor.execute(sql("delete", "source"), {"filename": filename})
-            cursor.execute(
-                sql("insert", "source"),
-                {"rowid": source_id, "filename": filename, "mtime": mtime},
-            )
+            if self._bundled:
+                cursor.executescript(sql("delete", "bundled"))
+                cursor.execute(sql("delete", "attach"), ())
+                self._bundled = False
 
-            for src, dests in loaded.exts.items():
-                for dest in dests:
-                    cursor.executemany(
-                        sql("insert", "filetype"),
-                        ({"filetype": src}, {"filetype": dest}),
-                    )
-                    cursor.execute(
-                        sql("insert", "extension"),
-                        {"source_id": source_id, "src": src, "dest": dest},
-                    )
-
-            for uid, snippet in loaded.snippets.items():
-                snippet_id = uid.bytes
-                cursor.execute(
-                    sql("insert", "filetype"), {"filetype": snippet.filetype}
-                )
-                cursor.execute(
-                    sql("insert", "snippet"),
-                    {
-                        "rowid": snippet_id,
-                        "source_id": source_id,
-                        "filetype": snippet.filetype,
-                        "grammar": snippet.grammar.name,
-                        "content": snippet.content,
-                        "label": snippet.label,
-                        "doc": snippet.doc,
-                    },
-                )
-                for match in snippet.matches:
-                    cursor.execute(
-                        sql("insert", "match"),
-                        {"snippet_id": snippet_id, "word": match},
-                    )
-            cursor.execute("PRAGMA optimize", ())
+            if bundled:
+                uri = f"{bundled.as_uri()}?mode=ro"
+                cursor.execute(sql("create", "attach"), {"uri": uri})
+                cursor.executescript(sql("create", "bundled"))
+                self._bundled = True
 
     def select(
         self, opts: MatchOptions, filetype: str, word: str, sym: str, limitless: int
     ) -> Iterator[_Snip]:
+        limit = fuzzy_limit(opts, limitless=limitless)
+        params = {
+            "cut_off": opts.fuzzy_cutoff,
+            "look_ahead": opts.look_ahead,
+            "batched": opts.batch_scoring,
+            "limit": limit,
+            "filetype": filetype,
+            "word": word,
+            "sym": sym,
+            "like_word": like_esc(word[: opts.exact_matches]),
+            "like_sym": like_esc(sym[: opts.exact_matches]),
+        }
+        views = ("snippets", "bundled") if self._bundled else ("snippets",)
+
+        def cont() -> Iterator[Mapping]:
+            """
+            The same snippet can be in both dbs, `LIMIT` is applied once over both
+            """
+
+            seen: MutableSet[Hashable] = set()
+            for view in views:
+                with closing(self._conn.cursor()) as cursor:
+                    cursor.execute(sql("select", view), params)
+                    for row in cursor:
+                        key = (
+                            row["snippet_id"],
+                            row["word"] if opts.batch_scoring else None,
+                        )
+                        if key not in seen:
+                            seen.add(key)
+                            yield row
+
         with suppress(OperationalError):
-            with self._conn, closing(self._conn.cursor()) as cursor:
-                cursor.execute(
-                    sql("select", "snippets"),
-                    {
-                        "cut_off": opts.fuzzy_cutoff,
-                        "look_ahead": opts.look_ahead,
-                        "limit": BIGGEST_INT if limitless else opts.max_results,
-                        "filetype": filetype,
-                        "word": word,
-                        "sym": sym,
-                        "like_word": like_esc(word[: opts.exact_matches]),
-                        "like_sym": like_esc(sym[: opts.exact_matches]),
-                    },
+            with self._conn:
+                rows = fuzzy_filter(
+                    opts,
+                    word=word,
+                    sym=sym,
+                    limitless=limitless,
+                    rows=islice(cont(), limit),
+                    text=itemgetter("word"),
+                    uniq=itemgetter("snippet_id"),
+                    match_prefix=True,
                 )
-                for row in cursor:
+                for row in rows:
                     yield cast(_Snip, row)
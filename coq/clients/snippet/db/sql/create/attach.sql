@@ -0,0 +1 @@
+ATTACH DATABASE :uri AS bundled
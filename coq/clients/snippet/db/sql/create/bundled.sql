@@ -0,0 +1,105 @@
+BEGIN;
+
+
+-- !! Shadows the views of `main`, with the extensions of the read only `bundled` db unioned in
+CREATE TEMP VIEW IF NOT EXISTS uniq_extensions_view AS
+SELECT
+  src,
+  dest
+FROM main.extensions
+WHERE
+  src <> dest
+UNION
+SELECT
+  src,
+  dest
+FROM bundled.extensions
+WHERE
+  src <> dest;
+
+
+CREATE TEMP VIEW IF NOT EXISTS extensions_view AS
+WITH RECURSIVE all_exts AS (
+  SELECT
+    1 AS lvl,
+    e1.src,
+    e1.dest
+  FROM temp.uniq_extensions_view AS e1
+  UNION ALL
+  SELECT
+    all_exts.lvl + 1 AS lvl,
+    all_exts.src,
+    e2.dest
+  FROM temp.uniq_extensions_view AS e2
+  JOIN all_exts
+  ON
+    all_exts.dest = e2.src
+)
+SELECT
+  filetype AS src,
+  filetype AS dest
+FROM main.filetypes
+UNION
+SELECT
+  filetype AS src,
+  filetype AS dest
+FROM bundled.filetypes
+UNION ALL
+SELECT
+  all_exts.src,
+  all_exts.dest
+FROM all_exts
+WHERE
+  lvl < 9;
+
+
+CREATE TEMP VIEW IF NOT EXISTS snippets_view AS
+SELECT
+  snippets.rowid       AS snippet_id,
+  snippets.source_id   AS source_id,
+  snippets.grammar     AS grammar,
+  matches.word         AS word,
+  matches.lword        AS lword,
+  snippets.content     AS snippet,
+  snippets.label       AS label,
+  snippets.doc         AS doc,
+  extensions_view.src  AS ft_src,
+  extensions_view.dest AS ft_dest
+FROM main.snippets AS snippets
+JOIN main.matches AS matches
+ON matches.snippet_id = snippets.rowid
+JOIN temp.extensions_view AS extensions_view
+ON
+  snippets.filetype = extensions_view.dest
+WHERE
+  matches.word <> ''
+  AND
+  snippets.content <> '';
+
+
+-- !! Not unioned with `snippets_view`, a compound view is not flattened into the `GROUP BY`
+CREATE TEMP VIEW IF NOT EXISTS bundled_snippets_view AS
+SELECT
+  snippets.rowid       AS snippet_id,
+  snippets.source_id   AS source_id,
+  snippets.grammar     AS grammar,
+  matches.word         AS word,
+  matches.lword        AS lword,
+  snippets.content     AS snippet,
+  snippets.label       AS label,
+  snippets.doc         AS doc,
+  extensions_view.src  AS ft_src,
+  extensions_view.dest AS ft_dest
+FROM bundled.snippets AS snippets
+JOIN bundled.matches AS matches
+ON matches.snippet_id = snippets.rowid
+JOIN temp.extensions_view AS extensions_view
+ON
+  snippets.filetype = extensions_view.dest
+WHERE
+  matches.word <> ''
+  AND
+  snippets.content <> '';
+
+
+END;
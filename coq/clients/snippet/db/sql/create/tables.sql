@@ -49,6 +49,8 @@ CREATE TABLE IF NOT EXISTS matches (
 CREATE INDEX IF NOT EXISTS matches_snippet_id ON matches (snippet_id);
 CREATE INDEX IF NOT EXISTS matches_word       ON matches (word);
 CREATE INDEX IF NOT EXISTS matches_lword      ON matches (lword);
+-- !! `LIKE` is case insensitive, only a `NOCASE` index turns the prefix match into a range search
+CREATE INDEX IF NOT EXISTS matches_lword_nocase ON matches (lword COLLATE NOCASE);
 
 
 CREATE VIEW IF NOT EXISTS uniq_extensions_view AS
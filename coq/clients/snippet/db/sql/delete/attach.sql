@@ -0,0 +1 @@
+DETACH DATABASE bundled
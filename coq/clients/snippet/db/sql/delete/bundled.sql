@@ -0,0 +1,10 @@
+BEGIN;
+
+
+DROP VIEW IF EXISTS temp.bundled_snippets_view;
+DROP VIEW IF EXISTS temp.snippets_view;
+DROP VIEW IF EXISTS temp.extensions_view;
+DROP VIEW IF EXISTS temp.uniq_extensions_view;
+
+
+END;
@@ -0,0 +1,36 @@
+SELECT
+  snippet_id,
+  grammar,
+  word,
+  snippet,
+  label,
+  doc
+FROM bundled_snippets_view
+WHERE
+  ft_src IN (:filetype, '*', '_')
+  AND
+  (
+    (
+      :word <> ''
+      AND
+      lword LIKE :like_word ESCAPE '!'
+      AND
+      LENGTH(word) + :look_ahead >= LENGTH(:word)
+      AND
+      (:batched OR X_SIMILARITY(LOWER(:word), lword, :look_ahead) > :cut_off)
+    )
+    OR
+    (
+      :sym <> ''
+      AND
+      lword LIKE :like_sym ESCAPE '!'
+      AND
+      LENGTH(word) + :look_ahead >= LENGTH(:sym)
+      AND
+      (:batched OR X_SIMILARITY(LOWER(:sym), lword, :look_ahead) > :cut_off)
+    )
+  )
+GROUP BY
+  snippet_id,
+  CASE WHEN :batched THEN word ELSE NULL END
+LIMIT :limit
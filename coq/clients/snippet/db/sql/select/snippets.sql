@@ -1,4 +1,5 @@
 SELECT
+  snippet_id,
   grammar,
   word,
   snippet,
@@ -16,7 +17,7 @@ WHERE
       AND
       LENGTH(word) + :look_ahead >= LENGTH(:word)
       AND
-      X_SIMILARITY(LOWER(:word), lword, :look_ahead) > :cut_off
+      (:batched OR X_SIMILARITY(LOWER(:word), lword, :look_ahead) > :cut_off)
     )
     OR
     (
@@ -26,9 +27,10 @@ WHERE
       AND
       LENGTH(word) + :look_ahead >= LENGTH(:sym)
       AND
-      X_SIMILARITY(LOWER(:sym), lword, :look_ahead) > :cut_off
+      (:batched OR X_SIMILARITY(LOWER(:sym), lword, :look_ahead) > :cut_off)
     )
   )
 GROUP BY
-  snippet_id
+  snippet_id,
+  CASE WHEN :batched THEN word ELSE NULL END
 LIMIT :limit
@@ -1,5 +1,5 @@
 from pathlib import Path, PurePath
-from typing import AbstractSet, AsyncIterator, Mapping
+from typing import AbstractSet, AsyncIterator, Mapping, Optional
 
 from ...shared.executor import AsyncExecutor
 from ...shared.runtime import Supervisor
@@ -39,6 +39,13 @@ class Worker(BaseWorker[SnippetClient, Path]):
 
         await self._ex.submit(cont())
 
+    async def attach(self, bundled: Optional[Path]) -> None:
+        async def cont() -> None:
+            with self._interrupt_lock:
+                self._db.attach(bundled)
+
+        await self._ex.submit(cont())
+
     async def populate(self, path: PurePath, mtime: float, loaded: LoadedSnips) -> None:
         async def cont() -> None:
             with self._interrupt_lock:
@@ -1,19 +1,20 @@
 from contextlib import closing, suppress
 from hashlib import md5
+from operator import itemgetter
 from os.path import normcase
 from pathlib import Path, PurePath
 from sqlite3 import Connection, OperationalError
-from typing import AbstractSet, Iterator, Mapping, cast
+from typing import AbstractSet, Iterable, Iterator, Mapping, Sequence, Tuple, cast
 
 from pynvim_pp.lib import encode
 
 from ....databases.types import DB
 from ....shared.settings import MatchOptions
-from ....shared.sql import BIGGEST_INT, init_db, like_esc
+from ....shared.sql import fuzzy_filter, fuzzy_limit, init_db, like_esc
 from ....tags.types import Tag, Tags
 from .sql import sql
 
-_SCHEMA = "v5"
+_SCHEMA = "v6"
 
 _NIL_TAG = Tag(
     language="",
@@ -44,45 +45,101 @@ def _init(db_dir: Path, cwd: PurePath) -> Connection:
 class CTDB(DB):
     def __init__(self, vars_dir: Path, cwd: PurePath) -> None:
         self._vars_dir = vars_dir / "clients" / "tags"
+        self.cwd = cwd
         self._conn = _init(self._vars_dir, cwd=cwd)
 
     def swap(self, cwd: PurePath) -> None:
         self._conn.close()
+        self.cwd = cwd
         self._conn = _init(self._vars_dir, cwd=cwd)
 
-    def paths(self) -> Mapping[str, float]:
+    def paths(self) -> Mapping[str, Tuple[float, str]]:
         with suppress(OperationalError):
             with self._conn, closing(self._conn.cursor()) as cursor:
                 cursor.execute(sql("select", "files"), ())
-                files = {row["filename"]: row["mtime"] for row in cursor.fetchall()}
+                files = {
+                    row["filename"]: (row["mtime"], row["digest"])
+                    for row in cursor.fetchall()
+                }
                 return files
         return {}
 
-    def reconciliate(self, dead: AbstractSet[str], new: Tags) -> None:
+    def insert(self, new: Tags, seen: AbstractSet[str]) -> None:
+        """
+        Files not `seen` earlier in the same run are replaced
+
+        Their `mtime` is left at `0` until `stamp`, so an interrupted run is redone
+        """
+
         with suppress(OperationalError):
             with self._conn, closing(self._conn.cursor()) as cursor:
+                cursor.execute("BEGIN", ())
+                fresh = new.keys() - seen
 
                 def m1() -> Iterator[Mapping]:
-                    for filename, (lang, mtime, _) in new.items():
+                    for filename in fresh:
+                        lang, _ = new[filename]
                         yield {
                             "filename": filename,
                             "filetype": lang,
-                            "mtime": mtime,
+                            "mtime": 0,
                         }
 
                 def m2() -> Iterator[Mapping]:
-                    for _, _, tags in new.values():
+                    for _, tags in new.values():
                         for tag in tags:
                             yield {**_NIL_TAG, **tag}
 
                 cursor.executemany(
                     sql("delete", "file"),
-                    ({"filename": f} for f in dead | new.keys()),
+                    ({"filename": f} for f in fresh),
                 )
                 cursor.executemany(sql("insert", "file"), m1())
                 cursor.executemany(sql("insert", "tag"), m2())
+
+    def stamp(self, stamps: Mapping[str, Tuple[float, str]]) -> None:
+        with suppress(OperationalError):
+            with self._conn, closing(self._conn.cursor()) as cursor:
+                cursor.executemany(
+                    sql("update", "file"),
+                    (
+                        {"filename": filename, "mtime": mtime, "digest": digest}
+                        for filename, (mtime, digest) in stamps.items()
+                    ),
+                )
+
+    def reconciliate(self, dead: AbstractSet[str]) -> None:
+        with suppress(OperationalError):
+            with self._conn, closing(self._conn.cursor()) as cursor:
+                cursor.executemany(
+                    sql("delete", "file"),
+                    ({"filename": f} for f in dead),
+                )
                 cursor.execute("PRAGMA optimize", ())
 
+    def pending(self, limit: int) -> Sequence[str]:
+        with suppress(OperationalError):
+            with self._conn, closing(self._conn.cursor()) as cursor:
+                cursor.execute(sql("select", "pending"), {"limit": limit})
+                return tuple(row["dirname"] for row in cursor.fetchall())
+        return ()
+
+    def walked(self, done: Iterable[str], subdirs: Iterable[str]) -> None:
+        """
+        Progress of the project walk, kept across sessions
+        """
+
+        with suppress(OperationalError):
+            with self._conn, closing(self._conn.cursor()) as cursor:
+                cursor.executemany(
+                    sql("delete", "pending"),
+                    ({"dirname": dirname} for dirname in done),
+                )
+                cursor.executemany(
+                    sql("insert", "pending"),
+                    ({"dirname": dirname} for dirname in subdirs),
+                )
+
     def select(
         self,
         opts: MatchOptions,
@@ -99,7 +156,8 @@ class CTDB(DB):
                     {
                         "cut_off": opts.fuzzy_cutoff,
                         "look_ahead": opts.look_ahead,
-                        "limit": BIGGEST_INT if limitless else opts.max_results,
+                        "batched": opts.batch_scoring,
+                        "limit": fuzzy_limit(opts, limitless=limitless),
                         "filename": filename,
                         "line_num": line_num,
                         "word": word,
@@ -108,5 +166,13 @@ class CTDB(DB):
                         "like_sym": like_esc(sym[: opts.exact_matches]),
                     },
                 )
-                for row in cursor:
+                rows = fuzzy_filter(
+                    opts,
+                    word=word,
+                    sym=sym,
+                    limitless=limitless,
+                    rows=cursor,
+                    text=itemgetter("name"),
+                )
+                for row in rows:
                     yield cast(Tag, {**row})
@@ -4,7 +4,8 @@ BEGIN;
 CREATE TABLE IF NOT EXISTS files (
   filename TEXT NOT NULL PRIMARY KEY,
   filetype TEXT NOT NULL,
-  mtime    REAL NOT NULL
+  mtime    REAL NOT NULL,
+  digest   TEXT NOT NULL DEFAULT ''
 ) WITHOUT ROWID;
 CREATE INDEX IF NOT EXISTS files_filetype ON files (filetype);
 
@@ -27,6 +28,14 @@ CREATE INDEX IF NOT EXISTS tags_path ON tags (`path`);
 CREATE INDEX IF NOT EXISTS tags_line ON tags (line);
 CREATE INDEX IF NOT EXISTS tags_name ON tags (name);
 CREATE INDEX IF NOT EXISTS tags_lnam ON tags (lname);
+-- !! `LIKE` is case insensitive, only a `NOCASE` index turns the prefix match into a range search
+CREATE INDEX IF NOT EXISTS tags_lnam_nocase ON tags (lname COLLATE NOCASE);
+
+
+-- !! Directories the project walk is yet to list
+CREATE TABLE IF NOT EXISTS pending (
+  dirname TEXT NOT NULL PRIMARY KEY
+) WITHOUT ROWID;
 
 
 END;
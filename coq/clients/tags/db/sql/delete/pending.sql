@@ -0,0 +1,3 @@
+DELETE FROM pending
+WHERE
+  dirname = :dirname
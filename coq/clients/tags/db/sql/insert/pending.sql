@@ -0,0 +1,2 @@
+INSERT OR IGNORE INTO pending (dirname)
+VALUES                        (:dirname)
@@ -1,5 +1,6 @@
 SELECT
   filename,
-  mtime
+  mtime,
+  digest
 FROM files
 
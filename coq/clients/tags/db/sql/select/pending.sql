@@ -0,0 +1,4 @@
+SELECT
+  dirname
+FROM pending
+LIMIT :limit
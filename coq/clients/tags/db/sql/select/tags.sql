@@ -17,9 +17,10 @@ SELECT
   tags.scopeKind,
   tags.`access`
 FROM tags
+-- !! `+` keeps the planner off `tags_path`, candidates come from the `lname` prefix range instead
 JOIN files
 ON
-  files.filename = tags.`path`
+  files.filename = +tags.`path`
 JOIN fts
 ON
   fts.filetype = files.filetype
@@ -36,7 +37,7 @@ WHERE
       AND
       tags.name <> SUBSTR(:word, 1, LENGTH(tags.name))
       AND
-      X_SIMILARITY(LOWER(:word), tags.lname, :look_ahead) > :cut_off
+      (:batched OR X_SIMILARITY(LOWER(:word), tags.lname, :look_ahead) > :cut_off)
     )
     OR
     (
@@ -48,7 +49,7 @@ WHERE
       AND
       tags.name <> SUBSTR(:sym, 1, LENGTH(tags.name))
       AND
-      X_SIMILARITY(LOWER(:sym), tags.lname, :look_ahead) > :cut_off
+      (:batched OR X_SIMILARITY(LOWER(:sym), tags.lname, :look_ahead) > :cut_off)
     )
   )
 LIMIT :limit
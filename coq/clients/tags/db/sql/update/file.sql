@@ -0,0 +1,6 @@
+UPDATE files
+SET
+  mtime  = :mtime,
+  digest = :digest
+WHERE
+  filename = X_NORM_CASE(:filename)
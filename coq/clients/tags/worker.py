@@ -1,15 +1,24 @@
+from asyncio import gather
 from contextlib import suppress
-from os import linesep
+from hashlib import md5
+from heapq import heapify, heappop
+from os import cpu_count, linesep
 from os.path import normcase
 from pathlib import Path, PurePath
 from string import capwords
 from typing import (
     AbstractSet,
     AsyncIterator,
+    Callable,
     Iterable,
     Iterator,
     Mapping,
+    MutableMapping,
     MutableSet,
+    Optional,
+    Pattern,
+    Sequence,
+    Set,
     Tuple,
 )
 
@@ -20,7 +29,7 @@ from pynvim_pp.rpc_types import NvimError
 from std2.asyncio import to_thread
 
 from ...paths.show import fmt_path
-from ...shared.executor import AsyncExecutor
+from ...shared.executor import AsyncExecutor, offload
 from ...shared.runtime import Supervisor
 from ...shared.runtime import Worker as BaseWorker
 from ...shared.settings import TagsClient
@@ -28,6 +37,7 @@ from ...shared.timeit import timeit
 from ...shared.types import Completion, Context, Doc, Edit
 from ...tags.parse import parse, run
 from ...tags.types import Tag
+from ...tags.walk import Walked, ctags_maps, walk
 from .db.database import CTDB
 
 
@@ -45,15 +55,62 @@ async def _ls() -> AbstractSet[str]:
         return {*names}
 
 
+_SHARD = 66
+_PARALLELISM = max(1, cpu_count() or 1)
+_WALK = 99
+_NIL_WALK = Walked(done=(), subdirs=(), files=())
+
+
+def _chunk(paths: Iterable[str], n: int) -> Sequence[Sequence[str]]:
+    ordered = tuple(paths)
+    size = max(1, -(-len(ordered) // n))
+    return tuple(ordered[i : i + size] for i in range(0, len(ordered), size))
+
+
 async def _mtimes(paths: AbstractSet[str]) -> Mapping[str, float]:
-    def c1() -> Iterable[Tuple[Path, float]]:
-        for path in map(Path, paths):
+    def c1(chunk: Sequence[str]) -> Mapping[str, float]:
+        acc: MutableMapping[str, float] = {}
+        for path in chunk:
             with suppress(OSError):
-                stat = path.stat()
-                yield path, stat.st_mtime
+                stat = Path(path).stat()
+                acc[normcase(path)] = stat.st_mtime
+        return acc
+
+    chunks = await gather(
+        *(to_thread(c1, chunk) for chunk in _chunk(paths, _PARALLELISM))
+    )
+    return {key: val for chunk in chunks for key, val in chunk.items()}
 
-    c2 = lambda: {normcase(key): val for key, val in c1()}
-    return await to_thread(c2)
+
+async def _digests(paths: AbstractSet[str]) -> Mapping[str, str]:
+    """
+    `md5` releases the GIL on large inputs, files are hashed in parallel
+    """
+
+    def c1(chunk: Sequence[str]) -> Mapping[str, str]:
+        acc: MutableMapping[str, str] = {}
+        for path in chunk:
+            with suppress(OSError):
+                acc[path] = md5(Path(path).read_bytes()).hexdigest()
+        return acc
+
+    chunks = await gather(
+        *(to_thread(c1, chunk) for chunk in _chunk(paths, _PARALLELISM))
+    )
+    return {key: val for chunk in chunks for key, val in chunk.items()}
+
+
+def _shards(
+    paths: Iterable[str], priority: Callable[[str], int]
+) -> Iterator[Sequence[str]]:
+    """
+    Lowest `priority` first, ie. the open buffers
+    """
+
+    queue = [(priority(path), path) for path in paths]
+    heapify(queue)
+    while queue:
+        yield tuple(heappop(queue)[1] for _ in range(min(_SHARD, len(queue))))
 
 
 def _doc(client: TagsClient, context: Context, tag: Tag) -> Doc:
@@ -140,6 +197,8 @@ class Worker(BaseWorker[TagsClient, Tuple[Path, Path, PurePath]]):
     ) -> None:
         self._exec, vars_dir, cwd = misc
         self._db = CTDB(vars_dir, cwd=cwd)
+        self._seed = True
+        self._maps: Optional[Pattern[str]] = None
         super().__init__(ex, supervisor=supervisor, options=options, misc=misc)
         self._ex.run(self._poll())
 
@@ -147,24 +206,87 @@ class Worker(BaseWorker[TagsClient, Tuple[Path, Path, PurePath]]):
         with self._interrupt():
             self._db.interrupt()
 
+    async def _index(self, shard: Sequence[str], seen: Set[str]) -> None:
+        batches = run(self._exec, *shard)
+        try:
+            async for lines in batches:
+                new = await offload(self._supervisor.procpool, parse, lines)
+                self._db.insert(new, seen=seen)
+                seen.update(new.keys())
+        finally:
+            await batches.aclose()
+
+    async def _walk(self) -> Walked:
+        """
+        The walk starts over once per session, after the previous one is done
+        """
+
+        if not self._options.index_project:
+            return _NIL_WALK
+        else:
+            if not self._maps:
+                self._maps = await ctags_maps(self._exec)
+            dirs = self._db.pending(_WALK)
+            if not dirs and self._seed:
+                dirs = (str(self._db.cwd),)
+            if not dirs or not self._maps:
+                return _NIL_WALK
+            else:
+                return await to_thread(
+                    walk,
+                    self._db.cwd,
+                    dirs=dirs,
+                    maps=self._maps,
+                    budget=_SHARD * _PARALLELISM,
+                )
+
     async def _poll(self) -> None:
         while True:
 
             async def cont() -> None:
                 with suppress_and_log(), timeit("IDLE :: TAGS"):
-                    buf_names = await _ls()
+                    buf_names = {normcase(name) for name in await _ls()}
                     existing = self._db.paths()
-                    paths = buf_names | existing.keys()
+                    walked = await self._walk()
+                    paths = buf_names | existing.keys() | {*walked.files}
                     mtimes = await _mtimes(paths)
-                    query_paths = tuple(
+                    touched = {
                         path
                         for path, mtime in mtimes.items()
-                        if mtime > existing.get(path, 0)
+                        if mtime > existing.get(path, (0.0, ""))[0]
+                    }
+                    digests = await _digests(touched)
+                    stamps = {
+                        path: (mtimes[path], digest) for path, digest in digests.items()
+                    }
+                    unchanged = {
+                        path
+                        for path, digest in digests.items()
+                        if path in existing and existing[path][1] == digest
+                    }
+                    self._db.stamp({path: stamps[path] for path in unchanged})
+
+                    seen: Set[str] = set()
+                    shards = _shards(
+                        stamps.keys() - unchanged,
+                        priority=lambda path: (
+                            0 if path in buf_names else 1 if path in existing else 2
+                        ),
                     )
-                    raw = await run(self._exec, *query_paths) if query_paths else ""
-                    new = parse(mtimes, raw=raw)
+
+                    async def drain() -> None:
+                        for shard in shards:
+                            await self._index(shard, seen=seen)
+                            self._db.stamp(
+                                {path: stamps[path] for path in shard if path in seen}
+                            )
+
+                    await gather(*(drain() for _ in range(_PARALLELISM)))
                     dead = existing.keys() - mtimes.keys()
-                    self._db.reconciliate(dead, new=new)
+                    self._db.reconciliate(dead)
+                    self._db.walked(walked.done, subdirs=walked.subdirs)
+                    if walked.done:
+                        self._seed = False
 
             await self._with_interrupt(cont())
             async with self._idle:
@@ -174,6 +296,7 @@ class Worker(BaseWorker[TagsClient, Tuple[Path, Path, PurePath]]):
         async def cont() -> None:
             with self._interrupt_lock:
                 self._db.swap(cwd)
+                self._seed = True
 
         await self._ex.submit(cont())
 
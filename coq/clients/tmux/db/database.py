@@ -1,5 +1,6 @@
 from contextlib import closing, suppress
 from dataclasses import dataclass
+from operator import itemgetter
 from sqlite3 import Connection, OperationalError
 from typing import AbstractSet, Iterator, Mapping, MutableMapping, Optional
 
@@ -7,7 +8,7 @@ from ....consts import TMUX_DB
 from ....databases.types import DB
 from ....shared.parse import tokenize
 from ....shared.settings import MatchOptions
-from ....shared.sql import BIGGEST_INT, init_db, like_esc
+from ....shared.sql import fuzzy_filter, fuzzy_limit, init_db, like_esc
 from ....tmux.parse import Pane
 from .sql import sql
 
@@ -108,7 +109,8 @@ class TMDB(DB):
                     {
                         "cut_off": opts.fuzzy_cutoff,
                         "look_ahead": opts.look_ahead,
-                        "limit": BIGGEST_INT if limitless else opts.max_results,
+                        "batched": opts.batch_scoring,
+                        "limit": fuzzy_limit(opts, limitless=limitless),
                         "pane_id": self._current.uid if self._current else None,
                         "word": word,
                         "sym": sym,
@@ -116,7 +118,15 @@ class TMDB(DB):
                         "like_sym": like_esc(sym[: opts.exact_matches]),
                     },
                 )
-                for row in cursor:
+                rows = fuzzy_filter(
+                    opts,
+                    word=word,
+                    sym=sym,
+                    limitless=limitless,
+                    rows=cursor,
+                    text=itemgetter("word"),
+                )
+                for row in rows:
                     yield TmuxWord(
                         text=row["word"],
                         session_name=row["session_name"],
@@ -1,12 +1,15 @@
 from contextlib import closing, suppress
+from hashlib import md5
+from operator import itemgetter
 from sqlite3 import Connection, Cursor, OperationalError
-from typing import Iterable, Iterator, Mapping
+from typing import Iterable, Iterator, Mapping, Optional, Tuple
 
 from ....consts import TREESITTER_DB
 from ....databases.types import DB
 from ....shared.settings import MatchOptions
-from ....shared.sql import BIGGEST_INT, init_db, like_esc
-from ....treesitter.types import Payload, SimplePayload
+from ....shared.sql import fuzzy_filter, fuzzy_limit, init_db, like_esc
+from ....shared.types import UTF8
+from ....treesitter.types import Node, Payload, SimplePayload
 from .sql import sql
 
 
@@ -18,6 +21,10 @@ def _init() -> Connection:
     return conn
 
 
+def _node_id(node: SimplePayload) -> str:
+    return md5(f"{node.kind}\0{node.text}".encode(UTF8, "surrogateescape")).hexdigest()
+
+
 def _ensure_buffer(cursor: Cursor, buf_id: int, filetype: str, filename: str) -> None:
     cursor.execute(sql("select", "buffer_by_id"), {"rowid": buf_id})
     row = {
@@ -52,6 +59,7 @@ class TDB(DB):
                         for buf_id, line_count in live_bufs.items()
                     ),
                 )
+                cursor.execute(sql("delete", "nodes"), ())
                 cursor.execute("PRAGMA optimize", ())
 
     def populate(
@@ -59,36 +67,74 @@ class TDB(DB):
         buf_id: int,
         filetype: str,
         filename: str,
-        lo: int,
-        hi: int,
-        nodes: Iterable[Payload],
-    ) -> None:
+        reset: bool,
+        edits: Iterable[Tuple[int, int, int]],
+        stale: Iterable[Tuple[int, int]],
+        ancestors: Mapping[str, SimplePayload],
+        nodes: Iterable[Node],
+    ) -> bool:
+        """
+        `edits` shift rows below them, before the `stale` row ranges are replaced by `nodes`
+
+        `ancestors` are only referred to by key from `nodes`, they are stored by content
+
+        All or nothing, `False` if rolled back
+        """
+
+        node_ids = {key: _node_id(node) for key, node in ancestors.items()}
+
         def m1() -> Iterator[Mapping]:
+            for key, node in ancestors.items():
+                yield {
+                    "buffer_id": buf_id,
+                    "node_id": node_ids[key],
+                    "kind": node.kind,
+                    "text": node.text,
+                }
+
+        def m2() -> Iterator[Mapping]:
             for node in nodes:
-                lo, hi = node.range if node.range else (None, None)
+                lo, hi = node.range
                 yield {
                     "buffer_id": buf_id,
                     "lo": lo,
+                    "col": node.col,
                     "hi": hi,
                     "word": node.text,
                     "kind": node.kind,
-                    "pword": node.parent.text if node.parent else None,
-                    "pkind": node.parent.kind if node.parent else None,
-                    "gpword": node.grandparent.text if node.grandparent else None,
-                    "gpkind": node.grandparent.kind if node.grandparent else None,
+                    "parent_id": node_ids.get(node.parent or ""),
+                    "grandparent_id": node_ids.get(node.grandparent or ""),
                 }
 
-        with suppress(OperationalError):
+        with suppress(OperationalError, UnicodeEncodeError):
             with self._conn, closing(self._conn.cursor()) as cursor:
+                cursor.execute("BEGIN", ())
                 _ensure_buffer(
                     cursor, buf_id=buf_id, filetype=filetype, filename=filename
                 )
-                cursor.execute(
+                if reset:
+                    cursor.execute(
+                        sql("delete", "words"),
+                        {"buffer_id": buf_id, "lo": 0, "hi": -1},
+                    )
+                for row, old, new in edits:
+                    cursor.execute(
+                        sql("delete", "words"),
+                        {"buffer_id": buf_id, "lo": row, "hi": row + old + 1},
+                    )
+                    if new != old:
+                        cursor.execute(
+                            sql("update", "shift"),
+                            {"buffer_id": buf_id, "row": row + old, "delta": new - old},
+                        )
+                cursor.executemany(
                     sql("delete", "words"),
-                    {"buffer_id": buf_id, "lo": lo, "hi": hi},
+                    ({"buffer_id": buf_id, "lo": lo, "hi": hi} for lo, hi in stale),
                 )
-                with suppress(UnicodeEncodeError):
-                    cursor.executemany(sql("insert", "word"), m1())
+                cursor.executemany(sql("insert", "node"), m1())
+                cursor.executemany(sql("insert", "word"), m2())
+            return True
+        return False
 
     def select(
         self,
@@ -97,7 +143,11 @@ class TDB(DB):
         word: str,
         sym: str,
         limitless: int,
-    ) -> Iterator[Payload]:
+    ) -> Iterator[Tuple[int, int, SimplePayload]]:
+        """
+        `(buffer, word id, word)`, see `doc` for the rest
+        """
+
         with suppress(OperationalError):
             with self._conn, closing(self._conn.cursor()) as cursor:
                 cursor.execute(
@@ -105,7 +155,8 @@ class TDB(DB):
                     {
                         "cut_off": opts.fuzzy_cutoff,
                         "look_ahead": opts.look_ahead,
-                        "limit": BIGGEST_INT if limitless else opts.max_results,
+                        "batched": opts.batch_scoring,
+                        "limit": fuzzy_limit(opts, limitless=limitless),
                         "filetype": filetype,
                         "word": word,
                         "sym": sym,
@@ -114,23 +165,45 @@ class TDB(DB):
                     },
                 )
 
-                for row in cursor:
-                    range = row["lo"], row["hi"]
+                rows = fuzzy_filter(
+                    opts,
+                    word=word,
+                    sym=sym,
+                    limitless=limitless,
+                    rows=cursor,
+                    text=itemgetter("word"),
+                )
+                for row in rows:
+                    payload = SimplePayload(text=row["word"], kind=row["kind"])
+                    yield row["buffer_id"], row["word_id"], payload
+
+    def doc(self, buf_id: int, word_id: int) -> Optional[Payload]:
+        """
+        Parent & grandparent texts are only joined in for the preview
+        """
+
+        with suppress(OperationalError):
+            with self._conn, closing(self._conn.cursor()) as cursor:
+                cursor.execute(
+                    sql("select", "node"), {"buffer_id": buf_id, "word_id": word_id}
+                )
+                for row in cursor.fetchall():
                     grandparent = (
-                        SimplePayload(text=row["gpword"], kind=row["gpkind"])
-                        if row["gpword"] and row["gpkind"]
+                        SimplePayload(text=row["gptext"], kind=row["gpkind"])
+                        if row["gptext"] and row["gpkind"]
                         else None
                     )
                     parent = (
-                        SimplePayload(text=row["pword"], kind=row["pkind"])
-                        if row["pword"] and row["pkind"]
+                        SimplePayload(text=row["ptext"], kind=row["pkind"])
+                        if row["ptext"] and row["pkind"]
                         else None
                     )
-                    yield Payload(
+                    return Payload(
                         filename=row["filename"],
-                        range=range,
+                        range=(row["lo"], row["hi"]),
                         text=row["word"],
                         kind=row["kind"],
                         parent=parent,
                         grandparent=grandparent,
                     )
+        return None
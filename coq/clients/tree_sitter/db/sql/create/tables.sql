@@ -9,39 +9,47 @@ CREATE TABLE IF NOT EXISTS buffers (
 CREATE INDEX IF NOT EXISTS buffers_filetype ON buffers (filetype);
 
 
-CREATE TABLE IF NOT EXISTS words (
+-- Parents & grandparents of `words`, interned by a digest of their kind & text
+CREATE TABLE IF NOT EXISTS nodes (
   buffer_id INTEGER NOT NULL REFERENCES buffers (rowid) ON UPDATE CASCADE ON DELETE CASCADE,
-  word      TEXT    NOT NULL,
-  lword     TEXT    NOT NULL,
-  lo        INTEGER NOT NULL,
-  hi        INTEGER NOT NULL,
+  node_id   TEXT    NOT NULL,
   kind      TEXT    NOT NULL,
-  pword     TEXT,
-  pkind     TEXT,
-  gpword    TEXT,
-  gpkind    TEXT,
-  UNIQUE (buffer_id, word)
+  text      TEXT    NOT NULL,
+  PRIMARY KEY (buffer_id, node_id)
+) WITHOUT ROWID;
+
+
+-- !! One row per node, ie. per occurrence, at `(lo, col)`
+-- !! Not `UNIQUE`, rows are shifted one at a time
+CREATE TABLE IF NOT EXISTS words (
+  rowid          INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+  buffer_id      INTEGER NOT NULL REFERENCES buffers (rowid) ON UPDATE CASCADE ON DELETE CASCADE,
+  word           TEXT    NOT NULL,
+  lword          TEXT    NOT NULL,
+  lo             INTEGER NOT NULL,
+  col            INTEGER NOT NULL,
+  hi             INTEGER NOT NULL,
+  kind           TEXT    NOT NULL,
+  parent_id      TEXT,
+  grandparent_id TEXT
 );
 CREATE INDEX IF NOT EXISTS words_buffer_id ON words (buffer_id);
 CREATE INDEX IF NOT EXISTS words_word      ON words (word);
 CREATE INDEX IF NOT EXISTS words_lword     ON words (lword);
 CREATE INDEX IF NOT EXISTS words_buffer_lo ON words (buffer_id, lo);
 CREATE INDEX IF NOT EXISTS words_buffer_hi ON words (buffer_id, hi);
+CREATE INDEX IF NOT EXISTS words_parent    ON words (buffer_id, parent_id);
+CREATE INDEX IF NOT EXISTS words_gparent   ON words (buffer_id, grandparent_id);
 
 
 CREATE VIEW IF NOT EXISTS words_view AS
 SELECT
   buffers.filetype,
-  buffers.filename,
+  words.buffer_id,
+  words.rowid AS word_id,
   words.word,
   words.lword,
-  words.lo + 1 AS lo,
-  words.hi + 1 AS hi,
-  words.kind,
-  words.pword,
-  words.pkind,
-  words.gpword,
-  words.gpkind
+  words.kind
 FROM buffers
 JOIN words
 ON
@@ -0,0 +1,21 @@
+DELETE FROM nodes
+WHERE
+  NOT EXISTS (
+    SELECT
+      1
+    FROM words
+    WHERE
+      words.buffer_id = nodes.buffer_id
+      AND
+      words.parent_id = nodes.node_id
+  )
+  AND
+  NOT EXISTS (
+    SELECT
+      1
+    FROM words
+    WHERE
+      words.buffer_id = nodes.buffer_id
+      AND
+      words.grandparent_id = nodes.node_id
+  )
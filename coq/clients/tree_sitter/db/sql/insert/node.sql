@@ -0,0 +1,2 @@
+INSERT OR REPLACE INTO nodes (buffer_id,  node_id,  kind,  text)
+VALUES                       (:buffer_id, :node_id, :kind, :text)
@@ -1,2 +1,25 @@
-INSERT OR IGNORE INTO words (buffer_id,  word,  lword,        lo,  hi,  kind,  pword,  pkind,  gpword,  gpkind)
-VALUES                      (:buffer_id, :word, LOWER(:word), :lo, :hi, :kind, :pword, :pkind, :gpword, :gpkind)
+INSERT INTO words (buffer_id, word, lword, lo, col, hi, kind, parent_id, grandparent_id)
+SELECT
+  :buffer_id,
+  :word,
+  LOWER(:word),
+  :lo,
+  :col,
+  :hi,
+  :kind,
+  :parent_id,
+  :grandparent_id
+WHERE
+  NOT EXISTS (
+    SELECT
+      1
+    FROM words
+    WHERE
+      buffer_id = :buffer_id
+      AND
+      lo = :lo
+      AND
+      col = :col
+      AND
+      word = :word
+  )
@@ -0,0 +1,28 @@
+SELECT
+  buffers.filename,
+  words.word,
+  words.lo + 1 AS lo,
+  words.hi + 1 AS hi,
+  words.kind,
+  parents.text      AS ptext,
+  parents.kind      AS pkind,
+  grandparents.text AS gptext,
+  grandparents.kind AS gpkind
+FROM words
+JOIN buffers
+ON
+  buffers.rowid = words.buffer_id
+LEFT JOIN nodes AS parents
+ON
+  parents.buffer_id = words.buffer_id
+  AND
+  parents.node_id = words.parent_id
+LEFT JOIN nodes AS grandparents
+ON
+  grandparents.buffer_id = words.buffer_id
+  AND
+  grandparents.node_id = words.grandparent_id
+WHERE
+  words.buffer_id = :buffer_id
+  AND
+  words.rowid = :word_id
@@ -1,13 +1,8 @@
 SELECT DISTINCT
+  buffer_id,
+  word_id,
   word,
-  lo,
-  hi,
-  kind,
-  pword,
-  pkind,
-  gpword,
-  gpkind,
-  filename
+  kind
 FROM words_view
 WHERE
   filetype = :filetype
@@ -22,7 +17,7 @@ WHERE
       AND
       word <> SUBSTR(:word, 1, LENGTH(word))
       AND
-      X_SIMILARITY(LOWER(:word), lword, :look_ahead) > :cut_off
+      (:batched OR X_SIMILARITY(LOWER(:word), lword, :look_ahead) > :cut_off)
     )
     OR
     (
@@ -34,7 +29,7 @@ WHERE
       AND
       word <> SUBSTR(:sym, 1, LENGTH(word))
       AND
-      X_SIMILARITY(LOWER(:sym), lword, :look_ahead) > :cut_off
+      (:batched OR X_SIMILARITY(LOWER(:sym), lword, :look_ahead) > :cut_off)
     )
   )
 LIMIT :limit
@@ -0,0 +1,8 @@
+UPDATE words
+SET
+  lo = lo + :delta,
+  hi = hi + :delta
+WHERE
+  buffer_id = :buffer_id
+  AND
+  lo > :row
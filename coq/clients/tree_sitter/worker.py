@@ -1,7 +1,15 @@
 from asyncio import Lock, gather
 from os import linesep
 from pathlib import PurePath
-from typing import AsyncIterator, Iterator, Mapping, Optional, Tuple
+from typing import (
+    AsyncIterator,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    MutableSet,
+    Optional,
+    Tuple,
+)
 
 from pynvim_pp.atomic import Atomic
 from pynvim_pp.buffer import Buffer
@@ -13,9 +21,9 @@ from ...shared.executor import AsyncExecutor
 from ...shared.runtime import Supervisor
 from ...shared.runtime import Worker as BaseWorker
 from ...shared.settings import TSClient
-from ...shared.types import Completion, Context, Doc, Edit
+from ...shared.types import Completion, Context, Doc, Edit, ExternTS
 from ...treesitter.request import async_request
-from ...treesitter.types import Payload
+from ...treesitter.types import Payload, SimplePayload
 from .db.database import TDB
 
 
@@ -80,7 +88,9 @@ def _doc(client: TSClient, context: Context, payload: Payload) -> Optional[Doc]:
     return doc
 
 
-def _trans(client: TSClient, context: Context, payload: Payload) -> Completion:
+def _trans(
+    client: TSClient, buf: int, word_id: int, payload: SimplePayload
+) -> Completion:
     edit = Edit(new_text=payload.text)
     icon_match, _, _ = payload.kind.partition(".")
     cmp = Completion(
@@ -92,8 +102,8 @@ def _trans(client: TSClient, context: Context, payload: Payload) -> Completion:
         primary_edit=edit,
         adjust_indent=False,
         kind=payload.kind,
-        doc=_doc(client, context=context, payload=payload),
         icon_match=icon_match,
+        extern=ExternTS(buf=buf, word_id=word_id),
     )
     return cmp
 
@@ -108,6 +118,8 @@ class Worker(BaseWorker[TSClient, None]):
     ) -> None:
         self._lock = Lock()
         self._db = TDB()
+        self._acks: MutableMapping[int, int] = {}
+        self._slow: MutableSet[int] = set()
         super().__init__(ex, supervisor=supervisor, options=options, misc=misc)
         self._ex.run(self._poll())
 
@@ -125,29 +137,58 @@ class Worker(BaseWorker[TSClient, None]):
                     bufs, _ = await gather(_bufs(), self._populate())
                     if bufs:
                         self._db.vacuum(bufs)
+                        for buf in self._acks.keys() - bufs.keys():
+                            self._acks.pop(buf, None)
 
             await self._with_interrupt(cont())
 
     async def _populate(self) -> Optional[Tuple[bool, float]]:
+        """
+        Only the rows edited, or never seen before, are harvested
+
+        Slow buffers are warned about once, they are not dropped
+        """
+
         if not self._lock.locked():
             async with self._lock:
-                if payload := await async_request():
-                    keep_going = payload.elapsed <= self._options.slow_threshold
-                    self._db.populate(
+                if payload := await async_request(self._acks):
+                    populated = self._db.populate(
                         payload.buf,
-                        lo=payload.lo,
-                        hi=payload.hi,
                         filetype=payload.filetype,
                         filename=payload.filename,
+                        reset=payload.reset,
+                        edits=payload.edits,
+                        stale=(*payload.dirty, *payload.ranges),
+                        ancestors=payload.ancestors,
                         nodes=payload.payloads,
                     )
-                    return keep_going, payload.elapsed
+                    # unacked, Lua harvests the buffer from scratch next time
+                    if populated:
+                        self._acks[payload.buf] = payload.seq
+                    slow = payload.elapsed > self._options.slow_threshold
+                    warn = slow and payload.buf not in self._slow
+                    if warn:
+                        self._slow.add(payload.buf)
+                    return not warn, payload.elapsed
 
         return None
 
     async def populate(self) -> Optional[Tuple[bool, float]]:
         return await self._ex.submit(self._populate())
 
+    async def doc(self, context: Context, extern: ExternTS) -> Optional[Doc]:
+        """
+        Materialized only for the preview
+        """
+
+        async def cont() -> Optional[Doc]:
+            if payload := self._db.doc(extern.buf, word_id=extern.word_id):
+                return _doc(self._options, context=context, payload=payload)
+            else:
+                return None
+
+        return await self._ex.submit(cont())
+
     async def _work(self, context: Context) -> AsyncIterator[Completion]:
         async with self._work_lock:
             payloads = self._db.select(
@@ -158,5 +199,5 @@ class Worker(BaseWorker[TSClient, None]):
                 limitless=context.manual,
             )
 
-            for payload in payloads:
-                yield _trans(self._options, context=context, payload=payload)
+            for buf, word_id, payload in payloads:
+                yield _trans(self._options, buf=buf, word_id=word_id, payload=payload)
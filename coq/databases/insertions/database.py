@@ -26,6 +26,15 @@ class Statistics:
     q99_items: int
 
 
+@dataclass(frozen=True)
+class Latency:
+    source: str
+    instances: int
+    interrupted: int
+    inserted: int
+    duration: float
+
+
 def _init() -> Connection:
     conn = Connection(INSERT_DB, isolation_level=None)
     init_db(conn)
@@ -43,10 +52,12 @@ class IDB(DB):
         with self._conn, closing(self._conn.cursor()) as cursor:
             cursor.execute(sql("insert", "source"), {"name": source})
 
-    def new_batch(self, batch_id: bytes) -> None:
+    def new_batch(self, batch_id: bytes, filetype: str) -> None:
         # MUST OK
         with self._conn, closing(self._conn.cursor()) as cursor:
-            cursor.execute(sql("insert", "batch"), {"rowid": batch_id})
+            cursor.execute(
+                sql("insert", "batch"), {"rowid": batch_id, "filetype": filetype}
+            )
 
     def new_instance(self, instance: bytes, source: str, batch_id: bytes) -> None:
         # MUST OK
@@ -57,10 +68,20 @@ class IDB(DB):
             )
 
     def new_stat(
-        self, instance: bytes, interrupted: bool, duration: float, items: int
+        self,
+        instance: bytes,
+        interrupted: bool,
+        duration: float,
+        items: int,
+        window: int,
     ) -> None:
+        """
+        Also keeps the last `window` latencies of the instance's source & filetype
+        """
+
         # MUST OK
         with self._conn, closing(self._conn.cursor()) as cursor:
+            cursor.execute("BEGIN", ())
             cursor.execute(
                 sql("insert", "instance_stat"),
                 {
@@ -70,6 +91,18 @@ class IDB(DB):
                     "items": items,
                 },
             )
+            cursor.execute(
+                sql("insert", "latency"),
+                {
+                    "instance_id": instance,
+                    "interrupted": interrupted,
+                    "duration": duration,
+                },
+            )
+            cursor.execute(
+                sql("delete", "latencies"),
+                {"instance_id": instance, "window": window},
+            )
 
     def insertion_order(self, n_rows: int) -> Mapping[str, int]:
         # can interrupt
@@ -110,3 +143,28 @@ class IDB(DB):
                     q99_items=row["q99_items"],
                 )
                 yield stat
+
+    def latencies(self, filetype: str, quantile: int) -> Mapping[str, Latency]:
+        """
+        Over the instances kept by `new_stat`, for `filetype`
+        """
+
+        # can interrupt
+        with suppress(OperationalError):
+            with self._conn, closing(self._conn.cursor()) as cursor:
+                cursor.execute(
+                    sql("select", "latencies"),
+                    {"filetype": filetype, "quantile": quantile},
+                )
+                latencies = {
+                    row["source"]: Latency(
+                        source=row["source"],
+                        instances=row["instances"],
+                        interrupted=row["interrupted"],
+                        inserted=row["inserted"],
+                        duration=row["duration"],
+                    )
+                    for row in cursor.fetchall()
+                }
+                return latencies
+        return {}
@@ -7,8 +7,10 @@ CREATE TABLE IF NOT EXISTS sources (
 
 
 CREATE TABLE IF NOT EXISTS batches (
-  rowid BLOB NOT NULL PRIMARY KEY
+  rowid    BLOB NOT NULL PRIMARY KEY,
+  filetype TEXT NOT NULL
 ) WITHOUT rowid;
+CREATE INDEX IF NOT EXISTS batches_filetype ON batches (filetype);
 
 
 CREATE TABLE IF NOT EXISTS instances (
@@ -39,6 +41,18 @@ CREATE INDEX IF NOT EXISTS inserted_instance_id ON inserted (instance_id);
 CREATE INDEX IF NOT EXISTS inserted_sort_by     ON inserted (sort_by);
 
 
+-- Only the last few instances of each source per filetype, pruned on insert
+CREATE TABLE IF NOT EXISTS latencies (
+  rowid       INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+  instance_id BLOB    NOT NULL REFERENCES instances (rowid) ON UPDATE CASCADE ON DELETE CASCADE,
+  source_id   TEXT    NOT NULL,
+  filetype    TEXT    NOT NULL,
+  interrupted INTEGER NOT NULL,
+  duration    REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS latencies_filetype_source_id ON latencies (filetype, source_id);
+
+
 --
 -- VIEWS
 --
@@ -0,0 +1,21 @@
+DELETE FROM latencies
+WHERE
+  rowid IN (
+    SELECT
+      latencies.rowid
+    FROM instances
+    JOIN batches
+    ON
+      batches.rowid = instances.batch_id
+    JOIN latencies
+    ON
+      latencies.filetype = batches.filetype
+      AND
+      latencies.source_id = instances.source_id
+    WHERE
+      instances.rowid = :instance_id
+    ORDER BY
+      latencies.rowid DESC
+    LIMIT -1
+    OFFSET :window
+  )
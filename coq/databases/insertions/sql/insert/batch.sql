@@ -1,2 +1,2 @@
-INSERT INTO batches ( rowid)
-VALUES              (:rowid)
+INSERT INTO batches ( rowid,  filetype)
+VALUES              (:rowid, :filetype)
@@ -0,0 +1,13 @@
+INSERT INTO latencies (instance_id, source_id, filetype, interrupted, duration)
+SELECT
+  instances.rowid,
+  instances.source_id,
+  batches.filetype,
+  :interrupted,
+  :duration
+FROM instances
+JOIN batches
+ON
+  batches.rowid = instances.batch_id
+WHERE
+  instances.rowid = :instance_id
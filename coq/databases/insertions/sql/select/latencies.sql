@@ -0,0 +1,31 @@
+WITH windowed AS (
+  SELECT
+    instance_id,
+    source_id                                                  AS source,
+    interrupted,
+    duration,
+    NTILE(100) OVER (PARTITION BY source_id ORDER BY duration) AS q_duration
+  FROM latencies
+  WHERE
+    filetype = :filetype
+)
+SELECT
+  source           AS source,
+  COUNT(*)         AS instances,
+  SUM(interrupted) AS interrupted,
+  SUM(
+    EXISTS (
+      SELECT
+        1
+      FROM inserted
+      WHERE
+        inserted.instance_id = windowed.instance_id
+    )
+  ) AS inserted,
+  COALESCE(
+    MAX(duration) FILTER (WHERE q_duration <= :quantile),
+    0
+  ) AS duration
+FROM windowed
+GROUP BY
+  source
@@ -2,10 +2,12 @@ from dataclasses import asdict
 from typing import (
     AbstractSet,
     Any,
+    Iterator,
     Mapping,
     MutableMapping,
     Optional,
     Sequence,
+    Tuple,
     Type,
     Union,
 )
@@ -34,6 +36,8 @@ from ..shared.types import (
 )
 from .protocol import LSProtocol
 from .types import (
+    Command,
+    CompletionColumns,
     CompletionItem,
     CompletionResponse,
     InlineCompletionItem,
@@ -77,22 +81,26 @@ def _with_defaults(defaults: ItemDefaults, item: Any) -> Any:
     return item
 
 
-def _range_edit(
-    encoding: Encoding,
-    cursors: Cursors,
-    fallback: Optional[str],
-    edit: Union[TextEdit, TextEditNonStandard, InsertReplaceEdit],
-) -> RangeEdit:
+def _cursor(encoding: Encoding, cursors: Cursors) -> int:
     _, u8, u16, u32 = cursors
     if encoding == UTF16:
-        cursor = u16
+        return u16
     elif encoding == UTF8:
-        cursor = u8
+        return u8
     elif encoding == UTF32:
-        cursor = u32
+        return u32
     else:
         never(encoding)
 
+
+def _range_edit(
+    encoding: Encoding,
+    cursors: Cursors,
+    fallback: Optional[str],
+    edit: Union[TextEdit, TextEditNonStandard, InsertReplaceEdit],
+) -> RangeEdit:
+    cursor = _cursor(encoding, cursors=cursors)
+
     if isinstance(edit, TextEditNonStandard):
         text = edit.new_text
         ra_start = edit.start
@@ -286,6 +294,219 @@ def parse_item(
             return comp
 
 
+def _position(position: Any) -> Tuple[int, int]:
+    line, character = position["line"], position["character"]
+    if not isinstance(line, int) or not isinstance(character, int):
+        raise TypeError(position)
+    return line, character
+
+
+def _raw_range_edit(
+    cursor: int, encoding: Encoding, fallback: Optional[str], edit: Any
+) -> RangeEdit:
+    """
+    Same as `_range_edit`, for an edit that has not gone through `std2.pickle`
+    """
+
+    if "range" in edit:
+        text, ra = edit["newText"], edit["range"]
+    elif "replace" in edit:
+        text, ra = edit["newText"], edit["replace"]
+    else:
+        text, ra = edit["new_text"], edit
+
+    if not isinstance(text, str):
+        raise TypeError(edit)
+
+    return RangeEdit(
+        new_text=text,
+        fallback=fallback,
+        begin=_position(ra["start"]),
+        end=_position(ra["end"]),
+        cursor_pos=cursor,
+        encoding=encoding,
+    )
+
+
+def _default_range(edit_range: Any) -> Mapping:
+    ra: Mapping = asdict(edit_range)
+    rng: Mapping = ra.get("replace", ra)
+    return rng
+
+
+def _str(thing: Any) -> Optional[str]:
+    return thing if isinstance(thing, str) else None
+
+
+def _parse_columns(
+    protocol: LSProtocol,
+    extern_type: Union[Type[ExternLSP], Type[ExternLUA]],
+    always_on_top: Optional[AbstractSet[Optional[str]]],
+    client: Optional[str],
+    encoding: Encoding,
+    cursors: Cursors,
+    short_name: str,
+    weight_adjust: float,
+    defaults: ItemDefaults,
+    columns: CompletionColumns,
+) -> Iterator[Completion]:
+    """
+    Equivalent to `parse_item` over each row, minus the per item reflection
+    """
+
+    on_top = (
+        False
+        if always_on_top is None
+        else (not always_on_top or client in always_on_top)
+    )
+    cursor = _cursor(encoding, cursors=cursors)
+    snippet_fmts = {
+        fmt for fmt, name in protocol.InsertTextFormat.items() if name == "Snippet"
+    }
+    default_range = _default_range(defaults.editRange) if defaults.editRange else None
+
+    rows = zip(
+        columns["label"],
+        columns["labelDetails"],
+        columns["kind"],
+        columns["detail"],
+        columns["documentation"],
+        columns["preselect"],
+        columns["filterText"],
+        columns["insertText"],
+        columns["insertTextFormat"],
+        columns["insertTextMode"],
+        columns["textEdit"],
+        columns["additionalTextEdits"],
+        columns["command"],
+        columns["rest"],
+    )
+    for (
+        label,
+        label_details,
+        kind,
+        detail,
+        documentation,
+        preselect,
+        filter_text,
+        insert_text,
+        insert_fmt,
+        insert_mode,
+        text_edit,
+        additional_edits,
+        command,
+        rest,
+    ) in rows:
+        if not isinstance(label, str):
+            log.warn("%s -> %s", client, label)
+            continue
+
+        insert_text = _str(insert_text)
+        if insert_fmt is None:
+            insert_fmt = defaults.insertTextFormat
+        if insert_mode is None:
+            insert_mode = defaults.insertTextMode
+        if text_edit is None and default_range is not None:
+            text_edit = {"new_text": insert_text or label, **default_range}
+
+        try:
+            fallback = insert_text or label
+            if isinstance(text_edit, Mapping):
+                re = _raw_range_edit(
+                    cursor, encoding=encoding, fallback=insert_text, edit=text_edit
+                )
+                p_edit: Edit = (
+                    SnippetRangeEdit(
+                        grammar=SnippetGrammar.lsp,
+                        new_text=re.new_text,
+                        fallback=re.fallback,
+                        begin=re.begin,
+                        end=re.end,
+                        cursor_pos=re.cursor_pos,
+                        encoding=re.encoding,
+                    )
+                    if insert_fmt in snippet_fmts
+                    else re
+                )
+            elif insert_fmt in snippet_fmts:
+                p_edit = SnippetEdit(grammar=SnippetGrammar.lsp, new_text=fallback)
+            else:
+                p_edit = Edit(new_text=fallback)
+
+            r_edits = tuple(
+                _raw_range_edit(-1, encoding=encoding, fallback=None, edit=edit)
+                for edit in (additional_edits or ())
+            )
+            cmd = (
+                Command(
+                    title=command["title"],
+                    command=command["command"],
+                    arguments=command.get("arguments"),
+                )
+                if command
+                else None
+            )
+        except (KeyError, TypeError) as e:
+            log.warn("%s -> %s", client, e)
+            continue
+
+        if isinstance(documentation, Mapping) and (
+            value := _str(documentation.get("value"))
+        ):
+            doc: Optional[Doc] = Doc(
+                text=value, syntax=_str(documentation.get("kind")) or ""
+            )
+        elif isinstance(documentation, str) and documentation:
+            doc = Doc(text=documentation, syntax="")
+        elif detail := _str(detail):
+            doc = Doc(text=detail, syntax="")
+        else:
+            doc = None
+
+        item = {**rest} if rest else {}
+        for key, val in (
+            ("label", label),
+            ("labelDetails", label_details),
+            ("kind", kind),
+            ("detail", detail),
+            ("documentation", documentation),
+            ("preselect", preselect),
+            ("filterText", filter_text),
+            ("insertText", insert_text),
+            ("insertTextFormat", insert_fmt),
+            ("insertTextMode", insert_mode),
+            ("textEdit", text_edit),
+            ("additionalTextEdits", additional_edits),
+            ("command", command),
+        ):
+            if val is not None:
+                item[key] = val
+        item.setdefault("data", defaults.data)
+
+        item_kind = protocol.CompletionItemKind.get(kind, "")
+        comp = Completion(
+            source=short_name,
+            always_on_top=on_top,
+            weight_adjust=weight_adjust,
+            label=(
+                label + (_str(label_details.get("detail")) or "")
+                if isinstance(label_details, Mapping)
+                else label
+            ),
+            primary_edit=p_edit,
+            adjust_indent=_adjust_indent(insert_mode, edit=p_edit),
+            secondary_edits=r_edits,
+            sort_by=_str(filter_text)
+            or (label if isinstance(p_edit, SnippetEdit) else p_edit.new_text),
+            preselect=preselect is True,
+            kind=item_kind,
+            doc=doc,
+            icon_match=item_kind,
+            extern=extern_type(inline=False, client=client, item=item, command=cmd),
+        )
+        yield comp
+
+
 def parse_inline_item(
     filetype: str,
     extern_type: Union[Type[ExternLSP], Type[ExternLUA]],
@@ -358,10 +579,26 @@ def parse(
     elif isinstance(resp, Mapping):
         is_complete = _falsy(resp.get("isIncomplete"))
 
-        if not isinstance((items := resp.get("items")), Sequence):
+        if not isinstance((items := resp.get("items")), (Sequence, Mapping)):
             log.warn("%s", f"Unknown LSP resp -- {type(items)}")
             return LSPcomp(client=client, local_cache=is_complete, items=iter(()))
 
+        elif isinstance(items, Mapping):
+            defaults = _defaults_parser(resp.get("itemDefaults")) or ItemDefaults()
+            comps = _parse_columns(
+                protocol,
+                extern_type=extern_type,
+                always_on_top=always_on_top,
+                client=client,
+                encoding=encoding,
+                cursors=cursors,
+                short_name=short_name,
+                weight_adjust=weight_adjust,
+                defaults=defaults,
+                columns=items,
+            )
+            return LSPcomp(client=client, local_cache=is_complete, items=comps)
+
         else:
             defaults = _defaults_parser(resp.get("itemDefaults")) or ItemDefaults()
             comps = (
@@ -1,5 +1,6 @@
-from typing import AbstractSet, AsyncIterator, Optional, cast
+from typing import AbstractSet, Any, AsyncIterator, Mapping, Optional, cast
 
+from ...shared.settings import MatchOptions
 from ...shared.types import Context, ExternLSP, ExternLUA
 from ..parse import parse, parse_inline
 from ..protocol import protocol
@@ -7,6 +8,15 @@ from ..types import CompletionResponse, InLineCompletionResponse, LSPcomp
 from .request import async_request
 
 
+def _pre_filter(match: MatchOptions, context: Context) -> Mapping[str, Any]:
+    return {
+        "words": context.l_words_before,
+        "syms": context.l_syms_before,
+        "look_ahead": match.look_ahead,
+        "cutoff": match.fuzzy_cutoff,
+    }
+
+
 async def comp_lsp(
     short_name: str,
     always_on_top: Optional[AbstractSet[Optional[str]]],
@@ -14,10 +24,18 @@ async def comp_lsp(
     context: Context,
     chunk: int,
     clients: AbstractSet[str],
+    pre_filter: Optional[MatchOptions] = None,
 ) -> AsyncIterator[LSPcomp]:
+    """
+    With `pre_filter`, items likely to match are paged before the rest
+    """
+
     pc = await protocol()
+    spec = _pre_filter(pre_filter, context=context) if pre_filter else None
 
-    async for client in async_request("lsp_comp", chunk, clients, context.cursor):
+    async for client in async_request(
+        "lsp_comp", chunk, clients, context.cursor, spec, columnar=True
+    ):
         resp = cast(CompletionResponse, client.message)
         parsed = parse(
             pc,
@@ -70,7 +88,12 @@ async def comp_thirdparty(
     pc = await protocol()
 
     async for client in async_request(
-        "lsp_third_party", chunk, clients, context.cursor, context.line
+        "lsp_third_party",
+        chunk,
+        clients,
+        context.cursor,
+        context.line,
+        columnar=True,
     ):
         name = client.name or short_name
         resp = cast(CompletionResponse, client.message)
@@ -16,6 +16,7 @@ from typing import (
     Optional,
     Sequence,
     Tuple,
+    Union,
 )
 
 from pynvim_pp.logging import log
@@ -27,6 +28,7 @@ from ...registry import NAMESPACE, rpc
 from ...server.rt_types import Stack
 from ...shared.timeit import timeit
 from ...shared.types import UTF8, UTF16, UTF32, Encoding
+from ..types import CompletionColumns
 
 
 @dataclass(frozen=True)
@@ -78,24 +80,30 @@ def _events(_: str) -> Tuple[AbstractEventLoop, ALock, Event]:
 
 
 async def _lsp_pull(
-    n: int, client: Optional[str], uid: int
-) -> AsyncIterator[Sequence[Any]]:
+    n: int, client: Optional[str], uid: int, columnar: bool
+) -> AsyncIterator[Union[Sequence[Any], CompletionColumns]]:
     lo = 1
     hi = n
     while True:
-        part: Sequence[Any] = await Nvim.api.exec_lua(
-            tuple,
+        part: Union[Sequence[Any], CompletionColumns] = await Nvim.api.exec_lua(
+            NoneType,
             f"return {NAMESPACE}.lsp_pull(...)",
-            (client, uid, lo, hi),
+            (client, uid, lo, hi, columnar),
         )
         lo = hi + 1
         hi = hi + n
         length = hi - lo + 1
 
-        assert isinstance(part, Sequence)
+        if columnar:
+            assert isinstance(part, Mapping)
+            size = part["n"]
+        else:
+            assert isinstance(part, Sequence)
+            size = len(part)
+
         yield part
         await sleep(0)
-        if len(part) < length:
+        if size < length:
             break
 
 
@@ -135,13 +143,25 @@ async def _lsp_notify(stack: Stack, rpayload: _Payload) -> None:
 
 
 async def async_request(
-    name: str, multipart: Optional[int], clients: AbstractSet[str], *args: Any
+    name: str,
+    multipart: Optional[int],
+    clients: AbstractSet[str],
+    *args: Any,
+    columnar: bool = False,
+    session: Optional[str] = None,
 ) -> AsyncIterator[_Client]:
-    with timeit(f"LSP :: {name}"):
-        (_, lock, activity), uid = _events(name), next(_uids(name))
+    """
+    `columnar` pages `CompletionItem`s as `CompletionColumns`, always under `items`
+
+    A request supersedes the previous one of the same `session`, which defaults to `name`
+    """
+
+    key = session or name
+    with timeit(f"LSP :: {name}", nest=False):
+        (_, lock, activity), uid = _events(key), next(_uids(name))
 
         with _LOCK:
-            _STATE[name] = _Session(uid=uid, done=False, acc=[])
+            _STATE[key] = _Session(uid=uid, done=False, acc=[])
 
         # wake up previous generators
         activity.set()
@@ -149,12 +169,12 @@ async def async_request(
         await Nvim.api.exec_lua(
             NoneType,
             f"{NAMESPACE}.{name}(...)",
-            (name, multipart, uid, tuple(clients), *args),
+            (key, multipart, uid, tuple(clients), *args),
         )
 
         while True:
             with _LOCK:
-                state = _STATE.get(name)
+                state = _STATE.get(key)
 
             if state:
                 if state.uid == uid:
@@ -162,20 +182,25 @@ async def async_request(
                         client, multipart = state.acc.pop()
                         if multipart:
                             async for part in _lsp_pull(
-                                multipart, client=client.name, uid=uid
+                                multipart,
+                                client=client.name,
+                                uid=uid,
+                                columnar=columnar,
                             ):
                                 if isinstance(
                                     client.message, MutableMapping
                                 ) and isinstance(client.message.get("items"), Sequence):
                                     message = {**client.message, "items": part}
                                     yield replace(client, message=message)
+                                elif columnar:
+                                    yield replace(client, message={"items": part})
                                 else:
                                     yield replace(client, message=part)
                         else:
                             yield client
                     if state.done:
                         with _LOCK:
-                            _STATE.pop(name, None)
+                            _STATE.pop(key, None)
                         break
                 elif state.uid > uid:
                     break
@@ -188,7 +213,7 @@ async def async_request(
             await activity.wait()
 
             with _LOCK:
-                state = _STATE.get(name)
+                state = _STATE.get(key)
             if state and state.uid != uid:
                 break
 
@@ -196,3 +221,11 @@ async def async_request(
             async with lock:
                 await sleep(0)
                 activity.clear()
+
+
+async def async_cancel(session: str) -> None:
+    """
+    Cancels the LSP requests in flight for `session`
+    """
+
+    await Nvim.api.exec_lua(NoneType, f"{NAMESPACE}.lsp_cancel(...)", (session,))
@@ -1,37 +1,154 @@
-from typing import MutableSequence, Optional
+from asyncio import CancelledError, Task, create_task, gather, shield
+from json import dumps
+from typing import Iterable, MutableMapping, MutableSequence, Optional, Tuple
 
+from pynvim_pp.logging import suppress_and_log
+from std2.cell import RefCell
+
+from ...shared.lru import LRU
 from ...shared.types import Completion, ExternLSP, ExternLUA
 from ..parse import parse_item
 from ..protocol import protocol
-from .request import async_request
+from .request import async_cancel, async_request
+
+_CACHE_SIZE = 999
+_PARALLELISM = 3
+
+_Key = Tuple[bool, Optional[str], str]
+
+_CACHE: LRU[_Key, Tuple[Optional[str], "Task[Optional[Completion]]"]] = LRU(
+    size=_CACHE_SIZE
+)
+_PREFETCH: RefCell[Optional[Task]] = RefCell(None)
+# in flight, & not awaited by anything but a prefetch
+_PREFETCHING: MutableMapping[_Key, "Task[Optional[Completion]]"] = {}
 
 
-async def resolve(extern: ExternLSP) -> Optional[Completion]:
+def _key(extern: ExternLSP) -> _Key:
+    identity = dumps(extern.item, sort_keys=True, default=str)
+    return isinstance(extern, ExternLUA), extern.client, identity
+
+
+async def _resolve(extern: ExternLSP, session: Optional[str]) -> Optional[Completion]:
     name = "lsp_third_party_resolve" if isinstance(extern, ExternLUA) else "lsp_resolve"
     comps: MutableSequence[Completion] = []
 
     clients = {extern.client} if extern.client else set()
     pc = await protocol()
 
-    async for client in async_request(name, None, clients, extern.item):
-        comp = parse_item(
-            pc,
-            extern_type=type(extern),
-            client=client.name,
-            encoding=client.offset_encoding,
-            short_name="",
-            cursors=(-1, -1, -1, -1),
-            always_on_top=None,
-            weight_adjust=0,
-            item=client.message,
-        )
-        if extern.client and client.name == extern.client:
-            return comp
-        elif comp:
-            comps.append(comp)
-    else:
-        for comp in comps:
-            if comp.doc:
+    try:
+        async for client in async_request(
+            name, None, clients, extern.item, session=session
+        ):
+            comp = parse_item(
+                pc,
+                extern_type=type(extern),
+                client=client.name,
+                encoding=client.offset_encoding,
+                short_name="",
+                cursors=(-1, -1, -1, -1),
+                always_on_top=None,
+                weight_adjust=0,
+                item=client.message,
+            )
+            if extern.client and client.name == extern.client:
                 return comp
+            elif comp:
+                comps.append(comp)
+        else:
+            for comp in comps:
+                if comp.doc:
+                    return comp
+            else:
+                return None
+    except CancelledError:
+        if session:
+            with suppress_and_log():
+                await async_cancel(session)
+        raise
+
+
+def _spawn(
+    key: _Key, extern: ExternLSP, session: Optional[str]
+) -> "Task[Optional[Completion]]":
+    task = create_task(_resolve(extern, session=session))
+    _CACHE[key] = (session, task)
+    if session is not None:
+        _PREFETCHING[key] = task
+
+    def cont(task: "Task[Optional[Completion]]") -> None:
+        if _PREFETCHING.get(key) is task:
+            _PREFETCHING.pop(key, None)
+        if task.cancelled() or task.exception() or not task.result():
+            if (cached := _CACHE.get(key)) and cached[1] is task:
+                _CACHE.pop(key, None)
+
+    task.add_done_callback(cont)
+    return task
+
+
+async def resolve(
+    extern: ExternLSP, session: Optional[str] = None
+) -> Optional[Completion]:
+    """
+    Cached by server & item, across popups
+
+    Requests in flight are shared, & outlive their callers' timeouts
+
+    A prefetch can be superseded by the next one on its `session`, so its `None` is not trusted
+
+    Awaiting a prefetch in flight takes it over, it is then no longer cancelled by `prefetch`
+    """
+
+    key = _key(extern)
+    owner: Optional[str]
+    task: "Task[Optional[Completion]]"
+    if cached := _CACHE.get(key):
+        owner, task = cached
+        if session is None and _PREFETCHING.get(key) is task:
+            _PREFETCHING.pop(key, None)
+            _CACHE[key] = (None, task)
+    else:
+        owner, task = session, _spawn(key, extern=extern, session=session)
+
+    if comp := await shield(task):
+        return comp
+    elif session is None and owner is not None:
+        if (cached := _CACHE.get(key)) and cached[0] is None and cached[1] is not task:
+            _, task = cached
         else:
-            return None
+            task = _spawn(key, extern=extern, session=None)
+        return await shield(task)
+    else:
+        return None
+
+
+async def _prefetch(externs: Iterable[ExternLSP]) -> None:
+    it = iter(externs)
+
+    async def cont(session: str) -> None:
+        for extern in it:
+            await resolve(extern, session=session)
+
+    with suppress_and_log():
+        await gather(*(cont(f"prefetch_{idx}") for idx in range(_PARALLELISM)))
+
+
+def prefetch(externs: Iterable[ExternLSP]) -> None:
+    """
+    Resolves ahead of the preview & confirm, at most `_PARALLELISM` in flight
+
+    Replaces the previous prefetch, nothing is queued for empty `externs`
+
+    Its requests in flight are cancelled, unless something else awaits them
+    """
+
+    if task := _PREFETCH.val:
+        task.cancel()
+    for key, task in _PREFETCHING.items():
+        if (cached := _CACHE.get(key)) and cached[1] is task:
+            _CACHE.pop(key, None)
+        task.cancel()
+    _PREFETCHING.clear()
+    externs = tuple(externs)
+    _PREFETCH.val = create_task(_prefetch(externs)) if externs else None
@@ -4,6 +4,7 @@ from typing import (
     Any,
     Iterator,
     Literal,
+    Mapping,
     Optional,
     Sequence,
     TypedDict,
@@ -113,9 +114,33 @@ class ItemDefaults:
     data: Optional[Any] = None
 
 
+class CompletionColumns(TypedDict):
+    """
+    `CompletionItem`s pivoted into parallel arrays, by `lsp_pull`
+
+    Only the fields `parse` reads get their own column, the remainder of each item is in `rest`
+    """
+
+    n: int
+    rest: Sequence[Optional[Mapping[str, Any]]]
+    label: Sequence[Any]
+    labelDetails: Sequence[Any]
+    kind: Sequence[Any]
+    detail: Sequence[Any]
+    documentation: Sequence[Any]
+    preselect: Sequence[Any]
+    filterText: Sequence[Any]
+    insertText: Sequence[Any]
+    insertTextFormat: Sequence[Any]
+    insertTextMode: Sequence[Any]
+    textEdit: Sequence[Any]
+    additionalTextEdits: Sequence[Any]
+    command: Sequence[Any]
+
+
 class _CompletionList(TypedDict):
     isIncomplete: bool
-    items: Sequence[CompletionItem]
+    items: Union[Sequence[CompletionItem], CompletionColumns]
     itemDefaults: Optional[ItemDefaults]
 
 
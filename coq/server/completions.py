@@ -8,6 +8,7 @@ from std2.pickle.encoder import new_encoder
 
 from ..registry import NAMESPACE
 from ..shared.runtime import Metric
+from ..shared.timeit import timeit
 from .rt_types import Stack
 
 
@@ -27,14 +28,25 @@ _ENCODER = new_encoder[VimCompletion](VimCompletion)
 
 
 async def complete(
-    stack: Stack, col: int, comps: Iterable[Tuple[Metric, VimCompletion]]
+    stack: Stack,
+    col: int,
+    comps: Iterable[Tuple[Metric, VimCompletion]],
+    refresh: bool = False,
 ) -> None:
-    stack.metrics.clear()
-
-    acc: MutableSequence[Any] = []
-    for metric, comp in comps:
-        stack.metrics[metric.comp.uid] = metric
-        encoded = _ENCODER(comp)
-        acc.append(encoded)
-
-    await Nvim.api.exec_lua(NoneType, f"{NAMESPACE}.send_comp(...)", (col + 1, acc))
+    """
+    `refresh` keeps the previous metrics around, the popup might not get replaced
+    """
+
+    with timeit("COMPLETE"):
+        if not refresh:
+            stack.metrics.clear()
+
+        acc: MutableSequence[Any] = []
+        for metric, comp in comps:
+            stack.metrics[metric.comp.uid] = metric
+            encoded = _ENCODER(comp)
+            acc.append(encoded)
+
+        await Nvim.api.exec_lua(
+            NoneType, f"{NAMESPACE}.send_comp(...)", (col + 1, acc, refresh)
+        )
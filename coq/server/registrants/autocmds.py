@@ -77,7 +77,6 @@ async def _insert_enter(stack: Stack) -> None:
                         keep_going, elapsed = populated
 
                         if not keep_going:
-                            state(nono_bufs={buf.number})
                             msg = LANG(
                                 "source slow",
                                 source=stack.settings.clients.tree_sitter.short_name,
@@ -1,7 +1,18 @@
 from asyncio import create_task, gather, sleep
 from dataclasses import replace
+from itertools import islice
 from time import monotonic
-from typing import AbstractSet, Any, Literal, Mapping, Optional, Sequence, Union
+from typing import (
+    AbstractSet,
+    Any,
+    Iterable,
+    Iterator,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
 from uuid import UUID, uuid4
 
 from pynvim_pp.buffer import Buffer, ExtMark, ExtMarker
@@ -14,10 +25,12 @@ from std2.pickle.types import DecodeError
 
 from ...consts import DEBUG
 from ...lsp.requests.command import cmd
-from ...lsp.requests.resolve import resolve
+from ...lsp.requests.resolve import prefetch, resolve
 from ...registry import NAMESPACE, autocmd, rpc
 from ...shared.aio import with_timeout
 from ...shared.runtime import Metric
+from ...shared.timeit import timeit
+from ...shared.trace import correlate, span
 from ...shared.types import ChangeEvent, Context, ExternLSP, ExternPath
 from ..completions import complete
 from ..context import context
@@ -47,13 +60,26 @@ def _should_cont(
     return True
 
 
+def _prefetch(stack: Stack, metrics: Iterable[Metric]) -> None:
+    def cont() -> Iterator[ExternLSP]:
+        for metric in metrics:
+            extern = metric.comp.extern
+            if isinstance(extern, ExternLSP) and not extern.inline:
+                yield extern
+
+    limit = stack.settings.clients.lsp.resolve_prefetch
+    prefetch(islice(cont(), limit))
+
+
 async def comp_func(
     stack: Stack, s: State, change: Optional[ChangeEvent], t0: float, manual: bool
 ) -> None:
-    with suppress_and_log():
-        ctx = await context(
-            options=stack.settings.match, state=s, change=change, manual=manual
-        )
+    _prefetch(stack, metrics=())
+    with suppress_and_log(), correlate(s.change_id), span("KEYSTROKE", manual=manual):
+        with timeit("CONTEXT"):
+            ctx = await context(
+                options=stack.settings.match, state=s, change=change, manual=manual
+            )
         should = (
             _should_cont(
                 s,
@@ -67,9 +93,29 @@ async def comp_func(
         _, col = ctx.position
 
         if should:
+
+            async def refresh(metrics: Sequence[Metric]) -> None:
+                s = state()
+                if s.change_id == ctx.change_id:
+                    with timeit("TRANS -- REFRESH"):
+                        vim_comps = tuple(
+                            trans(
+                                stack,
+                                pum_width=s.pum_width,
+                                context=ctx,
+                                metrics=metrics,
+                            )
+                        )
+                    await complete(stack=stack, col=col, comps=vim_comps, refresh=True)
+
             state(context=ctx)
             metrics, _ = await gather(
-                stack.supervisor.collect(ctx),
+                stack.supervisor.collect(
+                    ctx,
+                    progress=(
+                        refresh if stack.settings.completion.progressive else None
+                    ),
+                ),
                 (
                     complete(stack=stack, col=col, comps=())
                     if stack.settings.display.pum.fast_close
@@ -78,15 +124,17 @@ async def comp_func(
             )
             s = state()
             if s.change_id == ctx.change_id:
-                vim_comps = tuple(
-                    trans(
-                        stack,
-                        pum_width=s.pum_width,
-                        context=ctx,
-                        metrics=metrics,
+                with timeit("TRANS"):
+                    vim_comps = tuple(
+                        trans(
+                            stack,
+                            pum_width=s.pum_width,
+                            context=ctx,
+                            metrics=metrics,
+                        )
                     )
-                )
                 await complete(stack=stack, col=col, comps=vim_comps)
+                _prefetch(stack, metrics=(metric for metric, _ in vim_comps))
                 if DEBUG:
                     t1 = monotonic()
                     delta = t1 - t0
@@ -6,7 +6,16 @@ from itertools import chain
 from math import ceil
 from os import linesep
 from textwrap import dedent
-from typing import Any, Awaitable, Callable, Iterator, Mapping, Sequence, Tuple
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 from uuid import UUID, uuid4
 
 from pynvim_pp.buffer import Buffer, ExtMark, ExtMarker
@@ -23,6 +32,7 @@ from std2.pickle.decoder import new_decoder
 from std2.pickle.types import DecodeError
 from std2.string import removeprefix
 
+from ...clients.tree_sitter.worker import Worker as TSWorker
 from ...lsp.requests.resolve import resolve
 from ...paths.show import show
 from ...registry import NAMESPACE, autocmd, rpc
@@ -30,7 +40,14 @@ from ...shared.aio import with_timeout
 from ...shared.settings import GhostText, PreviewDisplay
 from ...shared.timeit import timeit
 from ...shared.trans import expand_tabs, indent_adjusted
-from ...shared.types import Completion, Context, Doc, ExternLSP, ExternPath
+from ...shared.types import (
+    Completion,
+    Context,
+    Doc,
+    ExternLSP,
+    ExternPath,
+    ExternTS,
+)
 from ..edit import EditInstruction, parse, parse_secondary
 from ..rt_types import Stack
 from ..state import State, state
@@ -221,6 +238,13 @@ async def _secondary(stack: Stack, state: State, comp: Completion) -> Doc:
     return Doc(text=text, syntax="")
 
 
+async def _ts_doc(stack: Stack, state: State, extern: ExternTS) -> Optional[Doc]:
+    for worker in stack.workers:
+        if isinstance(worker, TSWorker):
+            return await worker.doc(state.context, extern=extern)
+    return None
+
+
 async def _resolve_comp(
     stack: Stack,
     event: _Event,
@@ -253,6 +277,12 @@ async def _resolve_comp(
                         ),
                     ):
                         stack.lru[state.preview_id] = replace(comp, doc=doc)
+                elif isinstance(comp.extern, ExternTS) and enabled:
+                    if doc := await with_timeout(
+                        timeout,
+                        co=_ts_doc(stack, state=state, extern=comp.extern),
+                    ):
+                        stack.lru[state.preview_id] = replace(comp, doc=doc)
                 else:
                     doc = None
 
@@ -1,7 +1,9 @@
 from asyncio import gather
 from asyncio.tasks import as_completed
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import suppress
 from dataclasses import dataclass
+from hashlib import sha256
 from itertools import chain
 from json import JSONDecodeError, dumps, loads
 from math import inf
@@ -18,6 +20,8 @@ from typing import (
     Iterable,
     Iterator,
     Mapping,
+    MutableMapping,
+    MutableSequence,
     Optional,
     Sequence,
     Tuple,
@@ -34,11 +38,13 @@ from std2.pickle.decoder import new_decoder
 from std2.pickle.encoder import new_encoder
 from std2.pickle.types import DecodeError
 
+from ...clients.snippet.db.database import SCHEMA as DB_SCHEMA
 from ...clients.snippet.worker import Worker as SnipWorker
 from ...lang import LANG
 from ...paths.show import fmt_path
 from ...registry import NAMESPACE, atomic, rpc
 from ...shared.context import EMPTY_CONTEXT
+from ...shared.executor import offload
 from ...shared.settings import CompleteOptions, MatchOptions, SnippetWarnings
 from ...shared.timeit import timeit
 from ...shared.types import (
@@ -49,6 +55,8 @@ from ...shared.types import (
     SnippetGrammar,
     TextTransforms,
 )
+from ...snippets.artifact import dumps as dump_artifact
+from ...snippets.artifact import load as load_artifact
 from ...snippets.loaders.load import load_direct
 from ...snippets.loaders.neosnippet import load_neosnippet
 from ...snippets.parse import parse_basic
@@ -57,7 +65,9 @@ from ...snippets.types import SCHEMA, LoadedSnips, LoadError, ParsedSnippet
 from ..rt_types import Stack
 
 BUNDLED_PATH_TPL = Template("coq+snippets+${schema}.json")
-_USER_PATH_TPL = Template("users+${schema}.json")
+BUNDLED_BIN_TPL = Template("coq+snippets+${schema}.bin")
+BUNDLED_DB_TPL = Template("coq+snippets+${schema}+${db}.sqlite3")
+_USER_PATH_TPL = Template("users+${schema}")
 _SUB_PATH = PurePath("clients", "snippets")
 
 
@@ -69,17 +79,29 @@ class Compiled:
     parsed: Sequence[Tuple[ParsedSnippet, Edit, Sequence[Mark], TextTransforms]]
 
 
-async def _bundled_mtimes() -> Mapping[Path, float]:
+async def _bundled() -> Tuple[Optional[Path], Mapping[Path, float]]:
+    """
+    The first prebuilt db is attached as is, the other runtime paths are loaded
+    """
+
     rtp = await Nvim.list_runtime_paths()
+    db_name = BUNDLED_DB_TPL.substitute(schema=SCHEMA, db=DB_SCHEMA)
 
-    def c1() -> Iterator[Tuple[Path, float]]:
+    def c1() -> Tuple[Optional[Path], Mapping[Path, float]]:
+        db: Optional[Path] = None
+        mtimes: MutableMapping[Path, float] = {}
         for path in rtp:
-            json = path / BUNDLED_PATH_TPL.substitute(schema=SCHEMA)
-            with suppress(OSError):
-                mtime = json.stat().st_mtime
-                yield json, mtime
+            if not db and (path / db_name).is_file():
+                db = path / db_name
+                continue
+            for tpl in (BUNDLED_BIN_TPL, BUNDLED_PATH_TPL):
+                artifact = path / tpl.substitute(schema=SCHEMA)
+                with suppress(OSError):
+                    mtimes[artifact] = artifact.stat().st_mtime
+                    break
+        return db, mtimes
 
-    return {p: m for p, m in await to_thread(lambda: tuple(c1()))}
+    return await to_thread(c1)
 
 
 def _resolve(stdp: Path, path: Path) -> Optional[Path]:
@@ -138,37 +160,62 @@ def _paths(vars_dir: Path) -> Tuple[Path, Path]:
     return compiled, meta
 
 
-async def _load_compiled(path: Path, mtime: float) -> Tuple[Path, float, LoadedSnips]:
-    decoder = new_decoder[LoadedSnips](LoadedSnips)
+def _artifact(vars_dir: Path, path: PurePath) -> Path:
+    """
+    One compiled artifact per user snippet file
+    """
+
+    compiled, _ = _paths(vars_dir)
+    name = sha256(normcase(path).encode(UTF8)).hexdigest()
+    return (compiled / name).with_suffix(".bin")
 
-    def cont() -> LoadedSnips:
+
+def _decode_compiled(path: Path) -> LoadedSnips:
+    if path.suffix == ".bin":
+        return load_artifact(path)
+    else:
+        decoder = new_decoder[LoadedSnips](LoadedSnips)
         raw = decode(path.read_bytes())
         json = loads(raw)
         loaded = decoder(json)
         return loaded
 
-    return path, mtime, await to_thread(cont)
+
+async def _load_compiled(
+    pool: Optional[ProcessPoolExecutor], path: Path, mtime: float
+) -> Tuple[Path, float, LoadedSnips]:
+    return path, mtime, await offload(pool, _decode_compiled, path)
+
+
+def _read_meta(meta: Path) -> Mapping[Path, float]:
+    with suppress(OSError):
+        raw = decode(meta.read_bytes())
+        try:
+            json = loads(raw)
+            return new_decoder[Mapping[Path, float]](Mapping[Path, float])(json)
+        except (JSONDecodeError, DecodeError):
+            meta.unlink(missing_ok=True)
+    return {}
 
 
 async def _load_user_compiled(
     vars_dir: Path,
 ) -> Tuple[Mapping[Path, float], Mapping[Path, float]]:
-    compiled, meta = _paths(vars_dir)
+    """
+    -> {artifact: mtime}, {snippet file: mtime when compiled}
+    """
+
+    _, meta = _paths(vars_dir)
 
     def cont() -> Tuple[Mapping[Path, float], Mapping[Path, float]]:
-        m1: Mapping[Path, float] = {}
-        m2: Mapping[Path, float] = {}
-        with suppress(OSError):
-            mtime = compiled.stat().st_mtime
-            m1 = {compiled: mtime}
-
-        with suppress(OSError):
-            raw = decode(meta.read_bytes())
-            try:
-                json = loads(raw)
-                m2 = new_decoder[Mapping[Path, float]](Mapping[Path, float])(json)
-            except (JSONDecodeError, DecodeError):
-                meta.unlink(missing_ok=True)
+        m1: MutableMapping[Path, float] = {}
+        m2: MutableMapping[Path, float] = {}
+        for path, mtime in _read_meta(meta).items():
+            artifact = _artifact(vars_dir, path=path)
+            # without its artifact, a file needs compiling again
+            with suppress(OSError):
+                m1[artifact] = artifact.stat().st_mtime
+                m2[path] = mtime
 
         return m1, m2
 
@@ -180,20 +227,27 @@ def jsonify(o: Any) -> str:
     return json
 
 
-async def _dump_compiled(
-    vars_dir: Path, mtimes: Mapping[Path, float], loaded: LoadedSnips
-) -> None:
-    m_json = jsonify(new_encoder[Mapping[Path, float]](Mapping[Path, float])(mtimes))
-    s_json = jsonify(new_encoder[LoadedSnips](LoadedSnips)(loaded))
+def _dump(path: Path, raw: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with NamedTemporaryFile(dir=path.parent, delete=False) as fd:
+        fd.write(raw)
+    Path(fd.name).replace(path)
+
 
+def _dump_meta(vars_dir: Path, mtimes: Mapping[Path, float]) -> None:
+    """
+    Also removes the artifacts of snippet files no longer in `mtimes`
+    """
+
+    m_json = jsonify(new_encoder[Mapping[Path, float]](Mapping[Path, float])(mtimes))
     compiled, meta = _paths(vars_dir)
-    for path, json in ((compiled, s_json), (meta, m_json)):
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with NamedTemporaryFile(
-            dir=path.parent, mode="w", encoding=UTF8, delete=False
-        ) as fd:
-            fd.write(json)
-        Path(fd.name).replace(path)
+    _dump(meta, raw=m_json.encode(UTF8))
+
+    live = {_artifact(vars_dir, path=path) for path in mtimes}
+    with suppress(OSError):
+        for artifact in compiled.iterdir():
+            if artifact not in live:
+                artifact.unlink(missing_ok=True)
 
 
 def _trans(
@@ -216,14 +270,18 @@ def _trans(
 
 
 async def _rolling_load(
-    worker: SnipWorker, cwd: PurePath, compiled: Mapping[Path, float], silent: bool
+    pool: Optional[ProcessPoolExecutor],
+    worker: SnipWorker,
+    cwd: PurePath,
+    compiled: Mapping[Path, float],
+    silent: bool,
 ) -> None:
     for fut in as_completed(
-        tuple(_load_compiled(path, mtime) for path, mtime in compiled.items())
+        tuple(_load_compiled(pool, path, mtime) for path, mtime in compiled.items())
     ):
         try:
             path, mtime, loaded = await fut
-        except (OSError, JSONDecodeError, DecodeError) as e:
+        except (OSError, JSONDecodeError, DecodeError, LoadError) as e:
             tpl = """
                 Failed to load compiled snips
                 ${e}
@@ -251,18 +309,28 @@ async def slurp_compiled(
     with timeit("LOAD SNIPS"):
         (
             cwd,
-            bundled,
+            (bundled_db, bundled),
             (user_compiled, user_compiled_mtimes),
             (_, user_snips_mtimes),
             db_mtimes,
         ) = await gather(
             Nvim.getcwd(),
-            _bundled_mtimes(),
+            _bundled(),
             _load_user_compiled(stack.supervisor.vars_dir),
             user_mtimes(user_path=stack.settings.clients.snippets.user_path),
             worker.db_mtimes(),
         )
 
+        await worker.attach(bundled_db)
+
+        live = {
+            _artifact(stack.supervisor.vars_dir, path=path)
+            for path in user_snips_mtimes
+        }
+        user_compiled = {
+            path: mtime for path, mtime in user_compiled.items() if path in live
+        }
+
         if stale := db_mtimes.keys() - (bundled.keys() | user_compiled.keys()):
             await worker.clean(stale)
 
@@ -271,7 +339,13 @@ async def slurp_compiled(
             for path, mtime in chain(bundled.items(), user_compiled.items())
             if mtime > db_mtimes.get(path, -inf)
         }:
-            await _rolling_load(worker, cwd=cwd, compiled=needs_loading, silent=silent)
+            await _rolling_load(
+                stack.supervisor.procpool,
+                worker,
+                cwd=cwd,
+                compiled=needs_loading,
+                silent=silent,
+            )
 
         needs_compilation = {
             path: mtime
@@ -279,7 +353,9 @@ async def slurp_compiled(
             if mtime > user_compiled_mtimes.get(path, -inf)
         }
 
-        if SnippetWarnings.missing in warn and not (bundled or user_compiled):
+        if SnippetWarnings.missing in warn and not (
+            bundled_db or bundled or user_compiled
+        ):
             await Nvim.write(LANG("fs snip load empty"))
 
         return needs_compilation
@@ -334,33 +410,69 @@ def compile_one(
     return compiled
 
 
+def _compile_user(
+    match: MatchOptions, comp: CompleteOptions, vars_dir: Path, path: Path
+) -> None:
+    info = ParseInfo(visual="", clipboard="", comment_str=("", ""))
+    loaded = load_direct(
+        lambda x: x,
+        ignore_error=False,
+        lsp=(),
+        neosnippet=(path,),
+        ultisnip=(),
+        neosnippet_grammar=SnippetGrammar.lsp,
+    )
+    _ = tuple(_trans(match, comp=comp, info=info, snips=loaded.snippets.values()))
+    _dump(_artifact(vars_dir, path=path), raw=dump_artifact(loaded))
+
+
 async def compile_user_snippets(stack: Stack) -> None:
+    """
+    Only the files changed since their last compilation, each in parallel
+    """
+
     with timeit("COMPILE SNIPS"):
-        info = ParseInfo(visual="", clipboard="", comment_str=("", ""))
-        _, mtimes = await user_mtimes(
-            user_path=stack.settings.clients.snippets.user_path
-        )
-        loaded = await to_thread(
-            lambda: load_direct(
-                lambda x: x,
-                ignore_error=False,
-                lsp=(),
-                neosnippet=mtimes,
-                ultisnip=(),
-                neosnippet_grammar=SnippetGrammar.lsp,
-            )
+        vars_dir = stack.supervisor.vars_dir
+        (_, mtimes), (_, compiled) = await gather(
+            user_mtimes(user_path=stack.settings.clients.snippets.user_path),
+            _load_user_compiled(vars_dir),
         )
-        _ = tuple(
-            _trans(
-                stack.settings.match,
-                comp=stack.settings.completion,
-                info=info,
-                snips=loaded.snippets.values(),
-            )
+        changed = {
+            path: mtime
+            for path, mtime in mtimes.items()
+            if mtime > compiled.get(path, -inf)
+        }
+
+        results = await gather(
+            *(
+                offload(
+                    stack.supervisor.procpool,
+                    _compile_user,
+                    stack.settings.match,
+                    stack.settings.completion,
+                    vars_dir,
+                    path,
+                )
+                for path in changed
+            ),
+            return_exceptions=True,
         )
+        # failed files keep their previous artifact, until compiled successfully
+        acc = {path: mtime for path, mtime in compiled.items() if path in mtimes}
+        errs: MutableSequence[BaseException] = []
+        for (path, mtime), result in zip(changed.items(), results):
+            if isinstance(result, BaseException):
+                errs.append(result)
+            else:
+                acc[path] = mtime
+
         try:
-            await _dump_compiled(
-                stack.supervisor.vars_dir, mtimes=mtimes, loaded=loaded
-            )
+            await to_thread(_dump_meta, vars_dir, acc)
         except OSError as e:
             await Nvim.write(e)
+
+        for err in errs:
+            if isinstance(err, OSError):
+                await Nvim.write(err)
+            else:
+                raise err
@@ -0,0 +1,53 @@
+from argparse import Namespace
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Sequence
+
+from pynvim_pp.nvim import Nvim
+from std2.argparse import ArgparseError, ArgParser
+
+from ...consts import TMP_DIR
+from ...lang import LANG
+from ...registry import rpc
+from ...shared.trace import chrome_trace, jsonl, spans, start, stop
+from ..rt_types import Stack
+
+
+def _parse_args(args: Sequence[str]) -> Namespace:
+    parser = ArgParser()
+    sub_parsers = parser.add_subparsers(dest="action", required=True)
+
+    sub_parsers.add_parser("start")
+    sub_parsers.add_parser("stop")
+
+    with nullcontext(sub_parsers.add_parser("dump")) as p:
+        p.add_argument("--jsonl", action="store_true", default=False)
+        p.add_argument("path", nargs="?")
+
+    return parser.parse_args(args)
+
+
+@rpc()
+async def trace(stack: Stack, args: Sequence[str]) -> None:
+    try:
+        ns = _parse_args(args)
+    except ArgparseError as e:
+        await Nvim.write(e, error=True)
+
+    else:
+        if ns.action == "start":
+            start()
+            await Nvim.write(LANG("trace started"))
+        elif ns.action == "stop":
+            stop()
+            await Nvim.write(LANG("trace stopped"))
+        elif ns.action == "dump":
+            default = TMP_DIR / ("trace.jsonl" if ns.jsonl else "trace.json")
+            path = Path(ns.path).expanduser().resolve() if ns.path else default
+            recorded = spans()
+            text = jsonl(recorded) if ns.jsonl else chrome_trace(recorded)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text)
+            await Nvim.write(LANG("trace dumped", path=str(path), spans=len(recorded)))
+        else:
+            assert False
@@ -2,17 +2,19 @@ from asyncio import get_running_loop, run_coroutine_threadsafe, wrap_future
 from collections import Counter
 from dataclasses import dataclass
 from itertools import chain
-from typing import Mapping
+from random import random
+from time import monotonic
+from typing import Mapping, MutableMapping, Optional, Tuple
 from uuid import UUID, uuid4
 
 from pynvim_pp.lib import display_width
 
-from ..databases.insertions.database import IDB
+from ..databases.insertions.database import IDB, Latency
 from ..shared.context import cword_before
-from ..shared.fuzzy import MatchMetrics, metrics
+from ..shared.fuzzy import BatchMetrics, MatchMetrics
 from ..shared.parse import coalesce, lower
 from ..shared.runtime import Metric, PReviewer
-from ..shared.settings import BaseClient, Icons, MatchOptions, Weights
+from ..shared.settings import BaseClient, Icons, Limits, MatchOptions, Weights
 from ..shared.types import Completion, Context
 from .icons import iconify
 
@@ -23,10 +25,41 @@ class ReviewCtx:
     context: Context
     proximity: Mapping[str, int]
     inserted: Mapping[str, int]
+    metrics: BatchMetrics
+    budgets: Mapping[str, float]
 
     is_lower: bool
 
 
+# latencies are re-learnt at most this often, per filetype
+_RELEARN = 6.0
+_WINDOW = 100
+_QUANTILE = 95
+_MIN_SAMPLES = 30
+_SLACK = 1.5
+_FLOOR = 0.01
+# sources timing out this often, and picked this rarely, are not waited for
+_SLOW, _RARE = 0.9, 0.01
+# except once in a while, to give them a chance to redeem themselves
+_PROBE = 0.1
+
+
+def budget(timeout: float, latency: Latency) -> Optional[float]:
+    """
+    Seconds to wait for a source, `None` for the global timeout
+    """
+
+    if latency.instances < _MIN_SAMPLES:
+        return None
+    elif (
+        latency.interrupted / latency.instances >= _SLOW
+        and latency.inserted / latency.instances < _RARE
+    ):
+        return 0
+    else:
+        return min(timeout, max(_FLOOR, latency.duration * _SLACK))
+
+
 def _metric(
     options: MatchOptions,
     ctx: ReviewCtx,
@@ -36,7 +69,7 @@ def _metric(
     cword = cword_before(
         options.unifying_chars, lower=ctx.is_lower, context=ctx.context, sort_by=match
     )
-    return metrics(cword, match, look_ahead=options.look_ahead)
+    return ctx.metrics(cword, match)
 
 
 def sigmoid(x: float) -> float:
@@ -76,9 +109,30 @@ def _join(
 
 
 class Reviewer(PReviewer[ReviewCtx]):
-    def __init__(self, options: MatchOptions, icons: Icons, db: IDB) -> None:
-        self._options, self._icons, self._db = options, icons, db
+    def __init__(
+        self, options: MatchOptions, limits: Limits, icons: Icons, db: IDB
+    ) -> None:
+        self._options, self._limits = options, limits
+        self._icons, self._db = icons, db
         self._loop = get_running_loop()
+        self._budgets: MutableMapping[str, Tuple[float, Mapping[str, float]]] = {}
+
+    def _learnt(self, context: Context) -> Mapping[str, float]:
+        if not self._limits.completion_adaptive_timeout or context.manual:
+            return {}
+
+        now = monotonic()
+        learnt_at, budgets = self._budgets.get(context.filetype, (-_RELEARN, {}))
+        if now - learnt_at >= _RELEARN:
+            timeout = self._limits.completion_auto_timeout
+            latencies = self._db.latencies(context.filetype, quantile=_QUANTILE)
+            budgets = {
+                source: b
+                for source, latency in latencies.items()
+                if (b := budget(timeout, latency=latency)) is not None
+            }
+            self._budgets[context.filetype] = (now, budgets)
+        return budgets
 
     def s_register(self, assoc: BaseClient) -> None:
         def cont() -> None:
@@ -104,9 +158,11 @@ class Reviewer(PReviewer[ReviewCtx]):
             context=context,
             proximity=proximity,
             inserted=inserted,
+            metrics=BatchMetrics(look_ahead=self._options.look_ahead),
+            budgets=self._learnt(context),
             is_lower=context.is_lower,
         )
-        self._db.new_batch(ctx.batch.bytes)
+        self._db.new_batch(ctx.batch.bytes, filetype=context.filetype)
         return ctx
 
     async def s_begin(
@@ -120,6 +176,14 @@ class Reviewer(PReviewer[ReviewCtx]):
         f = run_coroutine_threadsafe(cont(), loop=self._loop)
         await wrap_future(f)
 
+    def deadline(self, token: ReviewCtx, assoc: BaseClient) -> Optional[float]:
+        if (b := token.budgets.get(assoc.short_name)) is None:
+            return None
+        elif not b and random() < _PROBE:
+            return None
+        else:
+            return b
+
     def trans(self, token: ReviewCtx, instance: UUID, completion: Completion) -> Metric:
         new_completion = iconify(self._icons, completion=completion)
         match_metrics = _metric(
@@ -140,7 +204,11 @@ class Reviewer(PReviewer[ReviewCtx]):
     ) -> None:
         async def cont() -> None:
             self._db.new_stat(
-                instance.bytes, interrupted=interrupted, duration=elapsed, items=items
+                instance.bytes,
+                interrupted=interrupted,
+                duration=elapsed,
+                items=items,
+                window=_WINDOW,
             )
 
         f = run_coroutine_threadsafe(cont(), loop=self._loop)
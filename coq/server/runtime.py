@@ -25,6 +25,7 @@ from ..clients.tmux.worker import Worker as TmuxWorker
 from ..clients.tree_sitter.worker import Worker as TreeWorker
 from ..consts import CONFIG_YML, SETTINGS_VAR, VARS
 from ..databases.insertions.database import IDB
+from ..shared.executor import process_pool
 from ..shared.lru import LRU
 from ..shared.runtime import Supervisor, Worker
 from ..shared.settings import LSPClient, Settings
@@ -65,7 +66,7 @@ def _from_each_according_to_their_ability(
     clients = settings.clients
 
     if clients.buffers.enabled:
-        yield BuffersWorker.init(supervisor, options=clients.buffers, misc=None)
+        yield BuffersWorker.init(supervisor, options=clients.buffers, misc=vars_dir)
 
     if clients.paths.enabled:
         yield PathsWorker.init(supervisor, options=clients.paths, misc=None)
@@ -120,10 +121,12 @@ async def stack(th: ThreadPoolExecutor) -> Stack:
     reviewer = Reviewer(
         icons=settings.display.icons,
         options=settings.match,
+        limits=settings.limits,
         db=idb,
     )
     supervisor = Supervisor(
         th=th,
+        procpool=process_pool(settings.limits.process_workers),
         vars_dir=vars_dir,
         display=settings.display,
         match=settings.match,
@@ -1,64 +1,106 @@
-from dataclasses import asdict
+from heapq import heapify, heappop
 from itertools import chain
 from locale import strxfrm
-from typing import Any, Callable, Iterable, Iterator, MutableSet, Sequence, Tuple
+from typing import Callable, Iterable, Iterator, MutableSet, Sequence, Tuple
 
 from pynvim_pp.lib import display_width
 from std2 import clamp
 
 from ..shared.runtime import Metric
 from ..shared.settings import PumDisplay, Weights
-from ..shared.types import Context, SnippetEdit
+from ..shared.types import Context, ExternTS, SnippetEdit
 from .completions import VimCompletion
 from .rt_types import Stack
 from .state import state
 
 
 def _cum(adjustment: Weights, metrics: Iterable[Metric]) -> Weights:
-    zero = Weights(
-        prefix_matches=0,
-        edit_distance=0,
-        recency=0,
-        proximity=0,
-    )
-    acc = asdict(zero)
+    prefix_matches = edit_distance = recency = proximity = 0.0
     for metric in metrics:
-        for key, val in asdict(metric.weight).items():
-            acc[key] += val
-    for key, val in asdict(adjustment).items():
-        if val:
-            acc[key] /= val
-        else:
-            acc[key] = 0
-    return Weights(**acc)
-
-
-def _sort_by(is_lower: bool, adjustment: Weights) -> Callable[[Metric], Any]:
-    adjust = asdict(adjustment)
-
-    def key_by(metric: Metric) -> Any:
-        tot = sum(
-            val / adjust[key] if adjust[key] else 0
-            for key, val in asdict(metric.weight).items()
+        weight = metric.weight
+        prefix_matches += weight.prefix_matches
+        edit_distance += weight.edit_distance
+        recency += weight.recency
+        proximity += weight.proximity
+
+    def norm(val: float, adjust: float) -> float:
+        return val / adjust if adjust else 0
+
+    return Weights(
+        prefix_matches=norm(prefix_matches, adjustment.prefix_matches),
+        edit_distance=norm(edit_distance, adjustment.edit_distance),
+        recency=norm(recency, adjustment.recency),
+        proximity=norm(proximity, adjustment.proximity),
+    )
+
+
+def _sort_by(adjustment: Weights) -> Callable[[Metric], Tuple[int, ...]]:
+    """
+    Everything but the collation tie breaker, which is expensive
+    """
+
+    p, e, r, x = (
+        adjustment.prefix_matches,
+        adjustment.edit_distance,
+        adjustment.recency,
+        adjustment.proximity,
+    )
+
+    def key_by(metric: Metric) -> Tuple[int, ...]:
+        weight, comp = metric.weight, metric.comp
+        tot = (
+            (weight.prefix_matches / p if p else 0)
+            + (weight.edit_distance / e if e else 0)
+            + (weight.recency / r if r else 0)
+            + (weight.proximity / x if x else 0)
         )
+        lazy_doc = isinstance(comp.extern, ExternTS)
         key = (
-            -(metric.comp.preselect),
-            -(metric.comp.always_on_top),
+            -(comp.preselect),
+            -(comp.always_on_top),
             -round(tot * metric.weight_adjust * 10000),
-            -len(metric.comp.secondary_edits),
-            -(metric.comp.extern is not None),
-            -(metric.comp.kind != ""),
-            -(metric.comp.doc is not None),
-            -metric.comp.sort_by[:1].isalnum(),
-            strxfrm(
-                metric.comp.sort_by.swapcase() if is_lower else metric.comp.sort_by
-            ),
+            -len(comp.secondary_edits),
+            -(comp.extern is not None and not lazy_doc),
+            -(comp.kind != ""),
+            -(comp.doc is not None or lazy_doc),
+            -comp.sort_by[:1].isalnum(),
         )
         return key
 
     return key_by
 
 
+def _ranked(
+    is_lower: bool, adjustment: Weights, metrics: Sequence[Metric]
+) -> Iterator[Metric]:
+    """
+    Lazy heap sort, only as much as is consumed gets ordered
+
+    Runs of equal keys are ordered by collation, as they are popped
+    """
+
+    key_by = _sort_by(adjustment)
+
+    def collate(idx: int) -> str:
+        sort_by = metrics[idx].comp.sort_by
+        return strxfrm(sort_by.swapcase() if is_lower else sort_by)
+
+    heap = [(key_by(metric), idx) for idx, metric in enumerate(metrics)]
+    heapify(heap)
+
+    while heap:
+        key, idx = heappop(heap)
+        run = [idx]
+        while heap and heap[0][0] == key:
+            _, idx = heappop(heap)
+            run.append(idx)
+
+        if len(run) > 1:
+            run.sort(key=collate)
+        for idx in run:
+            yield metrics[idx]
+
+
 def _prune(
     stack: Stack, context: Context, ranked: Iterable[Metric]
 ) -> Iterator[Metric]:
@@ -131,8 +173,7 @@ def trans(
     truncate = clamp(pum_width, scr_width - context.scr_col, display.pum.x_max_len)
 
     w_adjust = _cum(stack.settings.weights, metrics=metrics)
-    sortby = _sort_by(context.is_lower, adjustment=w_adjust)
-    ranked = sorted(metrics, key=sortby)
+    ranked = _ranked(context.is_lower, adjustment=w_adjust, metrics=metrics)
     pruned = tuple(_prune(stack, context=context, ranked=ranked))
     max_width = _max_width(pruned)
     for metric in pruned:
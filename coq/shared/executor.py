@@ -7,14 +7,22 @@ from asyncio import (
     run_coroutine_threadsafe,
     wrap_future,
 )
-from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from concurrent.futures import (
+    Future,
+    InvalidStateError,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from concurrent.futures.process import BrokenProcessPool
 from contextlib import suppress
 from functools import lru_cache
+from multiprocessing import get_context
 from shutil import which
 from subprocess import CalledProcessError
 from threading import Thread
-from typing import Any, Awaitable, Callable, Coroutine, Sequence, TypeVar
+from typing import Any, Awaitable, Callable, Coroutine, Optional, Sequence, TypeVar
 
+from std2.asyncio import to_thread
 from std2.asyncio.subprocess import call
 
 _T = TypeVar("_T")
@@ -113,3 +121,30 @@ def _very_nice() -> Future:
 async def very_nice() -> Sequence[str]:
     f: Future = _very_nice()
     return await wrap_future(f)
+
+
+def process_pool(workers: int) -> Optional[ProcessPoolExecutor]:
+    """
+    `spawn`, not `fork`: the parent is multi-threaded
+    """
+
+    if workers <= 0:
+        return None
+    else:
+        return ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"))
+
+
+async def offload(
+    pool: Optional[ProcessPoolExecutor], f: Callable[..., _T], *args: Any
+) -> _T:
+    """
+    Runs `f` outside of the GIL if there is a `pool`, otherwise on a thread
+
+    `f` has to be a module level function, with picklable arguments & return value
+    """
+
+    if pool:
+        with suppress(BrokenProcessPool):
+            return await wrap_future(pool.submit(f, *args))
+
+    return await to_thread(f, *args)
@@ -1,7 +1,17 @@
 from collections import Counter
 from dataclasses import dataclass
 from itertools import repeat
-from typing import Iterable, MutableMapping, MutableSequence, Tuple
+from sys import maxsize
+from threading import local
+from typing import (
+    Callable,
+    Iterable,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    Sequence,
+    Tuple,
+)
 
 
 @dataclass(frozen=True)
@@ -58,8 +68,62 @@ def quick_ratio(lhs: str, rhs: str, look_ahead: int) -> float:
         return l_ratio + r_ratio * 0.5
 
 
-_ARRAY_CACHE: MutableMapping[Tuple[int, int], MutableSequence[int]] = {}
-_DA: MutableMapping[str, int] = {}
+def quick_ratios(lhs: str, rhss: Iterable[str], look_ahead: int) -> Sequence[float]:
+    """
+    Batched `quick_ratio`, `lhs` is shared across the whole column
+
+    The multiset of each `lhs` slice is only ever counted once
+    """
+
+    len_l = len(lhs)
+    l_counters: MutableMapping[Tuple[int, int], Counter[str]] = {}
+    seen: MutableMapping[str, float] = {}
+
+    def cont(rhs: str) -> float:
+        if (ratio := seen.get(rhs)) is not None:
+            return ratio
+
+        shorter = min(len_l, len(rhs))
+        if not shorter:
+            ratio = 1
+        else:
+            p_matches = _p_matches(lhs, rhs)
+            len_ll, rr = len_l - p_matches, rhs[p_matches:]
+
+            ms_shorter = min(len_ll, len(rr))
+            if not ms_shorter:
+                ms_ratio: float = 1
+            else:
+                cutoff = ms_shorter + look_ahead
+                len_lc, r = min(len_ll, cutoff), rr[:cutoff]
+                longer = max(len_lc, len(r))
+
+                key = (p_matches, len_lc)
+                if (l_c := l_counters.get(key)) is None:
+                    l_c = l_counters[key] = Counter(lhs[p_matches : p_matches + len_lc])
+                r_c = Counter(r)
+                dif = l_c - r_c if len_lc > len(r) else r_c - l_c
+
+                ms_ratio = (1 - sum(dif.values()) / longer) / (ms_shorter / longer)
+
+            l_ratio = p_matches / shorter
+            r_ratio = ms_ratio * (1 - l_ratio)
+            ratio = l_ratio + r_ratio * 0.5
+
+        seen[rhs] = ratio
+        return ratio
+
+    return [*map(cont, rhss)]
+
+
+class _Cache(local):
+    def __init__(self) -> None:
+        self.arrays: MutableMapping[Tuple[int, int], MutableSequence[int]] = {}
+        self.da: MutableMapping[str, int] = {}
+
+
+# arrays are scratch space, they must never be shared between threads
+_ARRAY_CACHE = _Cache()
 
 
 def dl_distance(lhs: str, rhs: str) -> int:
@@ -72,10 +136,12 @@ def dl_distance(lhs: str, rhs: str) -> int:
     len_l, len_r = len(lhs), len(rhs)
     row_size = len_r + 2
     max_d = len_l + len_r
-    _DA.clear()
+    da = _ARRAY_CACHE.da
+    da.clear()
 
-    if not (d := _ARRAY_CACHE.get((len_l, len_r))):
-        d = [*repeat(0, row_size * (len_l + 2))]
+    # every cell read is written before hand, no need to zero out re-used arrays
+    if not (d := _ARRAY_CACHE.arrays.get((len_l, len_r))):
+        d = _ARRAY_CACHE.arrays[(len_l, len_r)] = [*repeat(0, row_size * (len_l + 2))]
 
     d[0] = max_d
     for i in range(0, len_l + 1):
@@ -89,32 +155,109 @@ def dl_distance(lhs: str, rhs: str) -> int:
 
     for i in range(1, len_l + 1):
         db = 0
+        l_char = lhs[i - 1]
+        prev, curr = row_size * i, row_size * (i + 1)
         for j in range(1, len_r + 1):
-            i1 = _DA.get(rhs[j - 1], 0)
+            r_char = rhs[j - 1]
+            i1 = da.get(r_char, 0)
             j1 = db
 
-            if lhs[i - 1] == rhs[j - 1]:
+            if l_char == r_char:
                 cost = 0
                 db = j
             else:
                 cost = 1
 
-            d[row_size * (i + 1) + j + 1] = min(
-                d[row_size * i + j] + cost,
-                d[row_size * (i + 1) + j] + 1,
-                d[row_size * i + j + 1] + 1,
+            d[curr + j + 1] = min(
+                d[prev + j] + cost,
+                d[curr + j] + 1,
+                d[prev + j + 1] + 1,
                 d[row_size * i1 + j1] + (i - i1 - 1) + 1 + (j - j1 - 1),
             )
-        _DA[lhs[i - 1]] = i
+        da[l_char] = i
 
     return d[row_size * (len_l + 1) + len_r + 1]
 
 
-def metrics(lhs: str, rhs: str, look_ahead: int) -> MatchMetrics:
+# larger than any edit distance, so `dl_distance`'s `max_d` need not be known up front
+_INF = maxsize
+
+
+class _Node:
     """
-    Front end bias
+    One row of the edit distance matrix, `rhs` runs down the rows
+
+    All rows below only depend on the prefix of `rhs` leading here, so they can be shared
+    """
+
+    __slots__ = ("rows", "da", "children")
+
+    def __init__(self, rows: Sequence[Sequence[int]], da: Mapping[str, int]) -> None:
+        self.rows, self.da = rows, da
+        self.children: MutableMapping[str, _Node] = {}
+
+
+def _root(lhs: str) -> _Node:
+    return _Node(
+        rows=((*repeat(_INF, len(lhs) + 2),), (_INF, *range(len(lhs) + 1))),
+        da={},
+    )
+
+
+def _descend(lhs: str, node: _Node, r_char: str) -> _Node:
+    rows, da = node.rows, node.da
+    i = len(rows) - 1
+    prev = rows[i]
+    curr = [_INF, i]
+
+    db = 0
+    for j, l_char in enumerate(lhs, start=1):
+        i1 = da.get(l_char, 0)
+        j1 = db
+
+        if l_char == r_char:
+            cost = 0
+            db = j
+        else:
+            cost = 1
+
+        curr.append(
+            min(
+                prev[j] + cost,
+                curr[j] + 1,
+                prev[j + 1] + 1,
+                rows[i1][j1] + (i - i1 - 1) + 1 + (j - j1 - 1),
+            )
+        )
+
+    child = _Node(rows=(*rows, curr), da={**da, r_char: i})
+    # racing threads would compute identical rows, first one wins
+    return node.children.setdefault(r_char, child)
+
+
+def _distance(lhs: str, root: _Node, rhs: str) -> int:
+    node = root
+    for r_char in rhs:
+        if (child := node.children.get(r_char)) is None:
+            child = _descend(lhs, node=node, r_char=r_char)
+        node = child
+    return node.rows[-1][-1]
+
+
+def dl_distances(lhs: str, rhss: Iterable[str]) -> Sequence[int]:
+    """
+    Batched `dl_distance`, `lhs` is shared across the whole column
+
+    Rows for common prefixes of `rhss` are only ever computed once
     """
 
+    root = _root(lhs)
+    return [_distance(lhs, root=root, rhs=rhs) for rhs in rhss]
+
+
+def _metrics(
+    lhs: str, rhs: str, look_ahead: int, dist: Callable[[str, str], int]
+) -> MatchMetrics:
     shorter = min(len(lhs), len(rhs))
     if not shorter:
         return MatchMetrics(prefix_matches=0, edit_distance=0)
@@ -124,6 +267,39 @@ def metrics(lhs: str, rhs: str, look_ahead: int) -> MatchMetrics:
         more = cutoff - shorter
         l, r = lhs[p_matches:cutoff], rhs[p_matches:cutoff]
 
-        dist = dl_distance(l, r)
-        edit_dist = 1 - (dist - more) / shorter
+        edit_dist = 1 - (dist(l, r) - more) / shorter
         return MatchMetrics(prefix_matches=p_matches, edit_distance=edit_dist)
+
+
+def metrics(lhs: str, rhs: str, look_ahead: int) -> MatchMetrics:
+    """
+    Front end bias
+    """
+
+    return _metrics(lhs, rhs, look_ahead=look_ahead, dist=dl_distance)
+
+
+class BatchMetrics:
+    """
+    `metrics` over a single completion batch
+
+    Repeated pairs are memoized, and edit distance rows are shared between candidates
+    """
+
+    def __init__(self, look_ahead: int) -> None:
+        self._look_ahead = look_ahead
+        self._roots: MutableMapping[str, _Node] = {}
+        self._seen: MutableMapping[Tuple[str, str], MatchMetrics] = {}
+
+    def _dist(self, lhs: str, rhs: str) -> int:
+        if (root := self._roots.get(lhs)) is None:
+            root = self._roots.setdefault(lhs, _root(lhs))
+        return _distance(lhs, root=root, rhs=rhs)
+
+    def __call__(self, lhs: str, rhs: str) -> MatchMetrics:
+        key = (lhs, rhs)
+        if (m := self._seen.get(key)) is None:
+            m = self._seen[key] = _metrics(
+                lhs, rhs, look_ahead=self._look_ahead, dist=self._dist
+            )
+        return m
@@ -8,7 +8,9 @@ from asyncio import (
     as_completed,
     create_task,
     gather,
+    get_running_loop,
     run_coroutine_threadsafe,
+    sleep,
     wait,
     wrap_future,
 )
@@ -16,20 +18,27 @@ from asyncio.exceptions import CancelledError
 from asyncio.tasks import FIRST_COMPLETED
 from collections import deque
 from concurrent.futures import Future as CFuture
-from concurrent.futures import InvalidStateError, ThreadPoolExecutor
+from concurrent.futures import (
+    InvalidStateError,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
 from contextlib import contextmanager, suppress
 from dataclasses import dataclass
 from pathlib import Path
 from threading import Lock
-from time import monotonic
+from time import monotonic, perf_counter_ns
 from typing import (
+    AbstractSet,
     Any,
     AsyncIterator,
     Awaitable,
+    Callable,
     Coroutine,
     Deque,
     Generic,
     Iterator,
+    MutableMapping,
     MutableSequence,
     Optional,
     Protocol,
@@ -53,6 +62,7 @@ from .settings import (
     Weights,
 )
 from .timeit import TracingLocker, timeit
+from .trace import record, tracing
 from .types import Completion, Context, Interruptible
 
 _T = TypeVar("_T")
@@ -77,6 +87,8 @@ class PReviewer(Protocol[_T]):
 
     async def s_begin(self, token: _T, assoc: BaseClient, instance: UUID) -> None: ...
 
+    def deadline(self, token: _T, assoc: BaseClient) -> Optional[float]: ...
+
     def trans(self, token: _T, instance: UUID, completion: Completion) -> Metric: ...
 
     async def s_end(
@@ -88,6 +100,7 @@ class Supervisor:
     def __init__(
         self,
         th: ThreadPoolExecutor,
+        procpool: Optional[ProcessPoolExecutor],
         vars_dir: Path,
         display: Display,
         match: MatchOptions,
@@ -102,6 +115,7 @@ class Supervisor:
         self._reviewer = reviewer
 
         self.threadpool = th
+        self.procpool = procpool
         self._thread_lock = Lock()
         self._workers: WeakSet[Worker] = WeakSet()
 
@@ -126,7 +140,17 @@ class Supervisor:
         if task:
             await cancel(task)
 
-    def collect(self, context: Context) -> Awaitable[Sequence[Metric]]:
+    def collect(
+        self,
+        context: Context,
+        progress: Optional[Callable[[Sequence[Metric]], Awaitable[None]]] = None,
+    ) -> Awaitable[Sequence[Metric]]:
+        """
+        With `progress`, the first result is delivered as soon as any source is done
+
+        Stragglers are then fed to `progress` until `completion_manual_timeout`
+        """
+
         self.current_context = context
         now = monotonic()
         timeout = (
@@ -134,34 +158,106 @@ class Supervisor:
             if context.manual
             else self.limits.completion_auto_timeout
         )
-
-        async def cont(prev: Optional[Task]) -> Sequence[Metric]:
+        first: Future[Sequence[Metric]] = get_running_loop().create_future()
+
+        def drain(acc: Deque[Metric], collected: MutableSequence[Metric]) -> bool:
+            # workers are still appending from their own threads
+            n = len(collected)
+            while acc:
+                collected.append(acc.popleft())
+            return len(collected) > n
+
+        async def progressive(
+            acc: Deque[Metric],
+            tasks: Sequence[Future],
+            progress: Callable[[Sequence[Metric]], Awaitable[None]],
+        ) -> None:
+            collected: MutableSequence[Metric] = []
+            pending: AbstractSet[Future] = {*tasks}
+            try:
+                while not drain(acc, collected=collected) and pending:
+                    remaining = now + timeout - monotonic()
+                    _, pending = await wait(
+                        pending,
+                        timeout=remaining if remaining > 0 else None,
+                        return_when=FIRST_COMPLETED,
+                    )
+                # the caller may have been cancelled in the meantime
+                if not first.done():
+                    first.set_result(tuple(collected))
+
+                deadline = now + max(timeout, self.limits.completion_manual_timeout)
+                last = monotonic()
+                while pending and (remaining := deadline - monotonic()) > 0:
+                    _, pending = await wait(
+                        pending, timeout=remaining, return_when=FIRST_COMPLETED
+                    )
+                    if acc:
+                        interval = self.limits.completion_refresh_interval
+                        await sleep(last + interval - monotonic())
+                        drain(acc, collected=collected)
+                        last = monotonic()
+                        await progress(tuple(collected))
+
+                if drain(acc, collected=collected):
+                    await progress(tuple(collected))
+            finally:
+                await cancel(*pending)
+
+        async def cont(prev: Optional[Task]) -> None:
             with timeit("CANCEL -- ALL"):
                 if prev:
                     await cancel(prev)
 
-            with suppress_and_log(), timeit("COLLECTED -- ALL"):
-                async with self._lock:
-                    acc: Deque[Metric] = deque()
-
-                    token = self._reviewer.begin(context)
-                    tasks = tuple(
-                        worker.supervised(context, token=token, now=now, acc=acc)
-                        for worker in self._workers
-                    )
-
-                    _, pending = await wait(tasks, timeout=timeout)
-                    if not acc:
-                        for fut in as_completed(pending):
-                            await fut
-                            if acc:
-                                break
-
-                    await cancel(*pending)
-                    return acc
-
-        self._work_task = task = create_task(cont(self._work_task))
-        return task
+            try:
+                with suppress_and_log(), timeit("COLLECTED -- ALL"):
+                    async with self._lock:
+                        acc: Deque[Metric] = deque()
+
+                        with timeit("REVIEW -- BEGIN"):
+                            token = self._reviewer.begin(context)
+                        deadlines: MutableMapping[Future, float] = {}
+                        for worker in self._workers:
+                            task = worker.supervised(
+                                context, token=token, now=now, acc=acc
+                            )
+                            d = self._reviewer.deadline(token, assoc=worker._options)
+                            deadlines[task] = timeout if d is None else min(timeout, d)
+                        tasks = tuple(deadlines)
+
+                        if progress:
+                            await progressive(acc, tasks=tasks, progress=progress)
+                        else:
+                            pending: AbstractSet[Future] = {*tasks}
+                            while (
+                                pending
+                                and (
+                                    remaining := now
+                                    + max(map(deadlines.__getitem__, pending))
+                                    - monotonic()
+                                )
+                                > 0
+                            ):
+                                _, pending = await wait(
+                                    pending,
+                                    timeout=remaining,
+                                    return_when=FIRST_COMPLETED,
+                                )
+                            if not acc:
+                                for fut in as_completed(pending):
+                                    await fut
+                                    if acc:
+                                        break
+
+                            await cancel(*pending)
+                            if not first.done():
+                                first.set_result(acc)
+            finally:
+                if not first.done():
+                    first.cancel()
+
+        self._work_task = create_task(cont(self._work_task))
+        return first
 
 
 class Worker(Interruptible, Generic[_O_co, _T_co]):
@@ -232,6 +328,7 @@ class Worker(Interruptible, Generic[_O_co, _T_co]):
         async def cont() -> None:
             instance, items = uuid4(), 0
             interrupted = False
+            reviewing, traced = 0, tracing()
 
             with timeit(f"CANCEL WORKER -- {self._options.short_name}"):
                 if prev:
@@ -245,14 +342,24 @@ class Worker(Interruptible, Generic[_O_co, _T_co]):
                     async for items, completion in aenumerate(
                         self._work(context), start=1
                     ):
+                        t0 = perf_counter_ns() if traced else 0
                         metric = self._supervisor._reviewer.trans(
                             token, instance=instance, completion=completion
                         )
+                        if traced:
+                            reviewing += perf_counter_ns() - t0
                         acc.append(metric)
                 except CancelledError:
                     interrupted = True
                     raise
                 finally:
+                    if traced:
+                        record(
+                            f"REVIEW -- {self._options.short_name}",
+                            begin_ns=perf_counter_ns() - reviewing,
+                            duration_ns=reviewing,
+                            items=items,
+                        )
                     elapsed = monotonic() - now
                     await self._supervisor._reviewer.s_end(
                         instance,
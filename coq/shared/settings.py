@@ -12,6 +12,9 @@ class Limits:
     idle_timeout: float
     completion_auto_timeout: float
     completion_manual_timeout: float
+    completion_refresh_interval: float
+    completion_adaptive_timeout: bool
+    process_workers: int
     download_retries: int
     download_timeout: float
 
@@ -94,6 +97,7 @@ class MatchOptions:
     look_ahead: int
     exact_matches: int
     fuzzy_cutoff: float
+    batch_scoring: bool
 
 
 @dataclass(frozen=True)
@@ -111,6 +115,7 @@ class CompleteOptions:
     replace_prefix_threshold: int
     replace_suffix_threshold: int
     skip_after: AbstractSet[str]
+    progressive: bool
 
 
 @dataclass(frozen=True)
@@ -163,16 +168,23 @@ class PathsClient(BaseClient, _AlwaysTop):
 class BuffersClient(_WordbankClient, _AlwaysTop):
     same_filetype: bool
     parent_scope: str
+    memory_index: bool
+    persistent_files: int
 
 
 @dataclass(frozen=True)
-class TagsClient(BaseClient, _AlwaysTop):
+class _ScopedClient(BaseClient, _AlwaysTop):
     parent_scope: str
     path_sep: str
 
 
 @dataclass(frozen=True)
-class TmuxClient(_WordbankClient, TagsClient, _AlwaysTop):
+class TagsClient(_ScopedClient):
+    index_project: bool
+
+
+@dataclass(frozen=True)
+class TmuxClient(_WordbankClient, _ScopedClient, _AlwaysTop):
     all_sessions: bool
 
 
@@ -200,6 +212,8 @@ class SnippetClient(BaseClient, _AlwaysTop):
 @dataclass(frozen=True)
 class LSPClient(BaseClient, _AlwaysTops):
     resolve_timeout: float
+    resolve_prefetch: int
+    pre_filter: bool
 
 
 @dataclass(frozen=True)
@@ -286,6 +300,7 @@ EMPTY_MATCH = MatchOptions(
     look_ahead=0,
     exact_matches=0,
     fuzzy_cutoff=0,
+    batch_scoring=False,
 )
 EMPTY_COMP = CompleteOptions(
     always=False,
@@ -293,4 +308,5 @@ EMPTY_COMP = CompleteOptions(
     replace_prefix_threshold=0,
     replace_suffix_threshold=0,
     skip_after=set(),
+    progressive=False,
 )
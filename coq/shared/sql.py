@@ -1,17 +1,35 @@
 from functools import lru_cache
+from itertools import islice
 from os.path import normcase
 from pathlib import Path
 from sqlite3.dbapi2 import Connection
-from typing import Protocol, cast
+from string import ascii_lowercase, ascii_uppercase
+from typing import (
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    MutableSet,
+    Optional,
+    Protocol,
+    TypeVar,
+    cast,
+)
 
 from pynvim_pp.lib import decode
 from std2.pathlib import AnyPath
 from std2.sqlite3 import add_functions, escape
 
-from .fuzzy import quick_ratio
+from .fuzzy import quick_ratio, quick_ratios
+from .settings import MatchOptions
 
 BIGGEST_INT = 2**63 - 1
 
+_T = TypeVar("_T")
+
+_MIN_BATCH, _MAX_BATCH = 9, 999
+_ASCII_LOWER = str.maketrans(ascii_uppercase, ascii_lowercase)
+
 
 class _Loader(Protocol):
     def __call__(self, *paths: AnyPath) -> str: ...
@@ -36,3 +54,132 @@ def init_db(conn: Connection) -> None:
     add_functions(conn)
     conn.create_function("X_SIMILARITY", narg=3, func=quick_ratio, deterministic=True)
     conn.create_function("X_NORM_CASE", narg=1, func=normcase, deterministic=True)
+
+
+def sql_lower(text: str) -> str:
+    """
+    Same as sqlite `LOWER`, ASCII only
+    """
+
+    return text.translate(_ASCII_LOWER)
+
+
+def _batch_filter(
+    opts: MatchOptions,
+    word: str,
+    sym: str,
+    limit: int,
+    rows: Iterable[_T],
+    text: Callable[[_T], str],
+    uniq: Optional[Callable[[_T], Hashable]],
+    match_empty: bool,
+    match_prefix: bool,
+) -> Iterator[_T]:
+    branches = tuple(
+        (w, sql_lower(w), sql_lower(w[: opts.exact_matches]))
+        for w in (word, sym)
+        if w or match_empty
+    )
+    seen: MutableSet[Hashable] = set()
+    it = iter(rows)
+
+    # never pull rows past the `LIMIT`, sqlite is still scanning lazily
+    while batch := tuple(islice(it, min(max(limit, _MIN_BATCH), _MAX_BATCH))):
+        texts = [*map(text, batch)]
+        ltexts = [*map(sql_lower, texts)]
+        passed = [False] * len(batch)
+
+        for w, lw, prefix in branches:
+            idxs = [
+                idx
+                for idx, (t, lt) in enumerate(zip(texts, ltexts))
+                if not passed[idx]
+                and lt.startswith(prefix)
+                and len(t) + opts.look_ahead >= len(w)
+                and (match_prefix or t != w[: len(t)])
+            ]
+            ratios = quick_ratios(
+                lw, (ltexts[idx] for idx in idxs), look_ahead=opts.look_ahead
+            )
+            for idx, ratio in zip(idxs, ratios):
+                if ratio > opts.fuzzy_cutoff:
+                    passed[idx] = True
+
+        for row, ok in zip(batch, passed):
+            if ok:
+                if uniq:
+                    key = uniq(row)
+                    if key in seen:
+                        continue
+                    else:
+                        seen.add(key)
+
+                yield row
+                limit -= 1
+                if limit <= 0:
+                    return
+
+
+def fuzzy_narrow(
+    opts: MatchOptions,
+    word: str,
+    sym: str,
+    limitless: int,
+    rows: Iterable[_T],
+    text: Callable[[_T], str],
+    uniq: Optional[Callable[[_T], Hashable]] = None,
+    match_empty: bool = False,
+    match_prefix: bool = False,
+) -> Iterator[_T]:
+    """
+    Like `fuzzy_filter`, but for rows that sqlite has only prefix filtered, regardless of `batch_scoring`
+    """
+
+    return _batch_filter(
+        opts,
+        word=word,
+        sym=sym,
+        limit=BIGGEST_INT if limitless else opts.max_results,
+        rows=rows,
+        text=text,
+        uniq=uniq,
+        match_empty=match_empty,
+        match_prefix=match_prefix,
+    )
+
+
+def fuzzy_limit(opts: MatchOptions, limitless: int) -> int:
+    return BIGGEST_INT if limitless or opts.batch_scoring else opts.max_results
+
+
+def fuzzy_filter(
+    opts: MatchOptions,
+    word: str,
+    sym: str,
+    limitless: int,
+    rows: Iterable[_T],
+    text: Callable[[_T], str],
+    uniq: Optional[Callable[[_T], Hashable]] = None,
+    match_empty: bool = False,
+    match_prefix: bool = False,
+) -> Iterable[_T]:
+    """
+    With `batch_scoring`, sqlite only does the prefix filtering, and `:batched` rows are scored here in bulk
+
+    Re-applies the `word` / `sym` predicates of the `select` queries, followed by their `LIMIT`
+    """
+
+    if not opts.batch_scoring:
+        return rows
+    else:
+        return _batch_filter(
+            opts,
+            word=word,
+            sym=sym,
+            limit=BIGGEST_INT if limitless else opts.max_results,
+            rows=rows,
+            text=text,
+            uniq=uniq,
+            match_empty=match_empty,
+            match_prefix=match_prefix,
+        )
@@ -17,16 +17,21 @@ from std2.locale import si_prefixed_smol
 from std2.timeit import timeit as _timeit
 
 from ..consts import DEBUG
+from .trace import span
 
 _RECORDS: MutableMapping[str, Tuple[int, float]] = {}
 
 
 @contextmanager
 def timeit(
-    name: str, *args: Any, force: bool = False, warn: Optional[float] = None
+    name: str,
+    *args: Any,
+    force: bool = False,
+    warn: Optional[float] = None,
+    nest: bool = True,
 ) -> Iterator[None]:
     if DEBUG or force or warn is not None:
-        with _timeit() as t:
+        with span(name, nest=nest), _timeit() as t:
             yield None
         delta = t().total_seconds()
         if DEBUG or force or delta >= (warn or 0):
@@ -43,7 +48,8 @@ def timeit(
             else:
                 log.debug("%s", msg)
     else:
-        yield None
+        with span(name, nest=nest):
+            yield None
 
 
 class TracingLocker(AsyncContextManager):
@@ -0,0 +1,149 @@
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from itertools import count
+from json import dumps
+from os import getpid, linesep
+from threading import Event, get_ident
+from time import perf_counter_ns
+from typing import Any, Deque, Iterable, Iterator, Mapping, Optional, Sequence
+from uuid import UUID
+
+_RING_SIZE = 9999
+
+
+@dataclass(frozen=True)
+class Span:
+    correlation: Optional[str]
+    span_id: int
+    parent_id: Optional[int]
+    name: str
+    thread: int
+    begin_ns: int
+    duration_ns: int
+    args: Mapping[str, Any]
+
+
+_ENABLED = Event()
+_SPANS: Deque[Span] = deque(maxlen=_RING_SIZE)
+_IDS = count(1)
+
+_PARENT: ContextVar[Optional[int]] = ContextVar("_PARENT", default=None)
+_CORRELATION: ContextVar[Optional[str]] = ContextVar("_CORRELATION", default=None)
+
+
+def tracing() -> bool:
+    return _ENABLED.is_set()
+
+
+def start() -> None:
+    _SPANS.clear()
+    _ENABLED.set()
+
+
+def stop() -> None:
+    _ENABLED.clear()
+
+
+def spans() -> Sequence[Span]:
+    return tuple(_SPANS)
+
+
+def record(name: str, begin_ns: int, duration_ns: int, **args: Any) -> None:
+    """
+    For work that is not contiguous, ie. accumulated across a loop
+    """
+
+    if _ENABLED.is_set():
+        _SPANS.append(
+            Span(
+                correlation=_CORRELATION.get(),
+                span_id=next(_IDS),
+                parent_id=_PARENT.get(),
+                name=name,
+                thread=get_ident(),
+                begin_ns=begin_ns,
+                duration_ns=duration_ns,
+                args=args,
+            )
+        )
+
+
+@contextmanager
+def span(name: str, nest: bool = True, **args: Any) -> Iterator[None]:
+    """
+    Nests via `ContextVar`, which follows tasks across threads & event loops
+
+    `nest=False` in generator bodies: they yield into their consumer's context
+    """
+
+    if not _ENABLED.is_set():
+        yield None
+    else:
+        span_id, parent_id = next(_IDS), _PARENT.get()
+        if nest:
+            _PARENT.set(span_id)
+        begin = perf_counter_ns()
+        try:
+            yield None
+        finally:
+            duration = perf_counter_ns() - begin
+            if nest:
+                _PARENT.set(parent_id)
+            _SPANS.append(
+                Span(
+                    correlation=_CORRELATION.get(),
+                    span_id=span_id,
+                    parent_id=parent_id,
+                    name=name,
+                    thread=get_ident(),
+                    begin_ns=begin,
+                    duration_ns=duration,
+                    args=args,
+                )
+            )
+
+
+@contextmanager
+def correlate(correlation: UUID) -> Iterator[None]:
+    """
+    Spans under this are tagged with `correlation`, ie. the `change_id` of a keystroke
+    """
+
+    token = _CORRELATION.set(str(correlation))
+    try:
+        yield None
+    finally:
+        _CORRELATION.reset(token)
+
+
+def chrome_trace(spans: Iterable[Span]) -> str:
+    """
+    https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU
+    """
+
+    pid = getpid()
+    events = [
+        {
+            "name": span.name,
+            "cat": "coq",
+            "ph": "X",
+            "ts": span.begin_ns / 1000,
+            "dur": span.duration_ns / 1000,
+            "pid": pid,
+            "tid": span.thread,
+            "args": {
+                **span.args,
+                "correlation": span.correlation,
+                "span_id": span.span_id,
+                "parent_id": span.parent_id,
+            },
+        }
+        for span in spans
+    ]
+    return dumps({"traceEvents": events, "displayTimeUnit": "ms"}, default=str)
+
+
+def jsonl(spans: Iterable[Span]) -> str:
+    return "".join(dumps(asdict(span), default=str) + linesep for span in spans)
@@ -186,6 +186,12 @@ class ExternPath:
     path: Path
 
 
+@dataclass(frozen=True)
+class ExternTS:
+    buf: int
+    word_id: int
+
+
 @dataclass(frozen=True)
 class Completion:
     source: str
@@ -202,7 +208,7 @@ class Completion:
     preselect: bool = False
     kind: str = ""
     doc: Optional[Doc] = None
-    extern: Union[ExternLSP, ExternLUA, ExternPath, None] = None
+    extern: Union[ExternLSP, ExternLUA, ExternPath, ExternTS, None] = None
 
 
 TextTransform = Callable[[Optional[str]], Union[Sequence[str], str]]
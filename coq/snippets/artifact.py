@@ -0,0 +1,173 @@
+from array import array
+from itertools import accumulate, chain, islice
+from mmap import ACCESS_READ, mmap
+from pathlib import Path
+from struct import Struct, error
+from sys import byteorder
+from typing import (
+    AbstractSet,
+    Iterable,
+    MutableMapping,
+    MutableSequence,
+    Sequence,
+    Tuple,
+)
+from uuid import UUID
+
+from ..shared.types import UTF8, SnippetGrammar
+from .types import LoadedSnips, LoadError, ParsedSnippet
+
+_MAGIC = b"coq+snippets\x00\x03"
+
+_U32 = Struct("<I")
+
+_GRAMMARS = tuple(SnippetGrammar)
+_GRAMMAR_IDX = {grammar: idx for idx, grammar in enumerate(_GRAMMARS)}
+
+
+class _Strings:
+    def __init__(self) -> None:
+        self._idx: MutableMapping[str, int] = {}
+        self.acc: MutableSequence[str] = []
+
+    def __call__(self, text: str) -> int:
+        if (idx := self._idx.get(text)) is None:
+            idx = self._idx[text] = len(self.acc)
+            self.acc.append(text)
+        return idx
+
+
+def _u32s(values: Iterable[int]) -> bytes:
+    arr = array("I", values)
+    if byteorder != "little":
+        arr.byteswap()
+    return _U32.pack(len(arr)) + arr.tobytes()
+
+
+def _blob(raw: bytes) -> bytes:
+    return _U32.pack(len(raw)) + raw
+
+
+def dumps(loaded: LoadedSnips) -> bytes:
+    """
+    Columnar & length prefixed, read back via `mmap` without any reflection
+
+    MAGIC
+    u32[] string lengths, in code points
+    blob  utf-8 of all strings, each only once
+    u32[] ext srcs, u32[] #dests, u32[] dests
+    blob  uuids, u8[] grammars
+    u32[] filetypes, u32[] contents, u32[] labels, u32[] docs, u32[] #matches, u32[] matches
+
+    u32[] := u32 #, u32 ...
+    blob  := u32 #bytes, bytes
+    """
+
+    strings = _Strings()
+    exts = sorted((src, sorted(dests)) for src, dests in loaded.exts.items())
+    snips = sorted(loaded.snippets.items())
+    matches = tuple(sorted(snip.matches) for _, snip in snips)
+
+    ext_srcs = tuple(strings(src) for src, _ in exts)
+    ext_dests = tuple(strings(dest) for _, dests in exts for dest in dests)
+    columns = tuple(
+        tuple(strings(getattr(snip, attr)) for _, snip in snips)
+        for attr in ("filetype", "content", "label", "doc")
+    )
+    words = tuple(strings(match) for match in chain.from_iterable(matches))
+
+    return b"".join(
+        (
+            _MAGIC,
+            _u32s(len(text) for text in strings.acc),
+            _blob("".join(strings.acc).encode(UTF8)),
+            _u32s(ext_srcs),
+            _u32s(len(dests) for _, dests in exts),
+            _u32s(ext_dests),
+            _blob(b"".join(uid.bytes for uid, _ in snips)),
+            _blob(bytes(_GRAMMAR_IDX[snip.grammar] for _, snip in snips)),
+            *map(_u32s, columns),
+            _u32s(map(len, matches)),
+            _u32s(words),
+        )
+    )
+
+
+def _parse(buf: memoryview) -> LoadedSnips:
+    if buf[: len(_MAGIC)] != _MAGIC:
+        raise LoadError("bad magic")
+
+    offset = len(_MAGIC)
+
+    def blob() -> bytes:
+        nonlocal offset
+        (n,) = _U32.unpack_from(buf, offset)
+        lo, offset = offset + _U32.size, offset + _U32.size + n
+        if offset > len(buf):
+            raise LoadError("truncated")
+        return bytes(buf[lo:offset])
+
+    def u32s() -> Sequence[int]:
+        nonlocal offset
+        (n,) = _U32.unpack_from(buf, offset)
+        lo, offset = offset + _U32.size, offset + _U32.size + n * 4
+        if offset > len(buf):
+            raise LoadError("truncated")
+        arr = array("I")
+        arr.frombytes(buf[lo:offset])
+        if byteorder != "little":
+            arr.byteswap()
+        return arr
+
+    def groups(counts: Iterable[int], values: Sequence[int]) -> Iterable[Sequence[int]]:
+        it = iter(values)
+        for count in counts:
+            yield tuple(islice(it, count))
+
+    lengths = u32s()
+    text = str(blob(), UTF8)
+    ends = tuple(accumulate(lengths, initial=0))
+    strings = tuple(text[lo:hi] for lo, hi in zip(ends, ends[1:]))
+
+    ext_srcs, ext_counts, ext_dests = u32s(), u32s(), u32s()
+    exts: MutableMapping[str, AbstractSet[str]] = {
+        strings[src]: frozenset(strings[dest] for dest in dests)
+        for src, dests in zip(ext_srcs, groups(ext_counts, ext_dests))
+    }
+
+    uids, grammars = blob(), blob()
+    filetypes, contents, labels, docs = u32s(), u32s(), u32s(), u32s()
+    counts, words = u32s(), u32s()
+
+    snips: Iterable[Tuple[int, int, int, int, int, Sequence[int]]] = zip(
+        grammars, filetypes, contents, labels, docs, groups(counts, words)
+    )
+    snippets: MutableMapping[UUID, ParsedSnippet] = {}
+    for idx, (grammar, filetype, content, label, doc, matches) in enumerate(snips):
+        uid = UUID(bytes=uids[idx * 16 : idx * 16 + 16])
+        snippets[uid] = ParsedSnippet(
+            grammar=_GRAMMARS[grammar],
+            filetype=strings[filetype],
+            content=strings[content],
+            label=strings[label],
+            doc=strings[doc],
+            matches=frozenset(strings[match] for match in matches),
+        )
+
+    if len(snippets) * 16 != len(uids):
+        raise LoadError("truncated")
+
+    return LoadedSnips(exts=exts, snippets=snippets)
+
+
+def load(path: Path) -> LoadedSnips:
+    with path.open("rb") as fd:
+        try:
+            mm = mmap(fd.fileno(), length=0, access=ACCESS_READ)
+        except ValueError:
+            raise LoadError(f"empty -- {path}")
+        with mm, memoryview(mm) as buf:
+            try:
+                return _parse(buf)
+            except (error, IndexError, UnicodeDecodeError) as e:
+                raise LoadError(f"{e} -- {path}") from e
@@ -1,13 +1,16 @@
+from dataclasses import dataclass
 from itertools import chain
 from string import Template
 from textwrap import dedent
 from typing import (
+    Callable,
     Iterable,
     Iterator,
     Mapping,
     MutableMapping,
     MutableSequence,
     NoReturn,
+    Optional,
     Sequence,
     Tuple,
     Union,
@@ -18,6 +21,7 @@ from pynvim_pp.logging import log
 from std2.itertools import deiter, interleave
 from std2.types import never
 
+from ...shared.lru import LRU
 from ...shared.types import Context, TextTransform
 from ..consts import MOD_PAD, SNIP_LINE_SEP
 from .types import (
@@ -35,6 +39,7 @@ from .types import (
     Transform,
     Unparsed,
     VarBegin,
+    Variable,
 )
 
 
@@ -92,7 +97,7 @@ def _gen_iter(src: str) -> Iterator[EChar]:
 
 def context_from(snippet: str, context: Context, info: ParseInfo) -> ParserCtx:
     dit = deiter(_gen_iter(snippet))
-    ctx = ParserCtx(ctx=context, text=snippet, info=info, dit=dit, stack=[])
+    ctx = ParserCtx(ctx=context, text=snippet, info=info, dit=dit, stack=[], eager=[])
     return ctx
 
 
@@ -138,7 +143,11 @@ def decode_mark_idx(idx: int) -> int:
     return idx % MOD_PAD
 
 
-def token_parser(context: ParserCtx, stream: TokenStream) -> Parsed:
+def token_parser(
+    context: ParserCtx,
+    stream: TokenStream,
+    subst: Callable[[str], Optional[str]],
+) -> Parsed:
     idx = 0
     raw_regions: MutableMapping[int, MutableSequence[Region]] = {}
     slices: MutableSequence[str] = []
@@ -165,6 +174,11 @@ def token_parser(context: ParserCtx, stream: TokenStream) -> Parsed:
                 xforms[token.maybe_idx] = token.xform
         elif isinstance(token, VarBegin):
             begins.append((idx, token))
+        elif isinstance(token, Variable):
+            var = subst(token.name)
+            text = token.name if var is None else var
+            idx += len(encode(text))
+            slices.append(text)
         elif isinstance(token, End):
             if begins:
                 pos, begin = begins.pop()
@@ -207,3 +221,51 @@ def token_parser(context: ParserCtx, stream: TokenStream) -> Parsed:
     regions = tuple(_consolidate(text, regions=raw_regions))
     parsed = Parsed(text=text, cursor=cursor, regions=regions, xforms=xforms)
     return parsed
+
+
+@dataclass(frozen=True)
+class Lexed:
+    tokens: Sequence[Token]
+    parsed: Optional[Parsed]
+
+
+def _coalesce(stream: TokenStream) -> Iterator[Token]:
+    acc: MutableSequence[str] = []
+    for token in stream:
+        if isinstance(token, str):
+            acc.append(token)
+        else:
+            if acc:
+                yield "".join(acc)
+                acc.clear()
+            yield token
+    if acc:
+        yield "".join(acc)
+
+
+def tokenize(
+    cache: LRU[str, Lexed],
+    context: ParserCtx,
+    lex: Callable[[ParserCtx], TokenStream],
+    subst: Callable[[str], Optional[str]],
+) -> Parsed:
+    """
+    Tokens are cached by snippet, unless a variable had to be substituted `eager`ly
+
+    Without any `Variable` tokens, so is the parse
+    """
+
+    lexed: Optional[Lexed] = cache.get(context.text)
+    if lexed:
+        if lexed.parsed:
+            return lexed.parsed
+        else:
+            tokens = lexed.tokens
+    else:
+        tokens = tuple(_coalesce(lex(context)))
+
+    parsed = token_parser(context, stream=iter(tokens), subst=subst)
+    if not lexed and not context.eager:
+        static = not any(isinstance(token, Variable) for token in tokens)
+        cache[context.text] = Lexed(tokens=tokens, parsed=parsed if static else None)
+    return parsed
@@ -23,9 +23,10 @@ from std2.lex import ParseError as StdLexError
 from std2.lex import split
 from std2.string import removeprefix, removesuffix
 
+from ...shared.lru import LRU
 from ...shared.parse import lower
 from ...shared.types import Context
-from .lexer import context_from, next_char, pushback_chars, raise_err, token_parser
+from .lexer import Lexed, context_from, next_char, pushback_chars, raise_err, tokenize
 from .types import (
     EChar,
     End,
@@ -37,6 +38,7 @@ from .types import (
     TokenStream,
     Transform,
     VarBegin,
+    Variable,
 )
 
 #
@@ -79,6 +81,8 @@ _RE_FLAGS = {
 }
 _REGEX_FLAG_CHARS = {*_RE_FLAGS, "g", "u"}
 
+_CACHE: LRU[str, Lexed] = LRU(size=999)
+
 
 def _lex_escape(context: ParserCtx, *, escapable_chars: AbstractSet[str]) -> str:
     pos, char = next_char(context)
@@ -289,8 +293,7 @@ def _lex_variable_naked(context: ParserCtx) -> TokenStream:
             name_acc.append(char)
         else:
             name = "".join(name_acc)
-            var = _variable_substitution(context, var_name=name)
-            yield var if var is not None else name
+            yield Variable(name=name)
             pushback_chars(context, (pos, char))
             break
 
@@ -539,6 +542,7 @@ def _lex_variable_decorated(context: ParserCtx, var_name: str) -> TokenStream:
     group, trans = _lex_fmt(context)
     flag = _lex_options(context)
 
+    context.eager.append(var_name)
     sub = _variable_substitution(context, var_name=var_name)
     re = _compile(context, origin=pos, regex=regex, flag=flag)
     subst = var_name if sub is None else sub
@@ -571,13 +575,13 @@ def _lex_variable_nested(context: ParserCtx) -> TokenStream:
         elif char == "}":
             # '${' var }'
             name = "".join(name_acc)
-            var = _variable_substitution(context, var_name=name)
-            yield var if var is not None else name
+            yield Variable(name=name)
             break
 
         elif char == ":":
             # '${' var ':' any '}'
             name = "".join(name_acc)
+            context.eager.append(name)
             var = _variable_substitution(context, var_name=name)
             if var is not None:
                 yield var
@@ -685,6 +689,10 @@ def _lex(context: ParserCtx, shallow: bool) -> TokenStream:
 
 def tokenizer(context: Context, info: ParseInfo, snippet: str) -> Parsed:
     ctx = context_from(snippet, context=context, info=info)
-    tokens = _lex(ctx, shallow=False)
-    parsed = token_parser(ctx, stream=tokens)
+    parsed = tokenize(
+        _CACHE,
+        context=ctx,
+        lex=lambda ctx: _lex(ctx, shallow=False),
+        subst=lambda name: _variable_substitution(ctx, var_name=name),
+    )
     return parsed
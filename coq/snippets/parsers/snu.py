@@ -1,8 +1,9 @@
 from string import ascii_letters, ascii_lowercase, digits
 from typing import AbstractSet, MutableSequence, Optional
 
+from ...shared.lru import LRU
 from ...shared.types import Context
-from .lexer import context_from, next_char, pushback_chars, raise_err, token_parser
+from .lexer import Lexed, context_from, next_char, pushback_chars, raise_err, tokenize
 from .types import (
     End,
     IntBegin,
@@ -13,6 +14,7 @@ from .types import (
     TokenStream,
     Unparsed,
     VarBegin,
+    Variable,
 )
 
 """
@@ -36,6 +38,8 @@ _VAR_BEGIN_CHARS = {*ascii_letters, "$"}
 _LANG_BEGIN_CHARS = {*ascii_lowercase}
 _REGEX_FLAG_CHARS = {*ascii_lowercase}
 
+_CACHE: LRU[str, Lexed] = LRU(size=999)
+
 
 def _lex_escape(context: ParserCtx, *, escapable_chars: AbstractSet[str]) -> str:
     pos, char = next_char(context)
@@ -136,11 +140,11 @@ def _lex_variable(context: ParserCtx) -> TokenStream:
     for pos, char in context:
         if char == "}":
             name = "".join(name_acc)
-            var = _variable_substitution(context, name=name)
-            yield var if var is not None else name
+            yield Variable(name=name)
             break
         elif char == ":":
             name = "".join(name_acc)
+            context.eager.append(name)
             var = _variable_substitution(context, name=name)
             if var is not None:
                 yield var
@@ -244,6 +248,10 @@ def _lex(context: ParserCtx, shallow: bool) -> TokenStream:
 
 def tokenizer(context: Context, info: ParseInfo, snippet: str) -> Parsed:
     ctx = context_from(snippet, context=context, info=info)
-    tokens = _lex(ctx, shallow=False)
-    parsed = token_parser(ctx, stream=tokens)
+    parsed = tokenize(
+        _CACHE,
+        context=ctx,
+        lex=lambda ctx: _lex(ctx, shallow=False),
+        subst=lambda name: _variable_substitution(ctx, name=name),
+    )
     return parsed
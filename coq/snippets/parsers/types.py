@@ -35,6 +35,7 @@ class ParserCtx(Iterator):
     info: ParseInfo
     dit: deiter[EChar]
     stack: MutableSequence[Union[int, str]]
+    eager: MutableSequence[str]
 
     def __iter__(self) -> ParserCtx:
         return self
@@ -58,6 +59,15 @@ class VarBegin:
     name: str
 
 
+@dataclass(frozen=True)
+class Variable:
+    """
+    Substituted only when parsed, the tokens before are context independent
+    """
+
+    name: str
+
+
 @dataclass(frozen=True)
 class Transform:
     var_subst: Optional[str]
@@ -69,7 +79,7 @@ class Transform:
 class End: ...
 
 
-Token = Union[Unparsed, IntBegin, Transform, VarBegin, End, str]
+Token = Union[Unparsed, IntBegin, Transform, VarBegin, Variable, End, str]
 TokenStream = Iterator[Token]
 
 
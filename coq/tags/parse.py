@@ -1,16 +1,29 @@
+from asyncio import create_subprocess_exec
+from contextlib import suppress
 from json import loads
 from json.decoder import JSONDecodeError
 from pathlib import Path
-from typing import Iterator, Mapping, MutableMapping, MutableSequence, Tuple
+from subprocess import DEVNULL, PIPE
+from typing import (
+    AsyncGenerator,
+    Iterable,
+    Iterator,
+    MutableMapping,
+    MutableSequence,
+    Sequence,
+    Tuple,
+)
 
 from pynvim_pp.lib import decode
 from pynvim_pp.logging import log
-from std2.asyncio.subprocess import call
 from std2.string import removeprefix, removesuffix
 
 from ..shared.executor import very_nice
 from .types import Tag, Tags
 
+_CHUNK = 2**16
+_BATCH = 2999
+
 _FIELDS = "".join(
     f"{{{f}}}"
     for f in (
@@ -29,25 +42,50 @@ _FIELDS = "".join(
 )
 
 
-async def run(ctags: Path, *args: str) -> str:
-    if not args:
-        return ""
-    else:
+async def run(ctags: Path, *args: str) -> AsyncGenerator[Sequence[str], None]:
+    """
+    Lines of ctags output, in batches of about `_BATCH`
+
+    ctags is blocked on a full pipe, while the consumer is busy with a batch
+    """
+
+    if args:
         prefix = await very_nice()
         try:
-            proc = await call(
+            proc = await create_subprocess_exec(
                 *prefix,
                 ctags,
                 "--sort=no",
                 "--output-format=json",
                 f"--fields={_FIELDS}",
                 *args,
-                check_returncode=set(),
+                stdin=DEVNULL,
+                stdout=PIPE,
+                stderr=DEVNULL,
             )
         except (FileNotFoundError, PermissionError):
-            return ""
+            pass
         else:
-            return decode(proc.stdout)
+            assert proc.stdout
+            try:
+                acc: MutableSequence[str] = []
+                tail = b""
+                while chunk := await proc.stdout.read(_CHUNK):
+                    *lines, tail = (tail + chunk).split(b"\n")
+                    acc.extend(map(decode, lines))
+                    if len(acc) >= _BATCH:
+                        yield acc
+                        acc = []
+                if tail:
+                    acc.append(decode(tail))
+                if acc:
+                    yield acc
+                await proc.wait()
+            finally:
+                if proc.returncode is None:
+                    with suppress(ProcessLookupError):
+                        proc.kill()
+                    await proc.wait()
 
 
 def _unescape(pattern: str) -> str:
@@ -65,10 +103,10 @@ def _unescape(pattern: str) -> str:
     return "".join(cont())
 
 
-def parse(mtimes: Mapping[str, float], raw: str) -> Tags:
-    tags: MutableMapping[str, Tuple[str, float, MutableSequence[Tag]]] = {}
+def parse(lines: Iterable[str]) -> Tags:
+    tags: MutableMapping[str, Tuple[str, MutableSequence[Tag]]] = {}
 
-    for line in raw.splitlines():
+    for line in lines:
         if line:
             try:
                 json = loads(line)
@@ -82,9 +120,7 @@ def parse(mtimes: Mapping[str, float], raw: str) -> Tags:
                     else:
                         new_pattern = None
                     json["pattern"] = new_pattern
-                    _, _, acc = tags.setdefault(
-                        path, (json["language"], mtimes.get(path, 0), [])
-                    )
+                    _, acc = tags.setdefault(path, (json["language"], []))
                     acc.append(json)
 
     return tags
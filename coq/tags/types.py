@@ -19,4 +19,4 @@ class Tag(TypedDict):
     access: Optional[str]
 
 
-Tags = Mapping[str, Tuple[str, float, Sequence[Tag]]]
+Tags = Mapping[str, Tuple[str, Sequence[Tag]]]
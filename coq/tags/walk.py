@@ -0,0 +1,216 @@
+from dataclasses import dataclass
+from fnmatch import translate
+from os import scandir
+from os.path import normcase
+from pathlib import PurePath
+from re import compile, escape
+from typing import (
+    Iterable,
+    Iterator,
+    MutableSequence,
+    Optional,
+    Pattern,
+    Sequence,
+    Tuple,
+)
+
+from pynvim_pp.lib import decode
+from pynvim_pp.logging import log
+from std2.asyncio.subprocess import call
+
+from ..shared.executor import very_nice
+
+_IGNORE = ".gitignore"
+_SKIP = {".git", ".hg", ".svn"}
+
+
+@dataclass(frozen=True)
+class _Rule:
+    base: PurePath
+    anchored: bool
+    negate: bool
+    dir_only: bool
+    regex: Pattern[str]
+
+
+@dataclass(frozen=True)
+class Walked:
+    done: Sequence[str]
+    subdirs: Sequence[str]
+    files: Sequence[str]
+
+
+async def ctags_maps(ctags: PurePath) -> Optional[Pattern[str]]:
+    """
+    File name patterns ctags has a parser for, from `--list-maps`
+    """
+
+    prefix = await very_nice()
+    try:
+        proc = await call(*prefix, ctags, "--list-maps", check_returncode=set())
+    except (FileNotFoundError, PermissionError):
+        return None
+    else:
+
+        def cont() -> Iterator[str]:
+            for line in decode(proc.stdout).splitlines():
+                if not line.startswith("#"):
+                    _, *globs = line.split()
+                    for glob in globs:
+                        if not glob.startswith("("):
+                            yield translate(glob)
+
+        if regexes := tuple(cont()):
+            return compile("|".join(regexes))
+        else:
+            return None
+
+
+def _glob(pattern: str) -> str:
+    """
+    gitignore glob -> regex, `*` & `?` do not cross `/`
+    """
+
+    def cont() -> Iterator[str]:
+        i, n = 0, len(pattern)
+        while i < n:
+            c = pattern[i]
+            if pattern.startswith("**/", i):
+                yield "(?:.*/)?"
+                i += 3
+            elif pattern.startswith("**", i):
+                yield ".*"
+                i += 2
+            elif c == "*":
+                yield "[^/]*"
+                i += 1
+            elif c == "?":
+                yield "[^/]"
+                i += 1
+            elif c == "[" and (end := pattern.find("]", i + 2)) != -1:
+                body = pattern[i + 1 : end]
+                body = "^" + body[1:] if body.startswith("!") else body
+                yield "[" + body.replace("\\", "\\\\") + "]"
+                i = end + 1
+            elif c == "\\" and i + 1 < n:
+                yield escape(pattern[i + 1])
+                i += 2
+            else:
+                yield escape(c)
+                i += 1
+
+    return "".join(cont())
+
+
+def _rules(base: PurePath, lines: Iterable[str]) -> Iterator[_Rule]:
+    for line in lines:
+        line = line.rstrip()
+        if line and not line.startswith("#"):
+            negate = line.startswith("!")
+            line = line[1:] if negate else line
+            line = line[1:] if line.startswith("\\") else line
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            anchored = "/" in line
+            line = line.lstrip("/")
+            if line:
+                yield _Rule(
+                    base=base,
+                    anchored=anchored,
+                    negate=negate,
+                    dir_only=dir_only,
+                    regex=compile(_glob(line) + r"\Z"),
+                )
+
+
+def _load(directory: PurePath) -> Sequence[_Rule]:
+    try:
+        with open(directory / _IGNORE, encoding="utf-8", errors="ignore") as fd:
+            return tuple(_rules(directory, lines=fd))
+    except OSError:
+        return ()
+
+
+def _ignored(rules: Sequence[_Rule], path: PurePath, is_dir: bool) -> bool:
+    """
+    Last matching rule wins, as in `git`
+    """
+
+    hit = False
+    for rule in rules:
+        if rule.dir_only and not is_dir:
+            continue
+        try:
+            rel = path.relative_to(rule.base).as_posix()
+        except ValueError:
+            continue
+        text = rel if rule.anchored else path.name
+        if rule.regex.match(text):
+            hit = not rule.negate
+    return hit
+
+
+def _ancestry(root: PurePath, directory: PurePath) -> Sequence[_Rule]:
+    """
+    Rules in effect for `directory`, ie. after a resume
+    """
+
+    acc: MutableSequence[_Rule] = []
+    acc.extend(_load(root))
+    current = root
+    for part in directory.relative_to(root).parts:
+        current = current / part
+        acc.extend(_load(current))
+    return acc
+
+
+def walk(
+    root: PurePath,
+    dirs: Iterable[str],
+    maps: Pattern[str],
+    budget: int,
+) -> Walked:
+    """
+    One level of each of `dirs`, until about `budget` files are found
+
+    Sub directories are returned instead of descended into, to be persisted
+    """
+
+    done: MutableSequence[str] = []
+    subdirs: MutableSequence[str] = []
+    files: MutableSequence[str] = []
+
+    for dirname in dirs:
+        if len(files) >= budget:
+            break
+        directory = PurePath(dirname)
+        done.append(dirname)
+        try:
+            rules = _ancestry(root, directory=directory)
+        except ValueError:
+            continue
+
+        try:
+            with scandir(directory) as it:
+                entries: Sequence[Tuple[str, bool, bool]] = tuple(
+                    (
+                        entry.name,
+                        entry.is_dir(follow_symlinks=False),
+                        entry.is_file(follow_symlinks=False),
+                    )
+                    for entry in it
+                )
+        except OSError as e:
+            log.warning("%s", e)
+            continue
+
+        for name, is_dir, is_file in entries:
+            path = directory / name
+            if is_dir and name not in _SKIP:
+                if not _ignored(rules, path=path, is_dir=True):
+                    subdirs.append(str(path))
+            elif is_file and maps.match(name):
+                if not _ignored(rules, path=path, is_dir=False):
+                    files.append(normcase(path))
+
+    return Walked(done=tuple(done), subdirs=tuple(subdirs), files=tuple(files))
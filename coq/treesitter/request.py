@@ -9,7 +9,16 @@ from dataclasses import dataclass
 from functools import lru_cache
 from itertools import count
 from string import capwords
-from typing import Generic, Iterable, Iterator, Optional, Sequence, Tuple, TypeVar
+from typing import (
+    Generic,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
 from pynvim_pp.lib import recode
 from pynvim_pp.nvim import Nvim
@@ -19,18 +28,31 @@ from std2.cell import RefCell
 from ..registry import NAMESPACE, rpc
 from ..server.rt_types import Stack
 from ..shared.timeit import timeit
-from .types import Payload, RawPayload, SimplePayload, SimpleRawPayload
+from .types import Node, RawPayload, SimplePayload, SimpleRawPayload
 
+_A = TypeVar("_A")
 _T = TypeVar("_T")
 
 
 @dataclass(frozen=True)
-class _Payload(Generic[_T]):
+class _Payload(Generic[_A, _T]):
+    """
+    `edits` are `(row, old rows, new rows)`, in order, since the harvest acked as `seq`
+
+    `dirty` & `ranges` are stale row ranges, `ranges` are also what `payloads` cover
+
+    `ancestors` are the parents & grandparents of `payloads`, once each, by node key
+    """
+
     buf: int
-    lo: int
-    hi: int
     filetype: str
     filename: str
+    seq: int
+    reset: bool
+    edits: Sequence[Tuple[int, int, int]]
+    dirty: Sequence[Tuple[int, int]]
+    ranges: Sequence[Tuple[int, int]]
+    ancestors: Mapping[str, _A]
     payloads: Iterable[_T]
     elapsed: float
 
@@ -43,8 +65,18 @@ class _Session:
 
 
 _UIDS = count()
-_NIL_P = _Payload[RawPayload](
-    buf=-1, lo=-1, hi=-1, filetype="", filename="", payloads=(), elapsed=-1
+_NIL_P = _Payload[SimpleRawPayload, RawPayload](
+    buf=-1,
+    filetype="",
+    filename="",
+    seq=-1,
+    reset=False,
+    edits=(),
+    dirty=(),
+    ranges=(),
+    ancestors={},
+    payloads=(),
+    elapsed=-1,
 )
 _CELL = RefCell(_Session(uid=-1, done=True, payload=_NIL_P))
 
@@ -60,10 +92,14 @@ async def _ts_notify(
     stack: Stack,
     session: int,
     buf: int,
-    lo: int,
-    hi: int,
     filetype: str,
     filename: str,
+    seq: int,
+    reset: bool,
+    edits: Sequence[Tuple[int, int, int]],
+    dirty: Sequence[Tuple[int, int]],
+    ranges: Sequence[Tuple[int, int]],
+    ancestors: Mapping[str, SimpleRawPayload],
     reply: Sequence[RawPayload],
     elapsed: float,
 ) -> None:
@@ -73,10 +109,14 @@ async def _ts_notify(
         if session >= _CELL.val.uid:
             payload = _Payload(
                 buf=buf,
-                lo=lo,
-                hi=hi,
                 filetype=filetype,
                 filename=filename,
+                seq=seq,
+                reset=reset,
+                edits=edits,
+                dirty=dirty,
+                ranges=ranges,
+                ancestors=ancestors,
                 payloads=reply,
                 elapsed=elapsed,
             )
@@ -101,36 +141,53 @@ def _parse(load: Optional[SimpleRawPayload]) -> Optional[SimplePayload]:
             return SimplePayload(text=text, kind=kind)
 
 
-def _vaildate(r_playload: _Payload[RawPayload]) -> _Payload[Payload]:
-    def cont() -> Iterator[Payload]:
+def _vaildate(
+    r_playload: _Payload[SimpleRawPayload, RawPayload],
+) -> _Payload[SimplePayload, Node]:
+    def ancestors() -> Iterator[Tuple[str, SimplePayload]]:
+        for key, load in r_playload.ancestors.items():
+            if ancestor := _parse(load):
+                yield key, ancestor
+
+    def cont() -> Iterator[Node]:
         for load in r_playload.payloads:
             if payload := _parse(load):
                 range = load.get("range")
                 assert range
-                parent = _parse(load.get("parent"))
-                grandparent = _parse(load.get("grandparent"))
-                yield Payload(
-                    filename="",
+                yield Node(
                     range=range,
+                    col=load.get("col", 0),
                     text=payload.text,
                     kind=payload.kind,
-                    parent=parent,
-                    grandparent=grandparent,
+                    parent=load.get("parent"),
+                    grandparent=load.get("grandparent"),
                 )
 
     payload = _Payload(
         buf=r_playload.buf,
-        lo=r_playload.lo,
-        hi=r_playload.hi,
         filetype=r_playload.filetype,
         filename=r_playload.filename,
+        seq=r_playload.seq,
+        reset=r_playload.reset,
+        edits=r_playload.edits,
+        dirty=r_playload.dirty,
+        ranges=r_playload.ranges,
+        ancestors=dict(ancestors()),
         elapsed=r_playload.elapsed,
         payloads=cont(),
     )
     return payload
 
 
-async def async_request() -> Optional[_Payload[Payload]]:
+async def async_request(
+    acks: Mapping[int, int],
+) -> Optional[_Payload[SimplePayload, Node]]:
+    """
+    `acks` are the `seq` of the last harvest applied, per buffer
+
+    A buffer is harvested from scratch if its last harvest never made it
+    """
+
     _, cond = _cond()
 
     with timeit("TS"):
@@ -140,7 +197,7 @@ async def async_request() -> Optional[_Payload[Payload]]:
         async with cond:
             cond.notify_all()
 
-        await Nvim.api.exec_lua(NoneType, f"{NAMESPACE}.ts_req(...)", (uid,))
+        await Nvim.api.exec_lua(NoneType, f"{NAMESPACE}.ts_req(...)", (uid, acks))
 
         while True:
             session = _CELL.val
@@ -11,8 +11,9 @@ class SimpleRawPayload(TypedDict, total=False):
 
 class RawPayload(SimpleRawPayload, TypedDict, total=False):
     range: Tuple[int, int]
-    parent: SimpleRawPayload
-    grandparent: SimpleRawPayload
+    col: int
+    parent: str
+    grandparent: str
 
 
 @dataclass(frozen=True)
@@ -21,6 +22,20 @@ class SimplePayload:
     text: str
 
 
+@dataclass(frozen=True)
+class Node(SimplePayload):
+    """
+    `parent` & `grandparent` are keys into the same reply's `ancestors`
+
+    Only printable, & unique within that reply
+    """
+
+    range: Tuple[int, int]
+    col: int
+    parent: Optional[str]
+    grandparent: Optional[str]
+
+
 @dataclass(frozen=True)
 class Payload(SimplePayload):
     filename: str
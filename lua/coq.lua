@@ -159,6 +159,9 @@ vim.api.nvim_command [[command! -nargs=* COQstats lua coq.Stats(<f-args>)]]
 set_coq_call("Snips")
 vim.api.nvim_command [[command! -complete=customlist,coq#complete_snips -nargs=* COQsnips lua coq.Snips(<f-args>)]]
 
+set_coq_call("Trace")
+vim.api.nvim_command [[command! -complete=customlist,coq#complete_trace -nargs=* COQtrace lua coq.Trace(<f-args>)]]
+
 set_coq_call("Help")
 vim.api.nvim_command [[command! -complete=customlist,coq#complete_help -nargs=* COQhelp lua coq.Help(<f-args>)]]
 
@@ -1,5 +1,5 @@
 (function(...)
-  COQ.send_comp = function(col, items)
+  COQ.send_comp = function(col, items, refresh)
     vim.schedule(
       function()
         local legal_modes = {
@@ -15,7 +15,10 @@
         }
         local mode = vim.api.nvim_get_mode().mode
         local comp_mode = vim.fn.complete_info({"mode"}).mode
-        if legal_modes[mode] and legal_cmodes[comp_mode] then
+        -- late results should not yank the selection from under the user
+        local selected =
+          refresh and vim.fn.complete_info({"selected"}).selected ~= -1
+        if legal_modes[mode] and legal_cmodes[comp_mode] and not selected then
           -- when `#items ~= 0` there is something to show
           -- when `#items == 0` but `comp_mode == "eval"` there is something to close
           if #items ~= 0 or comp_mode == "eval" then
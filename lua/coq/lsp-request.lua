@@ -34,18 +34,80 @@
   local cid = -1
   local acc = {}
 
-  COQ.lsp_pull = function(client, uid, lo, hi)
+  -- see -- coq/lsp/types.py :: CompletionColumns
+  local columns = {
+    "label",
+    "labelDetails",
+    "kind",
+    "detail",
+    "documentation",
+    "preselect",
+    "filterText",
+    "insertText",
+    "insertTextFormat",
+    "insertTextMode",
+    "textEdit",
+    "additionalTextEdits",
+    "command"
+  }
+  local is_column = {}
+  for _, key in ipairs(columns) do
+    is_column[key] = true
+  end
+
+  local pivot = function(items, lo, hi)
+    local cols = {rest = {}}
+    for _, key in ipairs(columns) do
+      cols[key] = {}
+    end
+
+    local n = 0
+    for i = lo, hi do
+      local item = items[i]
+      if item == nil then
+        break
+      end
+
+      n = n + 1
+      local rest = {}
+      if type(item) == "table" then
+        for key, val in pairs(item) do
+          if is_column[key] then
+            cols[key][n] = val
+          else
+            rest[key] = val
+          end
+        end
+      end
+      for _, key in ipairs(columns) do
+        if cols[key][n] == nil then
+          cols[key][n] = vim.NIL
+        end
+      end
+      cols.rest[n] = next(rest) and rest or vim.NIL
+    end
+
+    cols.n = n
+    return cols
+  end
+
+  COQ.lsp_pull = function(client, uid, lo, hi, columnar)
     vim.validate {
       uid = {uid, "number"},
       lo = {lo, "number"},
-      hi = {hi, "number"}
+      hi = {hi, "number"},
+      columnar = {columnar, "boolean"}
     }
 
     if uid > cid then
-      return {}
+      return columnar and pivot({}, lo, hi) or {}
     end
 
     local items = acc[client] or {}
+    if columnar then
+      return pivot(items, lo, hi)
+    end
+
     local a = {}
     for i = lo, hi do
       local item = items[i]
@@ -59,7 +121,105 @@
     return a
   end
 
-  local lsp_notify = function(payload)
+  -- see -- coq/shared/fuzzy.py :: multi_set_ratio
+  -- bytewise, only ever used to order items, never to drop them
+  local multi_set_ratio = (function()
+    local r_counts = {}
+    return function(lhs, l_counts, rhs, look_ahead)
+      local shorter = math.min(#lhs, #rhs)
+      if shorter == 0 then
+        return 1
+      end
+
+      local r_len = math.min(#rhs, shorter + look_ahead)
+      local longer = math.max(#lhs, r_len)
+      for i = 1, r_len do
+        local b = string.byte(rhs, i)
+        r_counts[b] = (r_counts[b] or 0) + 1
+      end
+
+      local dif = 0
+      if #lhs > r_len then
+        for b, n in pairs(l_counts) do
+          dif = dif + math.max(0, n - (r_counts[b] or 0))
+        end
+      else
+        for b, n in pairs(r_counts) do
+          dif = dif + math.max(0, n - (l_counts[b] or 0))
+        end
+      end
+      for b in pairs(r_counts) do
+        r_counts[b] = nil
+      end
+
+      return (longer - dif) / shorter
+    end
+  end)()
+
+  -- stable partition, items likely to survive `_use_comp` come first
+  local pre_filter = function(spec, items)
+    if type(spec) ~= "table" then
+      return items
+    end
+    local look_ahead, cutoff = spec.look_ahead, spec.cutoff
+    vim.validate {
+      look_ahead = {look_ahead, "number"},
+      cutoff = {cutoff, "number"}
+    }
+
+    local cwords = {}
+    for _, cword in ipairs({spec.words, spec.syms}) do
+      vim.validate {cword = {cword, "string"}}
+      if #cword <= 0 then
+        return items
+      end
+      local counts = {}
+      for i = 1, #cword do
+        local b = string.byte(cword, i)
+        counts[b] = (counts[b] or 0) + 1
+      end
+      table.insert(cwords, {cword, counts})
+    end
+
+    local text_of = function(item)
+      if type(item) ~= "table" then
+        return ""
+      end
+      local edit = type(item.textEdit) == "table" and item.textEdit or {}
+      for _, text in ipairs(
+        {item.filterText, edit.newText, edit.new_text, item.insertText, item.label}
+      ) do
+        if type(text) == "string" and #text > 0 then
+          return string.lower(text)
+        end
+      end
+      return ""
+    end
+
+    local head, tail = {}, {}
+    for _, item in ipairs(items) do
+      local text = text_of(item)
+      local keep = false
+      for _, spec_cword in ipairs(cwords) do
+        local cword, counts = unpack(spec_cword)
+        if
+          #text + look_ahead >= #cword and
+            multi_set_ratio(cword, counts, text, look_ahead) >= cutoff
+         then
+          keep = true
+          break
+        end
+      end
+      table.insert(keep and head or tail, item)
+    end
+
+    for _, item in ipairs(tail) do
+      table.insert(head, item)
+    end
+    return head
+  end
+
+  local lsp_notify = function(payload, spec)
     vim.validate {payload = {payload, "table"}}
     local client = payload.client
     local multipart = tonumber(payload.multipart)
@@ -78,10 +238,10 @@
       end
       if type(reply) == "table" then
         if type(reply.items) == "table" then
-          acc[client] = reply.items
+          acc[client] = pre_filter(spec, reply.items)
           reply.items = {}
         else
-          acc[client] = reply
+          acc[client] = pre_filter(spec, reply)
           payload.reply = {}
         end
       end
@@ -91,11 +251,20 @@
     COQ.Lsp_notify(payload)
   end
 
-  local req =
+  local req, cancel =
     (function()
     local current_sessions = {}
     local cancels = {}
-    return function(name, multipart, session_id, clients, callback)
+
+    local cancel = function(name)
+      pcall(
+        cancels[name] or function()
+          end
+      )
+      cancels[name] = nil
+    end
+
+    local req = function(name, multipart, session_id, clients, callback, spec)
       vim.validate {clients = {clients, "table"}}
       local n_clients, client_map = unpack(clients)
       vim.validate {
@@ -106,11 +275,7 @@
         callback = {callback, "function"}
       }
       current_sessions[name] = session_id
-
-      pcall(
-        cancels[name] or function()
-          end
-      )
+      cancel(name)
 
       local new_payload = function()
         return {
@@ -146,7 +311,7 @@
           payload.reply = resp or vim.NIL
         end
 
-        lsp_notify(payload)
+        lsp_notify(payload, spec)
       end
 
       local on_resp_new = function(err, resp, ctx)
@@ -167,8 +332,15 @@
         cancels[name] = callback(on_resp)
       end
     end
+
+    return req, cancel
   end)()
 
+  COQ.lsp_cancel = function(name)
+    vim.validate {name = {name, "string"}}
+    cancel(name)
+  end
+
   local get_clients = (function()
     if vim.lsp.get_clients then
       return function(bufnr)
@@ -260,7 +432,8 @@
       multipart,
       session_id,
       client_names,
-      pos)
+      pos,
+      spec)
       vim.validate {
         lsp_method = {lsp_method, "string"},
         client_names = {client_names, "table"},
@@ -311,18 +484,26 @@
         {n_clients, clients},
         function(on_resp)
           return lsp_request_all(clients, buf, lsp_method, make_params, on_resp)
-        end
+        end,
+        spec
       )
     end
 
-    COQ.lsp_comp = function(name, multipart, session_id, client_names, pos)
+    COQ.lsp_comp = function(
+      name,
+      multipart,
+      session_id,
+      client_names,
+      pos,
+      spec)
       lsp_comp_base(
         "textDocument/completion",
         name,
         multipart,
         session_id,
         client_names,
-        pos
+        pos,
+        spec
       )
     end
 
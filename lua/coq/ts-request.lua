@@ -17,27 +17,38 @@
     end
   end
 
-  local payload = function(buf, node, type)
+  -- `node:id()` is a non-printable pointer, only unique within its own tree
+  local node_key = function(node)
+    local lo, lo_col, hi, hi_col = node:range()
+    return table.concat({lo, lo_col, hi, hi_col, node:type()}, ":")
+  end
+
+  -- parents & grandparents are shared by many nodes, their texts are sent once per key
+  local intern = function(buf, node, ancestors)
+    if node then
+      local id = node_key(node)
+      if not ancestors[id] then
+        ancestors[id] = {
+          text = vim.treesitter.get_node_text(node, buf),
+          kind = kind(node)
+        }
+      end
+      return id
+    end
+  end
+
+  local payload = function(buf, node, type, ancestors)
     if not node:missing() and not node:has_error() then
       local parent = node:parent()
       local grandparent = parent and parent:parent() or nil
-      local lo, _, hi, _ = node:range()
+      local lo, col, hi, _ = node:range()
       return {
         text = vim.treesitter.get_node_text(node, buf),
         range = {lo, hi},
+        col = col,
         kind = type,
-        parent = parent and
-          {
-            text = vim.treesitter.get_node_text(parent, buf),
-            kind = kind(parent)
-          } or
-          nil,
-        grandparent = grandparent and
-          {
-            text = vim.treesitter.get_node_text(grandparent, buf),
-            kind = kind(grandparent)
-          } or
-          nil
+        parent = intern(buf, parent, ancestors),
+        grandparent = intern(buf, grandparent, ancestors)
       }
     end
   end
@@ -47,16 +58,138 @@
     (vim.treesitter.query.get or vim.treesitter.query.get_query) or
     vim.treesitter.get_query
 
-  local iter_nodes = function(buf, lo, hi)
+  -- half open row ranges, sorted & disjoint
+  local merge = function(ranges)
+    table.sort(
+      ranges,
+      function(a, b)
+        return a[1] < b[1]
+      end
+    )
+    local acc = {}
+    for _, range in ipairs(ranges) do
+      local last = acc[#acc]
+      if last and range[1] <= last[2] then
+        last[2] = math.max(last[2], range[2])
+      elseif range[1] < range[2] then
+        table.insert(acc, {range[1], range[2]})
+      end
+    end
+    return acc
+  end
+
+  local subtract = function(ranges, cuts)
+    local acc = ranges
+    for _, cut in ipairs(cuts) do
+      local c_lo, c_hi = unpack(cut)
+      local remain = {}
+      for _, range in ipairs(acc) do
+        local lo, hi = unpack(range)
+        if c_hi <= lo or c_lo >= hi then
+          table.insert(remain, range)
+        else
+          if lo < c_lo then
+            table.insert(remain, {lo, c_lo})
+          end
+          if c_hi < hi then
+            table.insert(remain, {c_hi, hi})
+          end
+        end
+      end
+      acc = remain
+    end
+    return acc
+  end
+
+  -- rows `[row, row + old]` became `[row, row + new]`, overlapping ranges cover the whole edit
+  local shift = function(ranges, row, old, new)
+    local acc = {}
+    local delta = new - old
+    for _, range in ipairs(ranges) do
+      local lo, hi = unpack(range)
+      if lo > row + old then
+        table.insert(acc, {lo + delta, hi + delta})
+      elseif hi > row then
+        table.insert(acc, {math.min(lo, row), math.max(hi + delta, row + new + 1)})
+      else
+        table.insert(acc, range)
+      end
+    end
+    return acc
+  end
+
+  -- per buffer: rows already harvested, & what changed since
+  local states = {}
+  local registered = setmetatable({}, {__mode = "k"})
+  local seqs = 0
+
+  local track = function(buf, parser, acked)
+    local state = states[buf]
+    if state and state.parser == parser and state.seq == acked then
+      return state
+    else
+      state = {
+        parser = parser,
+        seq = -1,
+        reset = true,
+        edits = {},
+        dirty = {},
+        done = {}
+      }
+      states[buf] = state
+
+      if not registered[parser] then
+        registered[parser] = true
+        parser:register_cbs(
+          {
+            on_bytes = function(_, _, row, _, _, old, _, _, new)
+              local s = states[buf]
+              if s and s.parser == parser then
+                local last = s.edits[#s.edits]
+                if
+                  not (old == 0 and new == 0 and last and last[1] == row and
+                    last[2] == 0 and
+                    last[3] == 0)
+                 then
+                  table.insert(s.edits, {row, old, new})
+                end
+                s.dirty = shift(s.dirty, row, old, new)
+                s.done = shift(s.done, row, old, new)
+                table.insert(s.dirty, {row, row + new + 1})
+              end
+            end,
+            on_changedtree = function(changes)
+              local s = states[buf]
+              if s and s.parser == parser then
+                for _, change in ipairs(changes) do
+                  local hi = #change == 6 and change[4] or change[3]
+                  table.insert(s.dirty, {change[1], hi + 1})
+                end
+              end
+            end,
+            on_detach = function()
+              if states[buf] and states[buf].parser == parser then
+                states[buf] = nil
+              end
+            end
+          }
+        )
+      end
+      return state
+    end
+  end
+
+  local iter_nodes = function(buf, parser, ranges, ancestors)
     return coroutine.wrap(
       function()
-        local go, parser = pcall(vim.treesitter.get_parser)
-        if go and parser then
-          local query = ts_query(parser:lang(), "highlights")
-          if query then
-            for _, tree in pairs(parser:parse()) do
+        local query = ts_query(parser:lang(), "highlights")
+        if query then
+          for _, tree in pairs(parser:parse()) do
+            for _, range in ipairs(ranges) do
+              local lo, hi = unpack(range)
               for capture, node in query:iter_captures(tree:root(), buf, lo, hi) do
-                local pl = payload(buf, node, query.captures[capture])
+                local pl =
+                  payload(buf, node, query.captures[capture], ancestors)
                 if pl and pl.kind ~= "comment" then
                   coroutine.yield(pl)
                 end
@@ -68,7 +201,7 @@
     )
   end
 
-  COQ.ts_req = function(session)
+  COQ.ts_req = function(session, acks)
     vim.schedule(
       function()
         local t1 = vim.loop.now()
@@ -86,20 +219,47 @@
           math.min(lines, row + height + 1)
 
         local acc = {}
-        for payload in iter_nodes(buf, lo, hi) do
-          table.insert(acc, payload)
+        local ancestors = vim.empty_dict()
+        local state = {reset = true, edits = {}, dirty = {}}
+        local todo = {}
+        seqs = seqs + 1
+
+        local go, parser = pcall(vim.treesitter.get_parser, buf)
+        if go and parser then
+          state = track(buf, parser, acks[buf])
+          -- fires `on_changedtree`
+          parser:parse()
+          local dirty = merge(state.dirty)
+          local done = subtract(merge(state.done), dirty)
+          todo = subtract({{lo, hi}}, done)
+
+          for payload in iter_nodes(buf, parser, todo, ancestors) do
+            table.insert(acc, payload)
+          end
+
+          table.insert(done, {lo, hi})
+          state.done = merge(done)
+          state.seq = seqs
         end
+
         local t2 = vim.loop.now()
         COQ.Ts_notify(
           session,
           buf,
-          lo,
-          hi,
           filetype,
           filename,
+          seqs,
+          state.reset,
+          state.edits,
+          merge(state.dirty),
+          todo,
+          ancestors,
           acc,
           (t2 - t1) / 1000
         )
+        state.reset = false
+        state.edits = {}
+        state.dirty = {}
       end
     )
   end
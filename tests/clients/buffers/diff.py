@@ -0,0 +1,25 @@
+from unittest import TestCase
+
+from ....coq.clients.buffers.db.diff import trim
+
+
+class Trim(TestCase):
+    def test_1(self) -> None:
+        prefix, suffix = trim((b"a", b"b", b"c"), (b"a", b"b", b"c"))
+        self.assertEqual((prefix, suffix), (3, 0))
+
+    def test_2(self) -> None:
+        prefix, suffix = trim((b"a", b"b", b"c"), (b"a", b"x", b"c"))
+        self.assertEqual((prefix, suffix), (1, 1))
+
+    def test_3(self) -> None:
+        prefix, suffix = trim((b"a", b"c"), (b"a", b"b", b"c"))
+        self.assertEqual((prefix, suffix), (1, 1))
+
+    def test_4(self) -> None:
+        prefix, suffix = trim((b"a", b"a"), (b"a", b"a", b"a"))
+        self.assertEqual((prefix, suffix), (2, 0))
+
+    def test_5(self) -> None:
+        prefix, suffix = trim((None, b"b"), (b"b",))
+        self.assertEqual((prefix, suffix), (0, 1))
@@ -0,0 +1,65 @@
+from dataclasses import replace
+from typing import AbstractSet, Optional
+from unittest import TestCase
+
+from ....coq.clients.buffers.db.index import Index
+from ....coq.shared.settings import EMPTY_MATCH
+
+_OPTS = replace(
+    EMPTY_MATCH,
+    max_results=33,
+    look_ahead=2,
+    exact_matches=2,
+    fuzzy_cutoff=0.6,
+)
+
+
+def _index() -> Index:
+    return Index(999, unifying_chars={"_"}, include_syms=False)
+
+
+def _words(index: Index, word: str, filetype: Optional[str] = None) -> AbstractSet[str]:
+    words = index.select(_OPTS, filetype=filetype, word=word, sym="", limitless=True)
+    return {text for text, *_ in words}
+
+
+class BufIndex(TestCase):
+    def test_1(self) -> None:
+        index = _index()
+        index.set_lines(1, "py", "a.py", lo=0, hi=0, lines=("abc abd", "xyz"))
+        self.assertEqual(_words(index, "ab"), {"abc", "abd"})
+        self.assertEqual(_words(index, "AB"), {"abc", "abd"})
+
+    def test_2(self) -> None:
+        index = _index()
+        index.set_lines(1, "py", "a.py", lo=0, hi=0, lines=("abc", "abd"))
+        index.set_lines(1, "py", "a.py", lo=0, hi=1, lines=())
+        self.assertEqual(_words(index, "ab"), {"abd"})
+
+        [(_, _, _, line_num)] = index.select(
+            _OPTS, filetype=None, word="ab", sym="", limitless=True
+        )
+        self.assertEqual(line_num, 0)
+
+    def test_3(self) -> None:
+        index = _index()
+        index.set_lines(1, "py", "a.py", lo=0, hi=0, lines=("abc",))
+        index.set_lines(2, "lua", "b.lua", lo=0, hi=0, lines=("abc abd",))
+        self.assertEqual(_words(index, "ab", filetype="py"), {"abc"})
+
+        index.vacuum({1: 1})
+        self.assertEqual(_words(index, "ab"), {"abc"})
+
+        index.vacuum({1: 0})
+        self.assertEqual(_words(index, "ab"), set())
+
+    def test_4(self) -> None:
+        index = _index()
+        index.set_lines(1, "py", "a.py", lo=5, hi=6, lines=("", "abc"))
+        index.set_lines(1, "py", "a.py", lo=0, hi=0, lines=("", ""))
+
+        [(_, _, _, line_num)] = index.select(
+            _OPTS, filetype=None, word="ab", sym="", limitless=True
+        )
+        self.assertEqual(line_num, 8)
+        self.assertEqual(_words(index, "abc"), set())
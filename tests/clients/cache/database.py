@@ -0,0 +1,63 @@
+from dataclasses import replace
+from random import choice, randint
+from typing import AbstractSet, Tuple
+from unittest import TestCase
+from uuid import uuid4
+
+from ....coq.clients.cache.db.database import Database
+from ....coq.shared.settings import EMPTY_MATCH
+
+_OPTS = replace(
+    EMPTY_MATCH,
+    max_results=33,
+    look_ahead=2,
+    exact_matches=2,
+    fuzzy_cutoff=0.6,
+)
+
+
+def _words(n: int) -> Tuple[Tuple[bytes, str], ...]:
+    return tuple(
+        (uuid4().bytes, "".join(choice("abcAB_") for _ in range(randint(1, 6))))
+        for _ in range(n)
+    )
+
+
+def _select(db: Database, word: str) -> AbstractSet[Tuple[bytes, str]]:
+    return {*db.select(False, opts=_OPTS, word=word, sym=word, limitless=True)}
+
+
+class Narrowing(TestCase):
+    def test_1(self) -> None:
+        db = Database()
+        db.insert(((b"1", "abc"), (b"2", "abd"), (b"3", "xyz")))
+        self.assertEqual({w for _, w in _select(db, "ab")}, {"abc", "abd"})
+        self.assertEqual({w for _, w in _select(db, "abc")}, {"abc", "abd"})
+        self.assertEqual({w for _, w in _select(db, "x")}, {"xyz"})
+
+    def test_2(self) -> None:
+        db = Database()
+        rows = _words(999)
+        db.insert(rows[:500])
+        typed = ""
+        for _ in range(99):
+            if typed and randint(0, 2) == 0:
+                typed = typed[:-1]
+            else:
+                typed += choice("abcAB_")
+            if randint(0, 9) == 0:
+                db.insert(_words(9))
+
+            fresh = Database()
+            fresh.insert(db._conn.execute("SELECT key, word FROM words").fetchall())
+            self.assertEqual(_select(db, typed), _select(fresh, typed))
+
+    def test_3(self) -> None:
+        db = Database()
+        db.insert(_words(99))
+        _select(db, "ab")
+        _select(db, "")
+        self.assertEqual(
+            {*db.select(True, opts=_OPTS, word="", sym="", limitless=True)}, set()
+        )
+        self.assertEqual(_select(db, "ab"), set())
@@ -0,0 +1,110 @@
+from dataclasses import replace
+from pathlib import Path, PurePath
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from uuid import UUID, uuid4
+
+from ....coq.clients.snippet.db.database import SDB, build
+from ....coq.shared.settings import EMPTY_MATCH
+from ....coq.shared.types import SnippetGrammar
+from ....coq.snippets.types import LoadedSnips, ParsedSnippet
+
+_OPTS = replace(EMPTY_MATCH, max_results=33, exact_matches=2)
+
+
+def _loaded(filetype: str, *words: str, **exts: str) -> LoadedSnips:
+    snippets = {
+        uuid4(): ParsedSnippet(
+            grammar=SnippetGrammar.lsp,
+            filetype=filetype,
+            content=f"{word}($0)",
+            label=word,
+            doc="",
+            matches=frozenset((word,)),
+        )
+        for word in words
+    }
+    return LoadedSnips(
+        exts={src: frozenset((dest,)) for src, dest in exts.items()},
+        snippets=snippets,
+    )
+
+
+def _words(db: SDB, filetype: str, word: str) -> frozenset:
+    rows = db.select(_OPTS, filetype=filetype, word=word, sym="", limitless=True)
+    return frozenset(row["word"] for row in rows)
+
+
+class Attached(TestCase):
+    def test_1(self) -> None:
+        with TemporaryDirectory() as tmp:
+            bundled = Path(tmp) / "bundled.sqlite3"
+            build(
+                bundled,
+                path=bundled,
+                loaded=_loaded("javascript", "forEach", "forOf"),
+            )
+
+            db = SDB(Path(tmp))
+            db.populate(
+                PurePath("user"),
+                mtime=1,
+                loaded=_loaded("typescript", "forAwait", typescript="javascript"),
+            )
+            self.assertEqual(_words(db, "typescript", "for"), {"forAwait"})
+
+            db.attach(bundled)
+            db.attach(bundled)
+            self.assertEqual(
+                _words(db, "typescript", "for"), {"forAwait", "forEach", "forOf"}
+            )
+            self.assertEqual(_words(db, "javascript", "for"), {"forEach", "forOf"})
+            self.assertEqual(db.mtimes().keys(), {PurePath("user")})
+
+            db.attach(None)
+            self.assertEqual(_words(db, "typescript", "for"), {"forAwait"})
+
+    def test_2(self) -> None:
+        with TemporaryDirectory() as tmp:
+            bundled = Path(tmp) / "bundled.sqlite3"
+            build(
+                bundled,
+                path=bundled,
+                loaded=_loaded("javascript", *(f"for{i}" for i in range(9))),
+            )
+
+            db = SDB(Path(tmp))
+            db.populate(
+                PurePath("user"),
+                mtime=1,
+                loaded=_loaded("javascript", *(f"forA{i}" for i in range(9))),
+            )
+            db.attach(bundled)
+
+            opts = replace(_OPTS, max_results=5)
+            rows = db.select(
+                opts, filetype="javascript", word="for", sym="", limitless=False
+            )
+            self.assertEqual(len(tuple(rows)), 5)
+
+
+class Build(TestCase):
+    def test_1(self) -> None:
+        loaded = _loaded("c", "for", "while")
+        loaded = replace(
+            loaded,
+            snippets={
+                UUID(int=idx): snip for idx, snip in enumerate(loaded.snippets.values())
+            },
+        )
+
+        with TemporaryDirectory() as tmp:
+            arts = []
+            for run in ("a", "b"):
+                (Path(tmp) / run).mkdir()
+                art = Path(tmp) / run / "bundled.sqlite3"
+                build(art, path=PurePath(art.name), loaded=loaded)
+                arts.append(art.read_bytes())
+
+            lhs, rhs = arts
+            self.assertEqual(lhs, rhs)
@@ -0,0 +1,60 @@
+from dataclasses import replace
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import AbstractSet
+from unittest import TestCase
+
+from ....coq.clients.tags.db.database import CTDB
+from ....coq.shared.settings import EMPTY_MATCH
+from ....coq.tags.types import Tag
+
+_OPTS = replace(EMPTY_MATCH, max_results=33, exact_matches=2)
+
+
+def _tag(path: str, name: str) -> Tag:
+    return Tag(
+        language="Python",
+        path=path,
+        line=1,
+        kind="function",
+        name=name,
+        pattern=None,
+        typeref=None,
+        scope=None,
+        scopeKind=None,
+        access=None,
+    )
+
+
+def _names(db: CTDB, word: str) -> AbstractSet[str]:
+    tags = db.select(
+        _OPTS, filename="a.py", line_num=0, word=word, sym=word, limitless=True
+    )
+    return {tag["name"] for tag in tags}
+
+
+class Streaming(TestCase):
+    def test_1(self) -> None:
+        with TemporaryDirectory() as tmp:
+            db = CTDB(Path(tmp), cwd=Path(tmp))
+            db.insert({"a.py": ("Python", (_tag("a.py", "alpha"),))}, seen=set())
+            self.assertEqual(_names(db, "al"), {"alpha"})
+            self.assertEqual(db.paths(), {"a.py": (0, "")})
+
+            db.insert({"a.py": ("Python", (_tag("a.py", "alpine"),))}, seen={"a.py"})
+            self.assertEqual(_names(db, "alp"), {"alpha", "alpine"})
+
+            db.stamp({"a.py": (1, "x")})
+            self.assertEqual(db.paths(), {"a.py": (1, "x")})
+
+    def test_2(self) -> None:
+        with TemporaryDirectory() as tmp:
+            db = CTDB(Path(tmp), cwd=Path(tmp))
+            db.insert({"a.py": ("Python", (_tag("a.py", "alpha"),))}, seen=set())
+            db.stamp({"a.py": (1, "x")})
+
+            db.insert({"a.py": ("Python", (_tag("a.py", "alpine"),))}, seen=set())
+            self.assertEqual(_names(db, "alp"), {"alpine"})
+
+            db.reconciliate({"a.py"})
+            self.assertEqual(db.paths(), {})
@@ -0,0 +1,16 @@
+from unittest import TestCase
+
+from ....coq.clients.tags.worker import _SHARD, _shards
+
+
+class Shards(TestCase):
+    def test_1(self) -> None:
+        paths = {f"{i:04}" for i in range(_SHARD * 3)}
+        priority = {"0197", "0150"}
+        shards = tuple(
+            _shards(paths, priority=lambda path: 0 if path in priority else 1)
+        )
+        self.assertEqual(shards[0][:2], ("0150", "0197"))
+        self.assertEqual(sum(map(len, shards)), len(paths))
+        self.assertEqual({p for shard in shards for p in shard}, paths)
+        self.assertTrue(all(len(shard) <= _SHARD for shard in shards))
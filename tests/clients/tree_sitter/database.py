@@ -0,0 +1,208 @@
+from dataclasses import replace
+from typing import Optional
+from unittest import TestCase
+
+from ....coq.clients.tree_sitter.db.database import TDB
+from ....coq.shared.settings import EMPTY_MATCH
+from ....coq.shared.types import UTF8
+from ....coq.treesitter.types import Node, Payload, SimplePayload
+
+_OPTS = replace(EMPTY_MATCH, max_results=33, exact_matches=2)
+
+
+def _node(text: str, row: int, parent: Optional[str] = None, col: int = 0) -> Node:
+    node = Node(
+        range=(row, row),
+        col=col,
+        text=text,
+        kind="Variable",
+        parent=parent,
+        grandparent=None,
+    )
+    return node
+
+
+def _doc(db: TDB, word: str) -> Optional[Payload]:
+    for buf, word_id, _ in db.select(
+        _OPTS, filetype="py", word=word, sym=word, limitless=True
+    ):
+        return db.doc(buf, word_id=word_id)
+    return None
+
+
+def _row(db: TDB, word: str) -> Optional[int]:
+    if payload := _doc(db, word=word):
+        lo, _ = payload.range
+        return lo - 1
+    else:
+        return None
+
+
+class Incremental(TestCase):
+    def test_1(self) -> None:
+        db = TDB()
+        nodes = (_node("alpha", 0), _node("bravo", 5), _node("charlie", 10))
+        db.populate(
+            1,
+            filetype="py",
+            filename="",
+            reset=True,
+            edits=(),
+            stale=(),
+            ancestors={},
+            nodes=nodes,
+        )
+        self.assertEqual(_row(db, "al"), 0)
+
+        # 2 new lines at row 3
+        db.populate(
+            1,
+            filetype="py",
+            filename="",
+            reset=False,
+            edits=((3, 0, 2),),
+            stale=(),
+            ancestors={},
+            nodes=(),
+        )
+        self.assertEqual(_row(db, "al"), 0)
+        self.assertEqual(_row(db, "br"), 7)
+        self.assertEqual(_row(db, "ch"), 12)
+
+        # rows 6 to 9 deleted
+        db.populate(
+            1,
+            filetype="py",
+            filename="",
+            reset=False,
+            edits=((6, 3, 0),),
+            stale=(),
+            ancestors={},
+            nodes=(),
+        )
+        self.assertIsNone(_row(db, "br"))
+        self.assertEqual(_row(db, "ch"), 9)
+
+        # re-harvested
+        db.populate(
+            1,
+            filetype="py",
+            filename="",
+            reset=False,
+            edits=(),
+            stale=((0, 1),),
+            ancestors={},
+            nodes=(_node("delta", 0),),
+        )
+        self.assertIsNone(_row(db, "al"))
+        self.assertEqual(_row(db, "de"), 0)
+        self.assertEqual(_row(db, "ch"), 9)
+
+
+class Interned(TestCase):
+    def test_1(self) -> None:
+        db = TDB()
+        block = SimplePayload(text="def f():\n  alpha = bravo", kind="Block")
+        nodes = (_node("alpha", 1, parent="p"), _node("bravo", 1, parent="p"))
+        db.populate(
+            1,
+            filetype="py",
+            filename="a.py",
+            reset=True,
+            edits=(),
+            stale=(),
+            ancestors={"p": block},
+            nodes=nodes,
+        )
+        for word in ("al", "br"):
+            payload = _doc(db, word=word)
+            assert payload
+            self.assertEqual(payload.filename, "a.py")
+            self.assertEqual(payload.parent, block)
+            self.assertIsNone(payload.grandparent)
+
+        # orphaned parents are dropped
+        db.populate(
+            1,
+            filetype="py",
+            filename="a.py",
+            reset=False,
+            edits=(),
+            stale=((0, 9),),
+            ancestors={},
+            nodes=(_node("charlie", 1),),
+        )
+        db.vacuum({1: 9})
+        payload = _doc(db, word="ch")
+        assert payload
+        self.assertIsNone(payload.parent)
+        self.assertIsNone(_doc(db, word="al"))
+
+    def test_2(self) -> None:
+        db = TDB()
+        # ie. `TSNode:id()`, raw pointer bytes
+        key = b"\x90\xa3\xff\x01\x00\x00\x00\x00".decode(UTF8, "surrogateescape")
+        block = SimplePayload(text="alpha = 1", kind="Block")
+        populated = db.populate(
+            1,
+            filetype="py",
+            filename="a.py",
+            reset=True,
+            edits=(),
+            stale=(),
+            ancestors={key: block},
+            nodes=(_node("alpha", 1, parent=key),),
+        )
+        self.assertTrue(populated)
+        payload = _doc(db, word="al")
+        assert payload
+        self.assertEqual(payload.parent, block)
+
+
+class Atomic(TestCase):
+    def test_1(self) -> None:
+        db = TDB()
+        for text, populated in (("alpha", True), ("\udc90bravo", False)):
+            self.assertEqual(
+                db.populate(
+                    1,
+                    filetype="py",
+                    filename="",
+                    reset=True,
+                    edits=(),
+                    stale=(),
+                    ancestors={},
+                    nodes=(_node(text, 0),),
+                ),
+                populated,
+            )
+        self.assertEqual(_row(db, "al"), 0)
+
+    def test_2(self) -> None:
+        db = TDB()
+        nodes = (_node("self", 3, col=4), _node("self", 4, col=4))
+        for _ in range(2):
+            db.populate(
+                1,
+                filetype="py",
+                filename="",
+                reset=False,
+                edits=(),
+                stale=(),
+                ancestors={},
+                nodes=nodes,
+            )
+        # the same word & column on consecutive rows, shifted together
+        self.assertTrue(
+            db.populate(
+                1,
+                filetype="py",
+                filename="",
+                reset=False,
+                edits=((0, 0, 1),),
+                stale=((4, 5),),
+                ancestors={},
+                nodes=(),
+            )
+        )
+        self.assertEqual(_row(db, "se"), 5)
@@ -0,0 +1,114 @@
+from dataclasses import asdict
+from typing import Any, Mapping, MutableMapping, Sequence
+from unittest import TestCase
+
+from ...coq.lsp.parse import parse
+from ...coq.lsp.protocol import LSProtocol
+from ...coq.lsp.types import CompletionColumns
+from ...coq.shared.types import UTF16, Completion, ExternLSP
+
+_PROTOCOL = LSProtocol(
+    CompletionItemKind={1: "Text", 3: "Function"},
+    InsertTextFormat={1: "PlainText", 2: "Snippet"},
+)
+
+_KEYS = (
+    "label",
+    "labelDetails",
+    "kind",
+    "detail",
+    "documentation",
+    "preselect",
+    "filterText",
+    "insertText",
+    "insertTextFormat",
+    "insertTextMode",
+    "textEdit",
+    "additionalTextEdits",
+    "command",
+)
+
+_RANGE = {
+    "start": {"line": 0, "character": 1},
+    "end": {"line": 0, "character": 3},
+}
+
+_ITEMS: Sequence[Mapping[str, Any]] = (
+    {"label": "a"},
+    {"label": "b", "kind": 3, "labelDetails": {"detail": "()"}, "data": 1},
+    {"label": "c", "insertText": "c($1)", "insertTextFormat": 2},
+    {"label": "d", "textEdit": {"newText": "dd", "range": _RANGE}},
+    {
+        "label": "e",
+        "filterText": "ee",
+        "textEdit": {"newText": "e", "insert": _RANGE, "replace": _RANGE},
+        "additionalTextEdits": [{"newText": "x", "range": _RANGE}],
+    },
+    {"label": "f", "documentation": {"kind": "markdown", "value": "# f"}},
+    {"label": "g", "detail": "g", "preselect": True, "sortText": "0"},
+    {"label": "h", "command": {"title": "h", "command": "h", "arguments": [1]}},
+)
+
+
+def _pivot(items: Sequence[Mapping[str, Any]]) -> CompletionColumns:
+    """
+    Same as `lsp_pull` in `lsp-request.lua`
+    """
+
+    cols: MutableMapping[str, Any] = {key: [] for key in _KEYS}
+    cols["rest"] = []
+    for item in items:
+        for key in _KEYS:
+            cols[key].append(item.get(key))
+        rest = {key: val for key, val in item.items() if key not in _KEYS}
+        cols["rest"].append(rest or None)
+    cols["n"] = len(items)
+    return cols  # type: ignore
+
+
+def _parse(resp: Any) -> Sequence[Completion]:
+    parsed = parse(
+        _PROTOCOL,
+        extern_type=ExternLSP,
+        always_on_top=None,
+        client="c",
+        encoding=UTF16,
+        short_name="LSP",
+        cursors=(0, 2, 2, 2),
+        weight_adjust=0,
+        resp=resp,
+    )
+    return tuple(parsed.items)
+
+
+def _comparable(comp: Completion) -> Mapping[str, Any]:
+    assert isinstance(comp.extern, ExternLSP)
+    item = {k: v for k, v in comp.extern.item.items() if v is not None}
+    return {**asdict(comp), "uid": None, "extern": item}
+
+
+class Columnar(TestCase):
+    def test_1(self) -> None:
+        expected = _parse({"items": [{**item} for item in _ITEMS]})
+        actual = _parse({"items": _pivot(_ITEMS)})
+        self.assertEqual(len(actual), len(_ITEMS))
+        self.assertEqual([*map(_comparable, actual)], [*map(_comparable, expected)])
+
+    def test_2(self) -> None:
+        defaults = {"insertTextFormat": 2, "editRange": _RANGE, "data": 9}
+        items = ({"label": "a"}, {"label": "b", "insertTextFormat": 1})
+        expected = _parse(
+            {"items": [{**item} for item in items], "itemDefaults": defaults}
+        )
+        actual = _parse({"items": _pivot(items), "itemDefaults": defaults})
+        self.assertEqual(
+            [comp.primary_edit for comp in actual],
+            [comp.primary_edit for comp in expected],
+        )
+        for comp in actual:
+            assert isinstance(comp.extern, ExternLSP)
+            self.assertEqual(comp.extern.item["data"], 9)
+
+    def test_3(self) -> None:
+        items = ({"label": 1}, {"label": "b", "textEdit": {"newText": "b"}})
+        self.assertEqual(_parse({"items": _pivot(items)}), ())
@@ -1,7 +1,9 @@
 from random import uniform
 from unittest import TestCase
+from uuid import uuid4
 
-from ...coq.server.reviewer import sigmoid
+from ...coq.databases.insertions.database import IDB, Latency
+from ...coq.server.reviewer import budget, sigmoid
 
 
 class Sigmoid(TestCase):
@@ -13,3 +15,51 @@ class Sigmoid(TestCase):
         for _ in range(0, 10000):
             y = sigmoid(uniform(-10, 10))
             self.assertTrue(y >= 0.5 and y <= 1.5)
+
+
+class Budget(TestCase):
+    def test_1(self) -> None:
+        latency = Latency(source="", instances=1, interrupted=0, inserted=0, duration=0)
+        b = budget(1, latency=latency)
+        self.assertIsNone(b)
+
+    def test_2(self) -> None:
+        latency = Latency(
+            source="", instances=100, interrupted=0, inserted=10, duration=0.1
+        )
+        b = budget(1, latency=latency)
+        self.assertIsNotNone(b)
+        assert b is not None
+        self.assertTrue(0.1 < b < 1)
+
+    def test_3(self) -> None:
+        latency = Latency(
+            source="", instances=100, interrupted=0, inserted=10, duration=9
+        )
+        b = budget(1, latency=latency)
+        self.assertEqual(b, 1)
+
+    def test_4(self) -> None:
+        latency = Latency(
+            source="", instances=100, interrupted=100, inserted=0, duration=1
+        )
+        b = budget(1, latency=latency)
+        self.assertEqual(b, 0)
+
+
+class Latencies(TestCase):
+    def test_1(self) -> None:
+        db = IDB()
+        db.new_source("a")
+        for filetype, duration in (("c", 1), ("c", 2), ("c", 3), ("go", 9)):
+            batch, instance = uuid4().bytes, uuid4().bytes
+            db.new_batch(batch, filetype=filetype)
+            db.new_instance(instance, source="a", batch_id=batch)
+            db.new_stat(
+                instance, interrupted=False, duration=duration, items=0, window=2
+            )
+
+        latency = db.latencies("c", quantile=100)["a"]
+        self.assertEqual(latency.instances, 2)
+        self.assertEqual(latency.duration, 3)
+        self.assertEqual(db.latencies("go", quantile=100)["a"].instances, 1)
@@ -0,0 +1,53 @@
+from locale import strxfrm
+from random import choice, randint, uniform
+from unittest import TestCase
+from uuid import uuid4
+
+from ...coq.server.trans import _cum, _ranked, _sort_by
+from ...coq.shared.runtime import Metric
+from ...coq.shared.settings import Weights
+from ...coq.shared.types import Completion, Edit
+
+
+def _metric(sort_by: str) -> Metric:
+    comp = Completion(
+        source="",
+        always_on_top=False,
+        weight_adjust=0,
+        label=sort_by,
+        sort_by=sort_by,
+        primary_edit=Edit(new_text=sort_by),
+        adjust_indent=False,
+        icon_match=None,
+        kind=choice(("", "k")),
+    )
+    weight = Weights(
+        prefix_matches=randint(0, 3),
+        edit_distance=choice((0, 0.5, 1)),
+        recency=randint(0, 2),
+        proximity=randint(0, 4),
+    )
+    return Metric(
+        instance=uuid4(),
+        comp=comp,
+        weight_adjust=uniform(0.5, 1.5),
+        weight=weight,
+        label_width=len(sort_by),
+        kind_width=len(comp.kind),
+    )
+
+
+class Ranked(TestCase):
+    def test_1(self) -> None:
+        metrics = [
+            _metric("".join(choice("abAB_") for _ in range(randint(1, 4))))
+            for _ in range(999)
+        ]
+        adjustment = _cum(
+            Weights(prefix_matches=1, edit_distance=1, recency=0, proximity=1),
+            metrics=metrics,
+        )
+        key_by = _sort_by(adjustment)
+        expected = sorted(metrics, key=lambda m: (key_by(m), strxfrm(m.comp.sort_by)))
+        ranked = [*_ranked(False, adjustment=adjustment, metrics=metrics)]
+        self.assertEqual([id(m) for m in ranked], [id(m) for m in expected])
@@ -1,6 +1,14 @@
 from unittest import TestCase
 
-from ...coq.shared.fuzzy import dl_distance, metrics, multi_set_ratio, quick_ratio
+from ...coq.shared.fuzzy import (
+    BatchMetrics,
+    dl_distance,
+    dl_distances,
+    metrics,
+    multi_set_ratio,
+    quick_ratio,
+    quick_ratios,
+)
 
 _LOOK_AHEAD = 2
 
@@ -69,6 +77,28 @@ class QuickRatio(TestCase):
         self.assertAlmostEqual(ratio, 1 / 2)
 
 
+class QuickRatios(TestCase):
+    def test_1(self) -> None:
+        lhs = "abcd"
+        rhss = ("a", "ab", "abdc", "bcd", "cdb", "", "abcdefg", "xbcd")
+        ratios = quick_ratios(lhs, rhss, look_ahead=_LOOK_AHEAD)
+        expected = [quick_ratio(lhs, rhs, look_ahead=_LOOK_AHEAD) for rhs in rhss]
+        self.assertEqual(ratios, expected)
+
+    def test_2(self) -> None:
+        lhs = ""
+        rhss = ("a", "")
+        ratios = quick_ratios(lhs, rhss, look_ahead=_LOOK_AHEAD)
+        self.assertEqual(ratios, [1, 1])
+
+    def test_3(self) -> None:
+        lhs = "supervisor"
+        rhss = ("pervisor", "supervisor", "pervisor", "superb")
+        ratios = quick_ratios(lhs, rhss, look_ahead=_LOOK_AHEAD)
+        expected = [quick_ratio(lhs, rhs, look_ahead=_LOOK_AHEAD) for rhs in rhss]
+        self.assertEqual(ratios, expected)
+
+
 class EditD(TestCase):
     def test_1(self) -> None:
         lhs = ""
@@ -125,6 +155,29 @@ class EditD(TestCase):
         self.assertEqual(d, 2)
 
 
+class EditDs(TestCase):
+    def test_1(self) -> None:
+        lhs = "ca"
+        rhss = ("", "a", "ab", "abc", "abd", "ac", "ca", "cab")
+        ds = dl_distances(lhs, rhss)
+        expected = [dl_distance(lhs, rhs) for rhs in rhss]
+        self.assertEqual(ds, expected)
+
+    def test_2(self) -> None:
+        lhs = "supervisor"
+        rhss = ("pervisor", "supervise", "super", "pervisor", "visor")
+        ds = dl_distances(lhs, rhss)
+        expected = [dl_distance(lhs, rhs) for rhs in rhss]
+        self.assertEqual(ds, expected)
+
+    def test_3(self) -> None:
+        lhs = "badc"
+        rhss = ("abcd", "abdc", "bacd", "abcd")
+        ds = dl_distances(lhs, rhss)
+        expected = [dl_distance(lhs, rhs) for rhs in rhss]
+        self.assertEqual(ds, expected)
+
+
 class Metrics(TestCase):
     def test_1(self) -> None:
         cword = "ab"
@@ -167,3 +220,15 @@ class Metrics(TestCase):
         m = metrics(cword, match, look_ahead=_LOOK_AHEAD)
         self.assertEqual(m.prefix_matches, 0)
         self.assertAlmostEqual(m.edit_distance, 0)
+
+
+class BatchedMetrics(TestCase):
+    def test_1(self) -> None:
+        cwords = ("ab", "abc", "per", "uper", "00")
+        matches = ("abab", "ac", "abd", "supervisor", "11", "abab")
+        batch = BatchMetrics(look_ahead=_LOOK_AHEAD)
+        for cword in cwords:
+            for match in matches:
+                m = batch(cword, match)
+                expected = metrics(cword, match, look_ahead=_LOOK_AHEAD)
+                self.assertEqual(m, expected)
@@ -0,0 +1,80 @@
+from asyncio import create_task, run
+from json import loads
+from typing import AsyncIterator
+from unittest import TestCase
+from uuid import uuid4
+
+from ...coq.shared.trace import chrome_trace, correlate, span, spans, start, stop
+
+
+class Spans(TestCase):
+    def tearDown(self) -> None:
+        stop()
+
+    def test_1(self) -> None:
+        stop()
+        with span("off"):
+            pass
+        start()
+        self.assertEqual(spans(), ())
+
+    def test_2(self) -> None:
+        start()
+        change_id = uuid4()
+        with correlate(change_id), span("outer"):
+            with span("inner", x=1):
+                pass
+        inner, outer = spans()
+        self.assertEqual(inner.parent_id, outer.span_id)
+        self.assertIsNone(outer.parent_id)
+        self.assertEqual(inner.correlation, str(change_id))
+        self.assertEqual(inner.args, {"x": 1})
+
+    def test_3(self) -> None:
+        start()
+        with span("a"):
+            pass
+        (event,) = loads(chrome_trace(spans()))["traceEvents"]
+        self.assertEqual(event["name"], "a")
+        self.assertEqual(event["ph"], "X")
+
+    def test_4(self) -> None:
+        async def gen() -> AsyncIterator[int]:
+            with span("gen", nest=False):
+                yield 1
+                yield 2
+
+        async def main() -> None:
+            it = gen()
+            with span("outer"):
+                async for _ in it:
+                    with span("inner"):
+                        pass
+                    break
+            await create_task(it.aclose())
+
+        start()
+        run(main())
+        inner, outer, gen_span = spans()
+        self.assertEqual(inner.parent_id, outer.span_id)
+        self.assertEqual(gen_span.parent_id, outer.span_id)
+        with span("after"):
+            pass
+        *_, after = spans()
+        self.assertIsNone(after.parent_id)
+
+    def test_5(self) -> None:
+        async def gen() -> AsyncIterator[int]:
+            with span("gen"):
+                yield 1
+
+        async def main() -> None:
+            it = gen()
+            async for _ in it:
+                break
+            await create_task(it.aclose())
+
+        start()
+        run(main())
+        (gen_span,) = spans()
+        self.assertEqual(gen_span.name, "gen")
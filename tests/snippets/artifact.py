@@ -0,0 +1,49 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from uuid import uuid4
+
+from ...coq.shared.types import SnippetGrammar
+from ...coq.snippets.artifact import dumps, load
+from ...coq.snippets.types import LoadedSnips, LoadError, ParsedSnippet
+
+
+def _loaded() -> LoadedSnips:
+    snips = (
+        ParsedSnippet(
+            grammar=SnippetGrammar.lsp,
+            filetype="python",
+            content="def ${1:name}($2):\n\t$0",
+            label="def",
+            doc="函数",
+            matches=frozenset(("def", "func")),
+        ),
+        ParsedSnippet(
+            grammar=SnippetGrammar.snu,
+            filetype="",
+            content="",
+            label="",
+            doc="",
+            matches=frozenset(),
+        ),
+    )
+    exts = {"typescript": frozenset(("javascript",)), "c": frozenset()}
+    return LoadedSnips(exts=exts, snippets={uuid4(): snip for snip in snips})
+
+
+class Artifact(TestCase):
+    def test_1(self) -> None:
+        loaded = _loaded()
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "snips.bin"
+            path.write_bytes(dumps(loaded))
+            self.assertEqual(load(path), loaded)
+
+    def test_2(self) -> None:
+        raw = dumps(_loaded())
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "snips.bin"
+            for bad in (b"", raw[:-3], b"x" + raw[1:]):
+                path.write_bytes(bad)
+                with self.assertRaises(LoadError):
+                    load(path)
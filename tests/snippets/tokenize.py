@@ -0,0 +1,27 @@
+from dataclasses import replace
+from unittest import TestCase
+
+from ...coq.shared.context import EMPTY_CONTEXT
+from ...coq.snippets.parsers.lsp import tokenizer
+from ...coq.snippets.parsers.types import ParseInfo
+
+_INFO = ParseInfo(visual="", clipboard="", comment_str=("", ""))
+
+
+class Cached(TestCase):
+    def test_1(self) -> None:
+        snippet = "for (${1:i} = 0; $1 < ${2:n}; $1++) {\n\t$0\n}"
+        p1 = tokenizer(EMPTY_CONTEXT, _INFO, snippet)
+        p2 = tokenizer(EMPTY_CONTEXT, _INFO, snippet)
+        self.assertIs(p1, p2)
+
+    def test_2(self) -> None:
+        snippet = "# ${1:$TM_FILENAME_BASE} $0"
+        c1 = replace(EMPTY_CONTEXT, filename="/a.py")
+        c2 = replace(EMPTY_CONTEXT, filename="/b.py")
+        p1 = tokenizer(c1, _INFO, snippet)
+        p2 = tokenizer(c2, _INFO, snippet)
+        self.assertEqual(p1.text, "# a ")
+        self.assertEqual(p2.text, "# b ")
+        self.assertIn("a", {region.text for _, region in p1.regions})
+        self.assertIn("b", {region.text for _, region in p2.regions})
@@ -14,16 +14,18 @@ class Parser(IsolatedAsyncioTestCase):
         tag = TMP_DIR / "TAG"
         TMP_DIR.mkdir(parents=True, exist_ok=True)
         if not tag.exists() and (ctags := which("ctags")):
-            text = await run(Path(ctags), "--recurse")
-            tag.write_text(text)
+            lines = [
+                line async for batch in run(Path(ctags), "--recurse") for line in batch
+            ]
+            tag.write_text(linesep.join(lines))
 
         spec = tag.read_text()
-        parsed = parse({}, raw=spec)
+        parsed = parse(spec.splitlines())
 
         cols, _ = get_terminal_size()
         sep = linesep + "-" * cols + linesep
         print(
-            *islice((tag for _, _, tags in parsed.values() for tag in tags), 10),
+            *islice((tag for _, tags in parsed.values() for tag in tags), 10),
             sep=sep,
             file=stderr,
         )
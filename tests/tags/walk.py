@@ -0,0 +1,44 @@
+from os.path import normcase
+from pathlib import Path
+from re import compile
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from ...coq.tags.walk import walk
+
+_MAPS = compile(r".*\.py\Z")
+
+
+class Walk(TestCase):
+    def test_1(self) -> None:
+        with TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for path in (
+                "a.py",
+                "a.txt",
+                "build/b.py",
+                "src/c.py",
+                "src/gen_d.py",
+                "src/keep_gen.py",
+                "src/deep/e.py",
+                ".git/f.py",
+            ):
+                (root / path).parent.mkdir(parents=True, exist_ok=True)
+                (root / path).touch()
+            (root / ".gitignore").write_text("build/\n/src/deep\n")
+            (root / "src" / ".gitignore").write_text("gen_*\n!keep_gen.py\n")
+
+            walked = walk(root, dirs=(str(root),), maps=_MAPS, budget=99)
+            self.assertEqual(walked.done, (str(root),))
+            self.assertEqual(set(walked.files), {normcase(root / "a.py")})
+            self.assertEqual(set(walked.subdirs), {str(root / "src")})
+
+            walked = walk(root, dirs=walked.subdirs, maps=_MAPS, budget=99)
+            self.assertEqual(
+                set(walked.files),
+                {
+                    normcase(root / "src" / "c.py"),
+                    normcase(root / "src" / "keep_gen.py"),
+                },
+            )
+            self.assertEqual(walked.subdirs, ())